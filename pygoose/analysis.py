@@ -0,0 +1,87 @@
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import numpy as np
+
+from pygoose.datatypes.time_quality import (
+    ACCURACY_BITS,
+    CLOCK_FAILURE_BITS,
+    CLOCK_NOT_SYNC_BITS,
+    LEAP_SECONDS_KNOWN_BITS,
+    MAX_SPECIFIED_ACCURACY,
+    UNSPECIFIED_ACCURACY,
+)
+from pygoose.datatypes.time_stamp import NANOSECONDS, TIMESTAMP_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import numpy.typing as npt
+
+    Raw = bytes | bytearray | memoryview | npt.NDArray[np.uint8]
+
+# 61850-8-1, 2nd ed., 8.1.3.7, epoch (u32), fraction (u24) and quality (u8), all big endian
+_TIMESTAMP_DTYPE = np.dtype([("epoch", ">u4"), ("fraction", ">u4")])
+
+
+class Timestamps(NamedTuple):
+    epoch_ns: "npt.NDArray[np.int64]"
+    leap_second_known: "npt.NDArray[Any]"
+    clock_failure: "npt.NDArray[Any]"
+    clock_not_sync: "npt.NDArray[Any]"
+    accuracy: "npt.NDArray[Any]"
+
+    @property
+    def invalid_accuracy(self: "Timestamps") -> "npt.NDArray[Any]":
+        """Rows the scalar path would reject with InvalidAccuracyError."""
+        return (self.accuracy > MAX_SPECIFIED_ACCURACY) & (self.accuracy != UNSPECIFIED_ACCURACY)  # type: ignore[no-any-return]
+
+    def datetime64(self: "Timestamps") -> "npt.NDArray[Any]":
+        """Returns the timestamps as UTC datetime64[ns]."""
+        return self.epoch_ns.astype("datetime64[ns]")
+
+
+def _records(raw: "Raw", width: int) -> "npt.NDArray[np.uint8]":
+    records = np.ascontiguousarray(raw, dtype=np.uint8) if isinstance(raw, np.ndarray) else np.frombuffer(raw, np.uint8)
+    if records.size % width:
+        msg = f"buffer size is not a multiple of {width} bytes"
+        raise ValueError(msg)
+    return records.reshape(-1, width)
+
+
+def pack_fields(values: "Iterable[bytes]", width: int) -> "npt.NDArray[np.uint8]":
+    """Right-aligns variable length big endian integers (e.g. BER stNum) into fixed width rows."""
+    rows = [value.rjust(width, b"\x00") for value in values]
+    if any(len(row) > width for row in rows):
+        msg = f"value wider than {width} bytes"
+        raise ValueError(msg)
+    return _records(b"".join(rows), width)
+
+
+def unpack_uints(raw: "Raw", width: int) -> "npt.NDArray[np.uint64]":
+    """Unpacks rows of `width` big endian bytes (stNum, sqNum, ttl, ...) into unsigned integers."""
+    if not 0 < width <= 8:  # noqa: PLR2004
+        msg = "width must be between 1 and 8 bytes"
+        raise ValueError(msg)
+    records = _records(raw, width)
+    result = np.zeros(len(records), dtype=np.uint64)
+    for column in range(width):
+        result <<= np.uint64(8)
+        result |= records[:, column]
+    return result
+
+
+def unpack_timestamps(raw: "Raw") -> Timestamps:
+    """Unpacks 8 bytes timestamps, matching Timestamp.unpack value by value."""
+    stamps = _records(raw, TIMESTAMP_SIZE).reshape(-1).view(_TIMESTAMP_DTYPE)
+    epoch = stamps["epoch"].astype(np.int64)
+    low = stamps["fraction"].astype(np.int64)
+    quality = (low & 0xFF).astype(np.uint8)
+    # same truncation as Timestamp.bin2nano: floor(fraction / 2**24 * 1e9)
+    fraction_ns = ((low >> 8) * NANOSECONDS) >> 24
+    return Timestamps(
+        epoch_ns=epoch * NANOSECONDS + fraction_ns,
+        leap_second_known=(quality & LEAP_SECONDS_KNOWN_BITS) != 0,
+        clock_failure=(quality & CLOCK_FAILURE_BITS) != 0,
+        clock_not_sync=(quality & CLOCK_NOT_SYNC_BITS) != 0,
+        accuracy=quality & ACCURACY_BITS,
+    )
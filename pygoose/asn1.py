@@ -1,7 +1,13 @@
 from enum import IntEnum
 from struct import pack as s_pack
+from struct import pack_into as s_pack_into
 from struct import unpack as s_unpack
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from _typeshed import ReadableBuffer, WriteableBuffer
 
 
 class IdentifierClass(IntEnum):
@@ -111,24 +117,16 @@ class Triplet:
         return self.length + self.extra_length + 2
 
     def __bytes__(self: "Triplet") -> bytes:
+        """Tag, length and value in one go, Encoder is only worth its two passes for nested nodes."""
         if self.length < 0x80:
-            return bytes(self.identifier) + s_pack("!B", self.length) + self.value
-        elif self.length <= 0xFF:
-            return (
-                bytes(self.identifier) + s_pack("!BB", 0x81, self.length) + self.value
-            )
-        elif self.length <= 0xFFFF:
-            return (
-                bytes(self.identifier) + s_pack("!BH", 0x82, self.length) + self.value
-            )
-        elif self.length <= 0xFFFFFF:
-            return (
-                bytes(self.identifier)
-                + s_pack("!B", 0x83)
-                + s_pack("!I", self.length)[1:]
-                + self.value
-            )
-        raise ValueError("Value too big")
+            return s_pack("!BB", self.identifier.to_int(), self.length) + self.value
+        header = bytearray(1 + length_size(self.length))
+        header[0] = self.identifier.to_int()
+        pack_length_into(header, 1, self.length)
+        return bytes(header) + self.value
+
+    def node(self: "Triplet") -> "Primitive":
+        return Primitive(self.identifier.to_int(), self.value)
 
     @classmethod
     def constructed_unpack(
@@ -143,16 +141,18 @@ class Triplet:
         length = s_unpack("!B", bytes_string[1:2])[0]
 
         index = 0
-        if length == 0x80:
+        if length == 0x81:
             length = s_unpack("!B", bytes_string[2:3])[0]
             index = 1
-        elif length == 0x81:
+        elif length == 0x82:
             length = s_unpack("!H", bytes_string[2:4])[0]
             index = 2
-        elif length == 0x82:
+        elif length == 0x83:
             length = s_unpack("!I", b"\x00" + bytes_string[2:5])[0]
             index = 3
-        elif length >= 0x83:
+        elif length == 0x80:
+            raise ValueError("Indefinite length not supported")
+        elif length > 0x83:
             raise ValueError("Value too big")
 
         value = bytes_string[2 + index :]
@@ -164,3 +164,111 @@ class Triplet:
 
     def __str__(self: "Triplet") -> str:
         return f"{self.identifier} [{self.length} bytes]:\n{self.value!r}"
+
+
+class Primitive(NamedTuple):
+    tag: int
+    value: bytes
+
+
+class Constructed(NamedTuple):
+    tag: int
+    children: "Sequence[Node]"
+
+
+Node = Primitive | Constructed
+
+
+def length_size(length: int) -> int:
+    """Returns how many bytes the BER length field takes for a value of `length` bytes."""
+    if length < 0x80:
+        return 1
+    if length <= 0xFF:
+        return 2
+    if length <= 0xFFFF:
+        return 3
+    if length <= 0xFFFFFF:
+        return 4
+    raise ValueError("Value too big")
+
+
+def pack_length_into(buffer: "WriteableBuffer", offset: int, length: int) -> int:
+    """Writes the BER length field at offset, returns the offset right after it."""
+    if length < 0x80:
+        s_pack_into("!B", buffer, offset, length)
+        return offset + 1
+    if length <= 0xFF:
+        s_pack_into("!BB", buffer, offset, 0x81, length)
+        return offset + 2
+    if length <= 0xFFFF:
+        s_pack_into("!BH", buffer, offset, 0x82, length)
+        return offset + 3
+    if length <= 0xFFFFFF:
+        s_pack_into("!BBH", buffer, offset, 0x83, length >> 16, length & 0xFFFF)
+        return offset + 4
+    raise ValueError("Value too big")
+
+
+def unpack_length_from(buffer: "ReadableBuffer", offset: int) -> tuple[int, int]:
+    """Reads the BER length field at offset, returns the length and the offset of the value."""
+    view = memoryview(buffer)
+    first = view[offset]
+    if first < 0x80:
+        return first, offset + 1
+    size = first & 0x7F
+    if size == 0:
+        raise ValueError("Indefinite length not supported")
+    if size > 3:
+        raise ValueError("Value too big")
+    return int.from_bytes(view[offset + 1 : offset + 1 + size], "big"), offset + 1 + size
+
+
+class Encoder:
+    """Serialises a tree of BER nodes into a single preallocated buffer.
+
+    Every constructed node is sized once when the encoder is created, so packing is a single
+    forward pass with no intermediate bytes objects.
+    """
+
+    __slots__ = ("nodes", "size", "_lengths")
+
+    def __init__(self: "Encoder", *nodes: Node) -> None:
+        self.nodes = nodes
+        self._lengths: list[int] = []  # content length of each constructed node, in pre-order
+        self.size = sum(self._measure(node) for node in nodes)
+
+    def _measure(self: "Encoder", node: Node) -> int:
+        if isinstance(node, Primitive):
+            length = len(node.value)
+        else:
+            index = len(self._lengths)
+            self._lengths.append(0)
+            length = sum(self._measure(child) for child in node.children)
+            self._lengths[index] = length
+        return 1 + length_size(length) + length
+
+    def _pack_node(
+        self: "Encoder", buffer: "WriteableBuffer", offset: int, node: Node, lengths: "Iterator[int]",
+    ) -> int:
+        s_pack_into("!B", buffer, offset, node.tag)
+        if isinstance(node, Primitive):
+            length = len(node.value)
+            offset = pack_length_into(buffer, offset + 1, length)
+            memoryview(buffer)[offset : offset + length] = node.value
+            return offset + length
+        offset = pack_length_into(buffer, offset + 1, next(lengths))
+        for child in node.children:
+            offset = self._pack_node(buffer, offset, child, lengths)
+        return offset
+
+    def pack_into(self: "Encoder", buffer: "WriteableBuffer", offset: int = 0) -> int:
+        """Writes all nodes starting at offset, returns the offset right after the last one."""
+        lengths = iter(self._lengths)
+        for node in self.nodes:
+            offset = self._pack_node(buffer, offset, node, lengths)
+        return offset
+
+    def encode(self: "Encoder") -> bytearray:
+        buffer = bytearray(self.size)
+        self.pack_into(buffer)
+        return buffer
@@ -0,0 +1,129 @@
+import hmac
+from hashlib import sha256
+from struct import Struct
+from typing import TYPE_CHECKING
+
+from pygoose.goose import peek_header
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pygoose.goose import Header
+
+# IEC 62351-6 style security extension, appended after the APDU: the low byte of reserved 1 holds its length and
+# the header length covers it, so decoders that ignore it still read the frame
+SECURITY_TAG = 0xAF
+MAC_SIZE = 32  # HMAC-SHA256, not truncated
+_EXTENSION = Struct(f"!BBI{MAC_SIZE}s")  # tag, length, key id, MAC
+EXTENSION_SIZE = _EXTENSION.size
+_MAC_OFFSET = EXTENSION_SIZE - MAC_SIZE
+_ADDRESSES = 12  # destination and source MACs, authenticated like the rest
+_U16 = Struct("!H")
+
+
+class AuthenticationError(ValueError): ...
+
+
+class KeyRing:
+    """One HMAC-SHA256 context per stream (Header.key), keyed once; signing and verifying copy it for each frame.
+
+    Streams without a key of their own use the default key, when there is one.
+    """
+
+    def __init__(self: "KeyRing", default: bytes | None = None, default_id: int = 0) -> None:
+        self.contexts: dict[int, tuple[int, hmac.HMAC]] = {}
+        self.default = None if default is None else (default_id, hmac.new(default, digestmod=sha256))
+
+    def add(self: "KeyRing", stream: int, key: bytes, key_id: int = 0) -> None:
+        self.contexts[stream] = key_id, hmac.new(key, digestmod=sha256)
+
+    def get(self: "KeyRing", stream: int) -> tuple[int, hmac.HMAC] | None:
+        return self.contexts.get(stream, self.default)
+
+    def mac(self: "KeyRing", header: "Header", frame: bytearray | bytes, end: int) -> tuple[int, bytes]:
+        """Key id and MAC of frame[:end] for the stream, AuthenticationError when it has no key.
+
+        The MAC covers the addresses and everything from the ethertype on, only an 802.1Q tag is left out so that
+        switches and gateways can still retag or reprioritise signed frames.
+        """
+        found = self.get(header.key)
+        if found is None:
+            msg = f"No key for stream {header.key:016x}"
+            raise AuthenticationError(msg)
+        key_id, context = found
+        mac = context.copy()
+        view = memoryview(frame)
+        mac.update(view[:_ADDRESSES])
+        mac.update(view[header.pdu_offset - 10 : end])  # ethertype, APPID, length, reserved 1 and 2, then the APDU
+        return key_id, mac.digest()
+
+
+class Signer:
+    """Appends the security extension, the MAC covers the frame up to the MAC itself except an 802.1Q tag."""
+
+    def __init__(self: "Signer", keys: KeyRing) -> None:
+        self.keys = keys
+
+    def sign(self: "Signer", frame: bytearray) -> bytearray:
+        """Signs in place, returns the frame for convenience."""
+        header = peek_header(frame)
+        found = self.keys.get(header.key)
+        if found is None:
+            msg = f"No key for stream {header.key:016x}"
+            raise AuthenticationError(msg)
+        key_id, _ = found
+        start = header.pdu_offset - 8
+        size = len(frame)
+        frame += bytes(EXTENSION_SIZE)
+        _U16.pack_into(frame, start + 2, header.length + EXTENSION_SIZE)
+        (reserved1,) = _U16.unpack_from(frame, start + 4)
+        _U16.pack_into(frame, start + 4, reserved1 & 0xFF00 | EXTENSION_SIZE)
+        _EXTENSION.pack_into(frame, size, SECURITY_TAG, EXTENSION_SIZE - 2, key_id, b"")
+        _, mac = self.keys.mac(header, frame, size + _MAC_OFFSET)
+        frame[size + _MAC_OFFSET :] = mac
+        return frame
+
+
+class Verifier:
+    """Checks the security extension of streams in the trust set, frames of other streams pass unverified.
+
+    trusted=None verifies every stream that has a key.
+    """
+
+    def __init__(self: "Verifier", keys: KeyRing, trusted: "Iterable[int] | None" = None) -> None:
+        self.keys = keys
+        self.trusted = None if trusted is None else frozenset(trusted)
+        self.verified = 0
+        self.skipped = 0
+        self.rejected = 0
+
+    def check(self: "Verifier", header: "Header", frame: bytes) -> None:
+        """Raises AuthenticationError unless the frame carries a valid MAC."""
+        start = header.pdu_offset - 8
+        (reserved1,) = _U16.unpack_from(frame, start + 4)
+        size = len(frame) - EXTENSION_SIZE
+        if reserved1 & 0xFF != EXTENSION_SIZE or size < header.pdu_offset:
+            raise AuthenticationError("Missing security extension")
+        tag, _, key_id, mac = _EXTENSION.unpack_from(frame, size)
+        if tag != SECURITY_TAG:
+            raise AuthenticationError("Missing security extension")
+        expected_id, expected = self.keys.mac(header, frame, size + _MAC_OFFSET)
+        if key_id != expected_id or not hmac.compare_digest(mac, expected):
+            raise AuthenticationError("Wrong MAC")
+
+    def verify(self: "Verifier", header: "Header", frame: bytes) -> bool:
+        """Whether the frame may go on to decoding."""
+        if self.trusted is None:
+            if self.keys.get(header.key) is None:
+                self.skipped += 1
+                return True
+        elif header.key not in self.trusted:
+            self.skipped += 1
+            return True
+        try:
+            self.check(header, frame)
+        except AuthenticationError:
+            self.rejected += 1
+            return False
+        self.verified += 1
+        return True
@@ -0,0 +1,228 @@
+import json
+import tracemalloc
+from asyncio import new_event_loop
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from sys import argv, exit
+from time import perf_counter_ns, time_ns
+from typing import TYPE_CHECKING
+
+from pygoose.asn1 import Constructed, Encoder, Primitive, Triplet
+from pygoose.auth import KeyRing, Signer, Verifier
+from pygoose.datatypes import Timestamp
+from pygoose.gateway import Gateway, Route
+from pygoose.goose import generate_goose, pack_frame, peek_header, unpack_goose
+from pygoose.pipeline import Pipeline
+from pygoose.sv import SampleBatch, SvEncoder, sine_samples
+from pygoose.transport import loopback_pair
+from pygoose.utils import async_usleep, now, u32_bytes, usleep
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from socket import socket
+
+DEFAULT_THRESHOLD = 0.1  # 10%
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Result:
+    name: str
+    iterations: int
+    ops_per_second: float
+    peak_bytes_per_op: int  # transient allocations of a single call, from tracemalloc
+    p50_ns: int
+    p90_ns: int
+    p99_ns: int
+    max_ns: int
+    timing: bool = False  # latencies measure how late a sleep returned, ops/s is meaningless
+
+
+def _percentile(ordered: list[int], percent: int) -> int:
+    return ordered[min(len(ordered) - 1, len(ordered) * percent // 100)]
+
+
+def _peak_bytes(func: "Callable[[], object]") -> int:
+    tracemalloc.start()
+    try:
+        func()  # first call under tracing may allocate caches
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        return max(tracemalloc.get_traced_memory()[1] - before, 0)
+    finally:
+        tracemalloc.stop()
+
+
+def _result(name: str, latencies: list[int], total_ns: int, peak_bytes: int, *, timing: bool = False) -> Result:
+    ordered = sorted(latencies)
+    return Result(
+        name=name,
+        iterations=len(ordered),
+        ops_per_second=len(ordered) * 1e9 / max(total_ns, 1),
+        peak_bytes_per_op=peak_bytes,
+        p50_ns=_percentile(ordered, 50),
+        p90_ns=_percentile(ordered, 90),
+        p99_ns=_percentile(ordered, 99),
+        max_ns=ordered[-1],
+        timing=timing,
+    )
+
+
+def measure(name: str, func: "Callable[[], object]", iterations: int = 10_000, warmup: int = 1_000) -> Result:
+    """Times each call of func, latency percentiles come from the individual calls."""
+    for _ in range(warmup):
+        func()
+    latencies = [0] * iterations
+    start = perf_counter_ns()
+    for index in range(iterations):
+        call = perf_counter_ns()
+        func()
+        latencies[index] = perf_counter_ns() - call
+    total = perf_counter_ns() - start
+    return _result(name, latencies, total, _peak_bytes(func))
+
+
+def measure_sleep(name: str, microseconds: float, iterations: int = 200) -> Result:
+    """Sleep accuracy, latencies are how late each usleep returned."""
+    latencies = [0] * iterations
+    start = time_ns()
+    for index in range(iterations):
+        call = time_ns()
+        usleep(microseconds)
+        latencies[index] = max(time_ns() - call - int(microseconds * 1e3), 0)
+    return _result(name, latencies, time_ns() - start, 0, timing=True)
+
+
+def measure_async_sleep(name: str, microseconds: float, iterations: int = 200) -> Result:
+    """Same as measure_sleep for async_usleep, on a plain asyncio loop."""
+    latencies = [0] * iterations
+
+    async def sleep_all() -> None:
+        for index in range(iterations):
+            call = time_ns()
+            await async_usleep(microseconds)
+            latencies[index] = max(time_ns() - call - int(microseconds * 1e3), 0)
+
+    loop = new_event_loop()
+    start = time_ns()
+    try:
+        loop.run_until_complete(sleep_all())
+    finally:
+        loop.close()
+    return _result(name, latencies, time_ns() - start, 0, timing=True)
+
+
+def _sample_pdu() -> Constructed:
+    return Constructed(
+        0x61,
+        (
+            Primitive(0x80, b"SEL_421_SubCFG/LLN0$GO$PIOC"),
+            Primitive(0x81, u32_bytes(2000)),
+            Primitive(0x82, b"SEL_421_SubCFG/LLN0$PIOC"),
+            Primitive(0x83, b"SEL_421_Sub"),
+            now().node(),
+            Primitive(0x85, b"\x01"),
+            Primitive(0x86, b"\x01"),
+            Primitive(0x87, b"\x00"),
+            Primitive(0x88, b"\x01"),
+            Primitive(0x89, b"\x00"),
+            Primitive(0x8A, b"\x01"),
+            Constructed(0xAB, (Primitive(0x83, b"\x00"),)),
+        ),
+    )
+
+
+def _sv_decode(batch: SampleBatch, frame: bytes) -> int:
+    if batch.full:  # what SvSubscriber does, the cost of a flush is spread over the batch
+        batch.values()
+        batch.clear()
+    return batch.decode(frame, 0)
+
+
+def _loopback_pipeline(sender: "socket", receiver: "socket", pipeline: Pipeline, frame: bytes) -> None:
+    sender.sendall(frame)
+    data, kernel_ns = pipeline.recv(receiver)
+    pipeline.handle(data, kernel_ns, time_ns())
+
+
+def benchmarks(iterations: int = 10_000) -> "Iterator[Result]":
+    dst, src = b"\x01\x0c\xcd\x01\x00\x01", b"\x00\x30\xa7\x22\x9d\x01"
+    pdu = _sample_pdu()
+    frame = bytes(pack_frame(dst, src, 0, pdu))
+    triplet = bytes(Triplet(0x80, b"SEL_421_SubCFG/LLN0$GO$PIOC"))
+    timestamp = Timestamp.unpack(bytes(now().value))
+    b_timestamp = bytes(timestamp)
+    gateway, buffer = Gateway([Route(set_app_id=0x3001)]), bytearray(1600)
+    buffer[: len(frame)] = frame
+    keys = KeyRing(bytes(32))
+    signer, verifier = Signer(keys), Verifier(keys)
+    signed = bytes(signer.sign(bytearray(frame)))
+    signed_header = peek_header(signed)
+    samples, sv_encoder = sine_samples(), SvEncoder(dst, src, 0x4000, "MU01")
+    sv_frame, sv_batch = bytes(sv_encoder.pack(0, samples)), SampleBatch()
+
+    yield measure("triplet_encode", lambda: bytes(Triplet(0x80, b"SEL_421_SubCFG/LLN0$GO$PIOC")), iterations)
+    yield measure("triplet_decode", lambda: Triplet.unpack(triplet), iterations)
+    yield measure("encoder_pdu", lambda: Encoder(pdu).encode(), iterations)
+    yield measure("pack_frame", lambda: pack_frame(dst, src, 0, pdu), iterations)
+    yield measure("generate_goose", lambda: list(generate_goose(12)), max(iterations // 12, 1))
+    yield measure("unpack_goose", lambda: unpack_goose(frame), iterations)
+    yield measure("auth_sign", lambda: signer.sign(bytearray(frame)), iterations)
+    yield measure("auth_verify", lambda: verifier.verify(signed_header, signed), iterations)
+    yield measure("timestamp_pack", lambda: bytes(timestamp), iterations)
+    yield measure("timestamp_unpack", lambda: Timestamp.unpack(b_timestamp), iterations)
+    yield measure("now", now, iterations)
+    yield measure("gateway_forward", lambda: gateway.forward(buffer, len(frame)), iterations)
+    yield measure("sv_pack", lambda: sv_encoder.pack(1, samples, 1), iterations)
+    yield measure("sv_decode", lambda: _sv_decode(sv_batch, sv_frame), iterations)
+    sender, receiver = loopback_pair()
+    pipeline = Pipeline()
+    with sender, receiver:  # whole receive path, through the kernel but without a NIC or root
+        yield measure("loopback_pipeline", lambda: _loopback_pipeline(sender, receiver, pipeline, frame), iterations)
+    yield measure_sleep("usleep_100us", 100)
+    yield measure_sleep("usleep_1ms", 1000)
+    yield measure_async_sleep("async_usleep_100us", 100)
+
+
+def save(results: "list[Result]", path: Path) -> None:
+    path.write_text(json.dumps([asdict(result) for result in results], indent=2))
+
+
+def load(path: Path) -> dict[str, Result]:
+    return {result["name"]: Result(**result) for result in json.loads(path.read_text())}
+
+
+def compare(baseline: dict[str, Result], current: dict[str, Result], threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Returns one message per regression, throughput drop or p99 increase beyond threshold."""
+    regressions = []
+    for name, before in baseline.items():
+        after = current.get(name)
+        if after is None:
+            continue
+        if not before.timing and after.ops_per_second < before.ops_per_second * (1 - threshold):
+            regressions.append(f"{name}: {before.ops_per_second:.0f} -> {after.ops_per_second:.0f} ops/s")
+        if after.p99_ns > before.p99_ns * (1 + threshold):
+            regressions.append(f"{name}: p99 {before.p99_ns} -> {after.p99_ns} ns")
+    return regressions
+
+
+def run(path: Path, iterations: int = 10_000) -> list[Result]:
+    results = []
+    for result in benchmarks(iterations):
+        print(
+            f"{result.name:<20} {result.ops_per_second:>12.0f} ops/s {result.peak_bytes_per_op:>6} B/op "
+            f"p50 {result.p50_ns:>8} ns p99 {result.p99_ns:>8} ns max {result.max_ns:>9} ns",
+        )
+        results.append(result)
+    save(results, path)
+    return results
+
+
+if __name__ == "__main__":
+    if argv[1] == "run":
+        run(Path(argv[2]), int(argv[3]) if len(argv) > 3 else 10_000)  # noqa: PLR2004
+    elif argv[1] == "compare":
+        threshold = float(argv[4]) if len(argv) > 4 else DEFAULT_THRESHOLD  # noqa: PLR2004
+        found = compare(load(Path(argv[2])), load(Path(argv[3])), threshold)
+        print("\n".join(found) or "no regressions")
+        exit(1 if found else 0)
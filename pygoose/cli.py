@@ -0,0 +1,32 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+from pygoose.filters import compile_filter
+
+
+def publisher_parser(prog: str) -> ArgumentParser:
+    """Options shared by publisher_sync and publisher_async."""
+    parser = ArgumentParser(prog=prog, description="Publishes a burst of GOOSE frames.")
+    parser.add_argument("interface", help="NIC name or loopback:<name>")
+    parser.add_argument("sleep_until", type=int, help="time_ns() to start at, 0 for now")
+    parser.add_argument("--priority", type=int, help="802.1Q priority, tags the frames")
+    parser.add_argument("--vid", type=int, help="802.1Q VLAN ID, tags the frames")
+    parser.add_argument("--key", type=bytes.fromhex, help="hex HMAC key, signs the frames")
+    parser.add_argument("--realtime", type=int, metavar="CPU", help="real-time mode pinned to this CPU")
+    return parser
+
+
+def subscriber_parser(prog: str) -> ArgumentParser:
+    """Options shared by subscriber_sync and subscriber_async."""
+    parser = ArgumentParser(prog=prog, description="Receives and decodes GOOSE frames until interrupted.")
+    parser.add_argument("interface", help="NIC name or loopback:<name>")
+    parser.add_argument("--record", type=Path, metavar="PCAP", help="record every received frame")
+    parser.add_argument("--filter", type=compile_filter, metavar="EXPRESSION", help="drop frames it rejects")
+    parser.add_argument("--table", metavar="NAME", help="shared memory table of the latest values")
+    parser.add_argument("--events", type=Path, metavar="DIRECTORY", help="state change event log")
+    parser.add_argument("--key", type=bytes.fromhex, help="hex HMAC key, drops frames without a valid MAC")
+    parser.add_argument(
+        "--hardware-timestamps", action="store_true", help="NIC receive timestamps, needs driver support and root",
+    )
+    parser.add_argument("--metrics-port", type=int, metavar="PORT", help="serve Prometheus metrics, e.g. 9464")
+    return parser
@@ -0,0 +1,202 @@
+import json
+from array import array
+from dataclasses import dataclass, field
+from importlib.util import find_spec
+from pathlib import Path
+from struct import Struct
+from sys import argv
+from typing import Any
+
+from pygoose.asn1 import unpack_length_from
+from pygoose.datatypes.time_stamp import NANOSECONDS
+from pygoose.goose import GOOSE_ETHER, iter_fields, peek_header
+from pygoose.pcap import read_capture
+
+MANIFEST = "manifest.json"
+ERRORS = "errors.jsonl"
+FORMAT_VERSION = 1
+
+# column name and array typecode, in row order
+COLUMNS = (
+    ("received_ns", "q"),
+    ("mac_dest", "Q"),
+    ("mac_src", "Q"),
+    ("app_id", "H"),
+    ("goose_length", "H"),
+    ("reserved1", "H"),
+    ("reserved2", "H"),
+    ("gocb_ref", "I"),  # index into Table.strings
+    ("ttl", "Q"),
+    ("data_set", "I"),  # index into Table.strings
+    ("go_id", "I"),  # index into Table.strings
+    ("timestamp_ns", "q"),
+    ("time_quality", "B"),
+    ("st_num", "Q"),
+    ("sq_num", "Q"),
+    ("test", "B"),
+    ("conf_rev", "Q"),
+    ("nds_com", "B"),
+    ("num_datset_entries", "Q"),
+    ("trip", "B"),
+)
+_STRING_TAGS = {0x80: 7, 0x82: 9, 0x83: 10}
+_INT_TAGS = {0x81: 8, 0x85: 13, 0x86: 14, 0x88: 16, 0x8A: 18}
+_BOOL_TAGS = {0x87: 15, 0x89: 17}
+_TIMESTAMP_COLUMN = 11
+_TRIP_COLUMN = 19
+_RESERVED = Struct("!HH")
+
+
+class _Strings:
+    """Dictionary encoding for gocbRef, datSet and goID."""
+
+    def __init__(self: "_Strings") -> None:
+        self.ids: dict[bytes, int] = {}
+
+    def __call__(self: "_Strings", value: memoryview) -> int:
+        raw = bytes(value)
+        index = self.ids.get(raw)
+        if index is None:
+            index = self.ids[raw] = len(self.ids)
+        return index
+
+    def table(self: "_Strings") -> list[str]:
+        return [raw.decode("utf8", "replace") for raw in self.ids]
+
+
+def _decode(frame: memoryview, received_ns: int, strings: _Strings) -> list[int | None]:  # noqa: C901 one flat pass
+    """Decodes one frame into a row, in COLUMNS order, raising ValueError for anything malformed."""
+    header = peek_header(frame)
+    if header.ether != GOOSE_ETHER:
+        msg = f"Not a GOOSE frame (ether {header.ether:#06x})"
+        raise ValueError(msg)
+    if header.length != len(frame) - header.pdu_offset + 8:
+        raise ValueError("GOOSE data missing...")
+    reserved1, reserved2 = _RESERVED.unpack_from(frame, header.pdu_offset - 4)
+
+    row: list[int | None] = [None] * len(COLUMNS)
+    row[:7] = (
+        received_ns, int.from_bytes(header.dst_addr, "big"), int.from_bytes(header.src_addr, "big"), header.app_id,
+        header.length, reserved1, reserved2,
+    )
+    for tag, value_offset, length in iter_fields(frame, header.pdu_offset):
+        value = frame[value_offset : value_offset + length]
+        if tag in _STRING_TAGS:
+            row[_STRING_TAGS[tag]] = strings(value)
+        elif tag in _INT_TAGS:
+            if length > 8:  # noqa: PLR2004
+                raise ValueError("Integer too big")
+            row[_INT_TAGS[tag]] = int.from_bytes(value, "big")
+        elif tag in _BOOL_TAGS:
+            row[_BOOL_TAGS[tag]] = value != b"\x00"
+        elif tag == 0x84 and length == 8:  # noqa: PLR2004
+            fraction = int.from_bytes(value[4:7], "big")
+            row[_TIMESTAMP_COLUMN] = int.from_bytes(value[:4], "big") * NANOSECONDS + (fraction * NANOSECONDS >> 24)
+            row[_TIMESTAMP_COLUMN + 1] = value[7]
+        elif tag == 0xAB and length > 2:  # noqa: PLR2004
+            trip_length, trip_offset = unpack_length_from(value, 1)
+            row[_TRIP_COLUMN] = value[trip_offset : trip_offset + trip_length] != b"\x00"
+    if None in row:
+        msg = f"Missing field {COLUMNS[row.index(None)][0]}"
+        raise ValueError(msg)
+    return row
+
+
+@dataclass(slots=True)
+class Table:
+    """Decoded capture, one array per column (numpy arrays when numpy is installed)."""
+
+    rows: int
+    columns: dict[str, Any]
+    strings: list[str]
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def string(self: "Table", column: str, row: int) -> str:
+        return self.strings[int(self.columns[column][row])]
+
+
+class _Chunk:
+    """Preallocated column buffers, flushed to the column files whenever they fill up."""
+
+    def __init__(self: "_Chunk", output: Path, size: int) -> None:
+        self.size = size
+        self.count = 0
+        self.arrays = [array(typecode, bytes(size * array(typecode).itemsize)) for _, typecode in COLUMNS]
+        self.files = [(output / f"{name}.col").open("wb") for name, _ in COLUMNS]
+
+    def append(self: "_Chunk", row: list[int | None]) -> None:
+        index = self.count
+        for column, value in zip(self.arrays, row, strict=True):
+            column[index] = value  # type: ignore[assignment]
+        self.count += 1
+        if self.count == self.size:
+            self.flush()
+
+    def flush(self: "_Chunk") -> None:
+        for column, file in zip(self.arrays, self.files, strict=True):
+            file.write(memoryview(column)[: self.count])
+        self.count = 0
+
+    def close(self: "_Chunk") -> None:
+        self.flush()
+        for file in self.files:
+            file.close()
+
+
+def decode_capture(path: Path, output: Path, chunk_size: int = 65536) -> Table:
+    """Decodes every frame of a pcap/pcapng into column files under output.
+
+    Frames that fail to decode go to errors.jsonl (frame index, receive time, reason) instead of
+    raising. Columns are raw native-endian arrays described by manifest.json, see load().
+    """
+    output.mkdir(parents=True, exist_ok=True)
+    strings = _Strings()
+    chunk = _Chunk(output, chunk_size)
+    rows = 0
+    errors: list[dict[str, Any]] = []
+    with (output / ERRORS).open("w") as error_file:
+        for index, (received_ns, frame) in enumerate(read_capture(path)):
+            try:
+                row = _decode(frame, received_ns, strings)
+            except (ValueError, IndexError) as error:
+                record = {"frame": index, "received_ns": received_ns, "error": str(error)}
+                errors.append(record)
+                error_file.write(json.dumps(record) + "\n")
+                continue
+            chunk.append(row)
+            rows += 1
+    chunk.close()
+    manifest = {
+        "version": FORMAT_VERSION,
+        "rows": rows,
+        "columns": dict(COLUMNS),
+        "strings": strings.table(),
+        "errors": len(errors),
+    }
+    (output / MANIFEST).write_text(json.dumps(manifest))
+    return load(output)
+
+
+def load(output: Path) -> Table:
+    """Reloads a decoded capture, memory-mapping the columns with numpy when it is installed."""
+    manifest = json.loads((output / MANIFEST).read_text())
+    rows = manifest["rows"]
+    columns: dict[str, Any] = {}
+    if find_spec("numpy") is not None:
+        import numpy as np
+
+        for name, typecode in manifest["columns"].items():
+            dtype = np.dtype(typecode)
+            columns[name] = np.memmap(output / f"{name}.col", dtype, "r", shape=(rows,)) if rows else np.empty(0, dtype)
+    else:
+        for name, typecode in manifest["columns"].items():
+            column = array(typecode)
+            column.frombytes((output / f"{name}.col").read_bytes())
+            columns[name] = column
+    errors = [json.loads(line) for line in (output / ERRORS).read_text().splitlines()]
+    return Table(rows=rows, columns=columns, strings=manifest["strings"], errors=errors)
+
+
+if __name__ == "__main__":
+    table = decode_capture(Path(argv[1]), Path(argv[2]))
+    print(f"{table.rows} frames decoded, {len(table.errors)} errors")
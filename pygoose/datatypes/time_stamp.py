@@ -1,12 +1,18 @@
 import datetime as dt
 import decimal as dec
 from dataclasses import dataclass
-from struct import pack, unpack
-from typing import NamedTuple
+from struct import Struct, pack, unpack
+from typing import TYPE_CHECKING, NamedTuple
 
 from pygoose.datatypes.time_quality import TimeQuality
 
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
 FRACTION_BYTES_SIZE = 3
+TIMESTAMP_SIZE = 8
+NANOSECONDS = 1_000_000_000
+_TIMESTAMP = Struct("!LL")  # epoch, fraction (24 bits) followed by the quality byte
 
 
 class NegativeEpochError(ValueError): ...
@@ -88,6 +94,20 @@ class TimeStamp:
         return cls(second_since_epoch=epoch, fraction_of_second=fraction, time_quality=quality)
 
 
+def pack_nanoseconds_into(buffer: "WriteableBuffer", offset: int, nanoseconds: int, quality: int) -> None:
+    """Writes the 8 bytes timestamp for an epoch in nanoseconds, using integer maths only.
+
+    The fraction is truncated to 24 bits, the same as summing the binary fractions bit by bit.
+    """
+    epoch, fraction = divmod(nanoseconds, NANOSECONDS)
+    _TIMESTAMP.pack_into(buffer, offset, epoch, (fraction << 24) // NANOSECONDS << 8 | quality)
+
+
+def pack_nanoseconds(nanoseconds: int, quality: int) -> bytes:
+    epoch, fraction = divmod(nanoseconds, NANOSECONDS)
+    return _TIMESTAMP.pack(epoch, (fraction << 24) // NANOSECONDS << 8 | quality)
+
+
 class Timestamp(NamedTuple):
     # 61850-7-2, 2nd ed., 6.1.2.9
     second_since_epoch: int  # u32
@@ -139,7 +159,6 @@ class Timestamp(NamedTuple):
         )
 
     def __bytes__(self: "Timestamp") -> bytes:
-        epoch = pack("!L", self.second_since_epoch)
-        fraction = pack("!L", self.int2nano(self.fraction_of_second))[1:]
-        quality = bytes(self.time_quality)
-        return epoch + fraction + quality
+        return pack_nanoseconds(
+            self.second_since_epoch * NANOSECONDS + self.fraction_of_second, int(self.time_quality),
+        )
@@ -0,0 +1,397 @@
+import json
+from bisect import bisect_left
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from struct import Struct
+from sys import argv
+from typing import TYPE_CHECKING, Any
+
+from pygoose.datatypes.time_stamp import NANOSECONDS
+from pygoose.goose import find_field
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from pygoose.goose import GOOSE
+
+MAGIC = b"GOEL"
+FORMAT_VERSION = 1
+SEGMENT_RECORDS = 65_536
+INDEX_EVERY = 64  # one sparse time index entry per this many records
+VALUE_SIZE = 32  # allData prefix kept with each event
+ALL_DATA_TAG = 0xAB
+MILLISECONDS = 1_000_000
+MAX_STREAMS = 4096  # per-stream state kept, spoofed sources must not grow memory unbounded
+
+FIRST = 1  # first frame seen from a stream
+CHANGE = 2  # new stNum
+EXPIRED = 3  # no frame within the time allowed to live
+RESTART = 4  # stNum went backwards, sqNum restarted without a new stNum or confRev changed
+RESUMED = 5  # frames again after EXPIRED, same state
+KINDS = {FIRST: "first", CHANGE: "change", EXPIRED: "expired", RESTART: "restart", RESUMED: "resumed"}
+
+_HEADER = Struct("<4sHHIIqq")  # magic, version, record size, capacity, records, first and last received_ns
+_HEADER_SIZE = 64
+_RECORD = Struct(f"<qQqIIIBBBB{VALUE_SIZE}s")  # see Event, received_ns first so the time index can read it alone
+_TIME = Struct("<q")
+
+
+class SegmentFormatError(ValueError): ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Event:
+    received_ns: int  # for EXPIRED, when the time allowed to live ran out
+    key: int
+    timestamp_ns: int
+    st_num: int
+    sq_num: int
+    ttl: int
+    kind: int
+    test: bool
+    quality: int
+    values: bytes  # allData prefix, up to VALUE_SIZE bytes
+
+    @classmethod
+    def unpack_from(cls: type["Event"], buffer: "memoryview | mmap", offset: int) -> "Event":
+        received_ns, key, timestamp_ns, st_num, sq_num, ttl, kind, test, quality, size, values = _RECORD.unpack_from(
+            buffer, offset,
+        )
+        return cls(
+            received_ns=received_ns, key=key, timestamp_ns=timestamp_ns, st_num=st_num, sq_num=sq_num, ttl=ttl,
+            kind=kind, test=bool(test), quality=quality, values=values[:size],
+        )
+
+    def pack_into(self: "Event", buffer: "memoryview | mmap", offset: int) -> None:
+        _RECORD.pack_into(
+            buffer, offset, self.received_ns, self.key, self.timestamp_ns, self.st_num, self.sq_num, self.ttl,
+            self.kind, self.test, self.quality, len(self.values), self.values,
+        )
+
+
+def _record_offset(index: int) -> int:
+    return _HEADER_SIZE + index * _RECORD.size
+
+
+class _Stream:
+    __slots__ = ("st_num", "sq_num", "conf_rev", "deadline", "expired")
+
+    def __init__(self: "_Stream", goose: "GOOSE", deadline: int) -> None:
+        self.st_num = goose.st_num
+        self.sq_num = goose.sq_num
+        self.conf_rev = goose.conf_rev
+        self.deadline = deadline
+        self.expired = False
+
+
+class _Segment:
+    """One preallocated, memory-mapped segment file being appended to."""
+
+    def __init__(self: "_Segment", path: Path, capacity: int) -> None:
+        self.path = path
+        self.capacity = capacity
+        self.count = 0
+        self.first_ns = self.last_ns = 0
+        self.times: list[tuple[int, int]] = []  # sparse (received_ns, record)
+        self.streams: dict[int, list[int]] = {}  # key: records
+        with path.open("wb") as file:
+            file.truncate(_record_offset(capacity))
+        self._file = path.open("r+b")
+        self.map = mmap(self._file.fileno(), 0)
+        _HEADER.pack_into(self.map, 0, MAGIC, FORMAT_VERSION, _RECORD.size, capacity, 0, 0, 0)
+
+    @property
+    def full(self: "_Segment") -> bool:
+        return self.count >= self.capacity
+
+    def append(self: "_Segment", event: Event) -> None:
+        index = self.count
+        event.pack_into(self.map, _record_offset(index))
+        if not index:
+            self.first_ns = event.received_ns
+        self.last_ns = max(self.last_ns, event.received_ns)
+        if not index % INDEX_EVERY:
+            self.times.append((event.received_ns, index))
+        self.streams.setdefault(event.key, []).append(index)
+        self.count += 1
+        # the count goes last, readers never look past it
+        _HEADER.pack_into(
+            self.map, 0, MAGIC, FORMAT_VERSION, _RECORD.size, self.capacity, self.count, self.first_ns, self.last_ns,
+        )
+
+    def close(self: "_Segment") -> None:
+        self.map.flush()
+        self.map.close()
+        self._file.truncate(_record_offset(self.count))
+        self._file.close()
+        index = {
+            "version": FORMAT_VERSION,
+            "records": self.count,
+            "first_ns": self.first_ns,
+            "last_ns": self.last_ns,
+            "times": self.times,
+            "streams": {f"{key:016x}": records for key, records in self.streams.items()},
+        }
+        _index_path(self.path).write_text(json.dumps(index))  # written last, marks the segment closed
+
+
+def _segment_path(directory: Path, number: int) -> Path:
+    return directory / f"events_{number:06d}.seg"
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_suffix(".idx")
+
+
+class EventLog:
+    """Appends state changes (first frame, new stNum, ttl expiry, restarts) to memory-mapped segment files.
+
+    Heartbeats and retransmissions are not recorded. A segment rolls over once it holds segment_records events or
+    has been open for max_seconds; closing it writes the sparse time index and the per-stream index next to it.
+    Streams beyond max_streams are not followed, their frames only count in untracked.
+    """
+
+    def __init__(
+        self: "EventLog", directory: Path, *, segment_records: int = SEGMENT_RECORDS, max_seconds: float | None = None,
+        max_streams: int = MAX_STREAMS,
+    ) -> None:
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+        self.segment_records = segment_records
+        self.max_ns = None if max_seconds is None else int(max_seconds * NANOSECONDS)
+        self.streams: dict[int, _Stream] = {}
+        self.max_streams = max_streams
+        self.untracked = 0
+        self.deadlines: list[tuple[int, int]] = []  # (deadline, key), stale entries are skipped
+        self.recorded = 0
+        self._number = max((int(path.stem.split("_")[1]) for path in directory.glob("events_*.seg")), default=-1) + 1
+        self._segment: _Segment | None = None
+
+    def _append(self: "EventLog", event: Event) -> None:
+        segment = self._segment
+        if segment is not None and (
+            segment.full or (self.max_ns is not None and event.received_ns - segment.first_ns >= self.max_ns)
+        ):
+            segment.close()
+            segment = None
+        if segment is None:
+            segment = self._segment = _Segment(_segment_path(self.directory, self._number), self.segment_records)
+            self._number += 1
+        segment.append(event)
+        self.recorded += 1
+
+    def check(self: "EventLog", now_ns: int) -> None:
+        """Records EXPIRED for every stream whose time allowed to live ran out before now_ns.
+
+        Runs on every frame; call it from a timer too if the whole bus may go quiet.
+        """
+        deadlines = self.deadlines
+        while deadlines and deadlines[0][0] < now_ns:
+            deadline, key = heappop(deadlines)
+            stream = self.streams[key]
+            if stream.deadline != deadline or stream.expired:
+                continue
+            stream.expired = True
+            self._append(
+                Event(
+                    received_ns=deadline, key=key, timestamp_ns=0, st_num=stream.st_num, sq_num=stream.sq_num, ttl=0,
+                    kind=EXPIRED, test=False, quality=0, values=b"",
+                ),
+            )
+
+    def _update(self: "EventLog", goose: "GOOSE", received_ns: int) -> int:
+        """Follows the stream's state, returns the kind of event the frame makes or 0 for none."""
+        self.check(received_ns)
+        deadline = received_ns + goose.ttl * MILLISECONDS
+        stream = self.streams.get(goose.key)
+        if stream is None:
+            if len(self.streams) >= self.max_streams:
+                self.untracked += 1
+                return 0
+            kind = FIRST
+            stream = self.streams[goose.key] = _Stream(goose, deadline)
+        else:
+            kind = 0
+            if goose.st_num < stream.st_num or goose.conf_rev != stream.conf_rev:
+                kind = RESTART
+            elif goose.st_num != stream.st_num:
+                kind = CHANGE
+            elif goose.sq_num < stream.sq_num:
+                kind = RESTART
+            elif stream.expired:
+                kind = RESUMED
+            stream.st_num, stream.sq_num, stream.conf_rev = goose.st_num, goose.sq_num, goose.conf_rev
+            stream.deadline, stream.expired = deadline, False
+        heappush(self.deadlines, (deadline, goose.key))
+        return kind
+
+    def _write(self: "EventLog", goose: "GOOSE", received_ns: int, kind: int, values: bytes) -> None:
+        timestamp = goose.timestamp
+        self._append(
+            Event(
+                received_ns=received_ns, key=goose.key,
+                timestamp_ns=timestamp.second_since_epoch * NANOSECONDS + timestamp.fraction_of_second,
+                st_num=goose.st_num, sq_num=goose.sq_num, ttl=goose.ttl, kind=kind, test=goose.test,
+                quality=int(timestamp.time_quality), values=values[:VALUE_SIZE],
+            ),
+        )
+
+    def record(self: "EventLog", goose: "GOOSE", received_ns: int, values: bytes = b"") -> None:
+        kind = self._update(goose, received_ns)
+        if kind:
+            self._write(goose, received_ns, kind, values)
+
+    def sink(self: "EventLog", received_ns: int, data: bytes, goose: "GOOSE") -> None:
+        """Pipeline sink, allData is only looked up for frames that make an event."""
+        kind = self._update(goose, received_ns)
+        if kind:
+            offset, length = find_field(data, ALL_DATA_TAG)
+            self._write(goose, received_ns, kind, data[offset : offset + length])
+
+    def rollover(self: "EventLog") -> None:
+        """Closes the current segment, making it visible to indexed queries."""
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def close(self: "EventLog") -> None:
+        self.rollover()
+
+    def __enter__(self: "EventLog") -> "EventLog":
+        return self
+
+    def __exit__(self: "EventLog", *_: object) -> None:
+        self.close()
+
+
+class SegmentReader:
+    """Read-only view of a segment, closed or still being written."""
+
+    def __init__(self: "SegmentReader", path: Path) -> None:
+        self.path = path
+        with path.open("rb") as file:
+            self.map = mmap(file.fileno(), 0, access=ACCESS_READ)
+        magic, version, record_size, _, count, self.first_ns, self.last_ns = _HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != _RECORD.size:
+            self.map.close()
+            msg = f"{path} is not an event log segment (version {FORMAT_VERSION})"
+            raise SegmentFormatError(msg)
+        self.count = count
+        index = _index_path(path)
+        self.index: dict[str, Any] | None = json.loads(index.read_text()) if index.exists() else None
+
+    def event(self: "SegmentReader", record: int) -> Event:
+        return Event.unpack_from(self.map, _record_offset(record))
+
+    def _time(self: "SegmentReader", record: int) -> int:
+        (received_ns,) = _TIME.unpack_from(self.map, _record_offset(record))
+        return int(received_ns)
+
+    def _start(self: "SegmentReader", start_ns: int) -> int:
+        """First record received at or after start_ns, seeking with the sparse index when there is one."""
+        low, high = 0, self.count
+        if self.index is not None:
+            times = self.index["times"]
+            position = bisect_left(times, start_ns, key=lambda entry: entry[0])
+            low = times[position - 1][1] if position else 0
+            high = times[position][1] if position < len(times) else self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._time(middle) < start_ns:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def query(self: "SegmentReader", start_ns: int, end_ns: int, keys: "set[int] | None" = None) -> "Iterator[Event]":
+        if not self.count or self.last_ns < start_ns or self.first_ns > end_ns:
+            return
+        first = self._start(start_ns)
+        records: Iterable[int] = range(first, self.count)
+        if keys is not None and self.index is not None:
+            records = sorted(
+                record
+                for key in keys
+                for record in self.index["streams"].get(f"{key:016x}", ())
+                if record >= first
+            )
+        for record in records:
+            event = self.event(record)
+            if event.received_ns > end_ns:
+                return
+            if keys is None or event.key in keys:
+                yield event
+
+    def close(self: "SegmentReader") -> None:
+        self.map.close()
+
+    def __enter__(self: "SegmentReader") -> "SegmentReader":
+        return self
+
+    def __exit__(self: "SegmentReader", *_: object) -> None:
+        self.close()
+
+
+def segments(directory: Path) -> list[Path]:
+    return sorted(directory.glob("events_*.seg"))
+
+
+def query(
+    directory: Path, start_ns: int, end_ns: int, keys: "Iterable[int] | None" = None, *, active: bool = True,
+) -> "Iterator[Event]":
+    """Events received between start_ns and end_ns (inclusive) in time order, optionally only for some streams.
+
+    Closed segments are searched through their indexes; the segment still being written (active) is searched too,
+    reading only the records it had committed when the query reached it.
+    """
+    wanted = None if keys is None else set(keys)
+    for path in segments(directory):
+        if not active and not _index_path(path).exists():
+            continue
+        with SegmentReader(path) as reader:
+            yield from reader.query(start_ns, end_ns, wanted)
+
+
+def compact(directory: Path, before_ns: int) -> Path | None:
+    """Merges the closed segments that end before before_ns into one holding the last event of each stream.
+
+    History older than before_ns collapses into the state of each stream at that time, which is enough to tell what
+    every stream looked like when a later range starts. Returns the compacted segment, if any.
+    """
+    old = []
+    for path in segments(directory):
+        if not _index_path(path).exists():
+            break
+        with SegmentReader(path) as reader:
+            if reader.last_ns >= before_ns:
+                break
+        old.append(path)
+    if not old:
+        return None
+    latest: dict[int, Event] = {}
+    for path in old:
+        with SegmentReader(path) as reader:
+            for record in range(reader.count):
+                event = reader.event(record)
+                latest[event.key] = event
+    events = sorted(latest.values(), key=lambda event: event.received_ns)
+    temporary = directory / "compacting.tmp"
+    segment = _Segment(temporary, max(len(events), 1))
+    for event in events:
+        segment.append(event)
+    segment.close()
+    for path in old:
+        _index_path(path).unlink()
+        path.unlink()
+    target = old[0]
+    temporary.replace(target)
+    _index_path(temporary).replace(_index_path(target))
+    return target
+
+
+if __name__ == "__main__":
+    # python -m pygoose.eventlog <directory> <start_ns> <end_ns>
+    for found in query(Path(argv[1]), int(argv[2]), int(argv[3])):
+        print(f"{found.received_ns} {found.key:016x} {KINDS[found.kind]:<8} st {found.st_num} sq {found.sq_num}")
@@ -0,0 +1,338 @@
+import operator
+import re
+from typing import TYPE_CHECKING, Any
+
+from pygoose.asn1 import unpack_length_from
+from pygoose.goose import HEADER, HEADER_SIZE, VLAN_SIZE, identity, iter_fields, pdu_offset
+from pygoose.utils import mac2bytes
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    Memo = list[bool | None]
+    Node = Callable[["LazyGoose", Memo], bool]
+    Expression = tuple[object, ...]
+
+
+class FilterError(ValueError): ...
+
+
+def _uint(value: bytes) -> int:
+    return int.from_bytes(value, "big")
+
+
+def _bool(value: bytes) -> bool:
+    return value != b"\x00"
+
+
+def _first_bool(value: bytes) -> bool:
+    length, offset = unpack_length_from(value, 1)
+    return value[offset : offset + length] != b"\x00"
+
+
+_HEADER_FIELDS = {
+    "mac_dest": 0, "mac_src": 1, "ether": 2, "app_id": 3, "goose_length": 4, "reserved1": 5, "reserved2": 6,
+}
+_PDU_FIELDS: "dict[str, tuple[int, Callable[[bytes], object]]]" = {
+    "gocb_ref": (0x80, identity),
+    "ttl": (0x81, _uint),
+    "data_set": (0x82, identity),
+    "go_id": (0x83, identity),
+    "st_num": (0x85, _uint),
+    "sq_num": (0x86, _uint),
+    "test": (0x87, _bool),
+    "conf_rev": (0x88, _uint),
+    "nds_com": (0x89, _bool),
+    "num_datset_entries": (0x8A, _uint),
+    "trip": (0xAB, _first_bool),
+}
+_MACS = {"mac_dest", "mac_src"}
+_STRINGS = {"gocb_ref", "data_set", "go_id"}
+_BOOLS = {"test", "nds_com", "trip"}
+_OPERATORS: "dict[str, Callable[[Any, Any], object]]" = {
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+_TOKEN = re.compile(
+    r"\s*(?:(?P<number>0x[0-9a-fA-F]+|\d+)|(?P<string>\"[^\"]*\"|'[^']*')|(?P<symbol>==|!=|<=|>=|<|>|\(|\))"
+    r"|(?P<name>[A-Za-z_]\w*))",
+)
+_MISSING = object()
+MAX_STREAMS = 4096  # per `changed` field, so spoofed stream keys can't grow the previous values without bound
+
+
+class LazyGoose:
+    """GOOSE frame decoded field by field, only the fields that are asked for.
+
+    Field names and values match GOOSE; the PDU is walked once, without decoding, the first time a PDU field is read.
+    """
+
+    __slots__ = ("frame", "_header", "_offsets", "_values")
+
+    def __init__(self: "LazyGoose", frame: bytes) -> None:
+        self.frame = frame
+        self._header: tuple[object, ...] | None = None
+        self._offsets: dict[int, tuple[int, int]] | None = None
+        self._values: dict[str, object] = {}
+
+    @property
+    def header(self: "LazyGoose") -> tuple[object, ...]:
+        if self._header is None:
+            header = HEADER.unpack_from(self.frame)
+            if pdu_offset(self.frame) != HEADER_SIZE:  # tagged, the fields after the source move by the tag
+                header = header[:2] + HEADER.unpack_from(self.frame, VLAN_SIZE)[2:]
+            self._header = header
+        return self._header
+
+    @property
+    def key(self: "LazyGoose") -> int:
+        """Stream key, same as GOOSE.key."""
+        app_id = pdu_offset(self.frame) - 8
+        return int.from_bytes(self.frame[6:12], "big") << 16 | int.from_bytes(self.frame[app_id : app_id + 2], "big")
+
+    def get(self: "LazyGoose", name: str) -> object:
+        value = self._values.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+        if name in _HEADER_FIELDS:
+            value = self.header[_HEADER_FIELDS[name]]
+        else:
+            tag, convert = _PDU_FIELDS[name]
+            if self._offsets is None:
+                self._offsets = {tag: (offset, length) for tag, offset, length in iter_fields(self.frame)}
+            if tag not in self._offsets:
+                msg = f"Can't find field {tag:#x}"
+                raise ValueError(msg)
+            offset, length = self._offsets[tag]
+            value = convert(bytes(self.frame[offset : offset + length]))  # identity caches by value, needs bytes
+        self._values[name] = value
+        return value
+
+
+def _literal(field: str, kind: str, text: str) -> object:
+    if field in _STRINGS or field in _MACS:
+        if kind != "string":
+            msg = f"{field} compares to a quoted string"
+            raise FilterError(msg)
+        return mac2bytes(text[1:-1]) if field in _MACS else text[1:-1]
+    if field in _BOOLS:
+        if kind != "name" or text.lower() not in ("true", "false"):
+            msg = f"{field} compares to true or false"
+            raise FilterError(msg)
+        return text.lower() == "true"
+    if kind != "number":
+        msg = f"{field} compares to a number"
+        raise FilterError(msg)
+    return int(text, 0)
+
+
+class _Parser:
+    """expression := term ("or" term)*, term := factor ("and" factor)*, factor := "not" factor | "(" expression ")"
+    | field operator literal | field "changed"
+    """
+
+    def __init__(self: "_Parser", text: str) -> None:
+        self.tokens: list[tuple[str, str]] = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None or match.lastgroup is None:
+                msg = f"Unexpected {text[position:].strip()!r}"
+                raise FilterError(msg)
+            self.tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+        self.position = 0
+
+    def peek(self: "_Parser") -> tuple[str, str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else ("end", "")
+
+    def take(self: "_Parser") -> tuple[str, str]:
+        token = self.peek()
+        if token[0] == "end":
+            msg = "Unexpected end of filter"
+            raise FilterError(msg)
+        self.position += 1
+        return token
+
+    def keyword(self: "_Parser", word: str) -> bool:
+        kind, text = self.peek()
+        if kind == "name" and text.lower() == word:
+            self.position += 1
+            return True
+        return False
+
+    def parse(self: "_Parser") -> "Expression":
+        expression = self.expression()
+        if self.peek()[0] != "end":
+            msg = f"Unexpected {self.peek()[1]!r}"
+            raise FilterError(msg)
+        return expression
+
+    def expression(self: "_Parser") -> "Expression":
+        expression = self.term()
+        while self.keyword("or"):
+            expression = ("or", expression, self.term())
+        return expression
+
+    def term(self: "_Parser") -> "Expression":
+        expression = self.factor()
+        while self.keyword("and"):
+            expression = ("and", expression, self.factor())
+        return expression
+
+    def factor(self: "_Parser") -> "Expression":
+        if self.keyword("not"):
+            return ("not", self.factor())
+        kind, field = self.take()
+        if kind == "symbol" and field == "(":
+            expression = self.expression()
+            if self.take() != ("symbol", ")"):
+                msg = "Missing ')'"
+                raise FilterError(msg)
+            return expression
+        if kind != "name" or (field not in _HEADER_FIELDS and field not in _PDU_FIELDS):
+            msg = f"Unknown field {field!r}"
+            raise FilterError(msg)
+        if self.keyword("changed"):
+            return ("changed", field)
+        kind, symbol = self.take()
+        if symbol not in _OPERATORS:
+            msg = f"Expected a comparison after {field}, got {symbol!r}"
+            raise FilterError(msg)
+        kind, text = self.take()
+        return ("compare", field, symbol, _literal(field, kind, text))
+
+
+def parse(text: str) -> "Expression":
+    """Parses a filter into nested tuples, e.g. ("and", ("compare", "go_id", "==", "X"), ("changed", "st_num"))."""
+    return _Parser(text).parse()
+
+
+class FilterSet:
+    """Many filters compiled into closures that share every common sub-expression.
+
+    Each distinct sub-expression is evaluated at most once per frame, and all `field == literal` comparisons on the
+    same field are answered together by a single dict lookup, so adding filters doesn't add field decodes.
+    `changed` remembers up to max_streams streams per field, frames of streams beyond that always count as changed.
+    """
+
+    def __init__(self: "FilterSet", max_streams: int = MAX_STREAMS) -> None:
+        self.max_streams = max_streams
+        self.untracked = 0  # `changed` evaluations for streams over max_streams
+        self.filters: list[int] = []  # root node of each filter
+        self._nodes: list[Node] = []
+        self._interned: dict[Expression, int] = {}
+        self._equal: dict[str, tuple[list[int], dict[object, list[int]]]] = {}  # field: (atoms, value: atoms)
+        self._changed: list[tuple[int, str, dict[int, object]]] = []  # atom, field, previous value per stream
+
+    def __len__(self: "FilterSet") -> int:
+        return len(self.filters)
+
+    def add(self: "FilterSet", text: str) -> int:
+        """Compiles and adds a filter, returns its id (as reported by match)."""
+        self.filters.append(self._intern(parse(text)))
+        return len(self.filters) - 1
+
+    def _intern(self: "FilterSet", expression: "Expression") -> int:
+        index = self._interned.get(expression)
+        if index is None:
+            children = [self._intern(child) for child in expression[1:] if isinstance(child, tuple)]
+            index = self._interned[expression] = len(self._nodes)
+            self._nodes.append(self._compile(expression, index, children))
+        return index
+
+    def _compile(self: "FilterSet", expression: "Expression", index: int, children: list[int]) -> "Node":  # noqa: C901
+        nodes = self._nodes
+        kind = expression[0]
+        if kind == "changed":
+            self._changed.append((index, str(expression[1]), {}))
+
+            def changed(view: LazyGoose, memo: "Memo") -> bool:  # noqa: ARG001
+                return memo[index] is True
+
+            return changed
+        if kind == "not":
+            (child,) = children
+
+            def negate(view: LazyGoose, memo: "Memo") -> bool:
+                result = memo[index]
+                if result is None:
+                    result = memo[index] = not nodes[child](view, memo)
+                return result
+
+            return negate
+        if kind in ("and", "or"):
+            left, right = children
+            conjunction = kind == "and"
+
+            def combine(view: LazyGoose, memo: "Memo") -> bool:
+                result = memo[index]
+                if result is None:
+                    result = nodes[left](view, memo)
+                    if result is conjunction:
+                        result = nodes[right](view, memo)
+                    memo[index] = result
+                return result
+
+            return combine
+        _, field, symbol, value = expression
+        name = str(field)
+        if symbol == "==":
+            atoms, by_value = self._equal.setdefault(name, ([], {}))
+            atoms.append(index)
+            by_value.setdefault(value, []).append(index)
+
+            def equal(view: LazyGoose, memo: "Memo") -> bool:
+                result = memo[index]
+                if result is None:
+                    for atom in atoms:
+                        memo[atom] = False
+                    for atom in by_value.get(view.get(name), ()):
+                        memo[atom] = True
+                    result = memo[index]
+                return result is True
+
+            return equal
+        compare = _OPERATORS[str(symbol)]
+
+        def comparison(view: LazyGoose, memo: "Memo") -> bool:
+            result = memo[index]
+            if result is None:
+                result = memo[index] = bool(compare(view.get(name), value))
+            return result
+
+        return comparison
+
+    def _memo(self: "FilterSet", view: LazyGoose) -> "Memo":
+        memo: Memo = [None] * len(self._nodes)
+        if self._changed:  # stateful, must see every frame even when short-circuited
+            key = view.key
+            for index, field, previous in self._changed:
+                value = view.get(field)
+                memo[index] = previous.get(key, _MISSING) != value
+                if key in previous or len(previous) < self.max_streams:
+                    previous[key] = value
+                else:
+                    self.untracked += 1
+        return memo
+
+    def match(self: "FilterSet", frame: "bytes | LazyGoose") -> list[int]:
+        """Returns the ids of every filter the frame matches."""
+        view = frame if isinstance(frame, LazyGoose) else LazyGoose(frame)
+        memo = self._memo(view)
+        nodes = self._nodes
+        return [number for number, root in enumerate(self.filters) if nodes[root](view, memo)]
+
+    def __call__(self: "FilterSet", frame: "bytes | LazyGoose") -> bool:
+        """Whether the frame matches any filter, stops at the first one that does."""
+        view = frame if isinstance(frame, LazyGoose) else LazyGoose(frame)
+        memo = self._memo(view)
+        nodes = self._nodes
+        return any(nodes[root](view, memo) for root in self.filters)
+
+
+def compile_filter(text: str) -> FilterSet:
+    """A FilterSet holding a single filter, call it with a frame."""
+    filters = FilterSet()
+    filters.add(text)
+    return filters
@@ -0,0 +1,177 @@
+import json
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from socket import MSG_DONTWAIT, socket
+from struct import Struct
+from sys import argv
+from time import time_ns
+from typing import TYPE_CHECKING, Any
+
+from pygoose import timestamping
+from pygoose.goose import DEFAULT_PRIORITY, GOOSE_ETHER, VLAN_ETHER, VLAN_SIZE, check_vlan
+from pygoose.histogram import Histogram
+from pygoose.transport import open_receiver, open_sender
+from pygoose.utils import mac2bytes
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pygoose.replay import Sender
+
+PACKET_OUTGOING = 4  # sll_pkttype of frames this host sent, seen again by a receiving packet socket
+BUFFER_SIZE = 1518 + VLAN_SIZE * 2  # room for a tag to be inserted in place
+DEFAULT_BATCH = 64
+
+_U16 = Struct("!H")
+_VLAN = Struct("!HH")  # TPID, TCI
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Route:
+    """Which frames to forward (None matches anything) and what to rewrite on the way out."""
+
+    app_id: int | None = None
+    src_addr: bytes | None = None
+    set_dst_addr: bytes | None = None
+    set_src_addr: bytes | None = None
+    set_app_id: int | None = None
+    set_vid: int | None = None  # tags untagged frames, priority defaults to DEFAULT_PRIORITY
+    set_priority: int | None = None
+
+    def __post_init__(self: "Route") -> None:
+        check_vlan(self.set_priority, self.set_vid)
+
+    @classmethod
+    def from_dict(cls: type["Route"], route: dict[str, Any]) -> "Route":
+        """From JSON, MACs as strings ("01:0c:cd:01:00:01") and numbers as ints or "0x" strings."""
+        fields: dict[str, Any] = {}
+        for name, value in route.items():
+            if name.endswith("addr"):
+                fields[name] = mac2bytes(value)
+            else:
+                fields[name] = int(value, 0) if isinstance(value, str) else value
+        return cls(**fields)
+
+    def patch(self: "Route", frame: bytearray, size: int, tagged: bool) -> int:  # noqa: FBT001
+        """Rewrites the frame in place, returns its new size."""
+        if self.set_dst_addr is not None:
+            frame[0:6] = self.set_dst_addr
+        if self.set_src_addr is not None:
+            frame[6:12] = self.set_src_addr
+        if self.set_vid is not None or self.set_priority is not None:
+            if tagged:
+                (tci,) = _U16.unpack_from(frame, 14)
+            else:
+                frame[12 + VLAN_SIZE : size + VLAN_SIZE] = frame[12:size]
+                size += VLAN_SIZE
+                tci = DEFAULT_PRIORITY << 13
+                tagged = True
+            if self.set_priority is not None:
+                tci = (tci & 0x1FFF) | self.set_priority << 13
+            if self.set_vid is not None:
+                tci = (tci & 0xF000) | self.set_vid
+            _VLAN.pack_into(frame, 12, VLAN_ETHER, tci)
+        if self.set_app_id is not None:
+            _U16.pack_into(frame, 14 + VLAN_SIZE * tagged, self.set_app_id)
+        return size
+
+
+class Gateway:
+    """Forwards GOOSE frames from one interface to another, one direction.
+
+    Frames are received into a preallocated buffer, matched on source MAC and APPID against the forwarding table and
+    patched in place, nothing is decoded or re-encoded. Latency is measured from the kernel receive timestamp to the
+    return of send, per frame.
+    """
+
+    def __init__(self: "Gateway", routes: "Iterable[Route]", *, batch: int = DEFAULT_BATCH) -> None:
+        self.exact: dict[tuple[bytes, int], Route] = {}
+        self.by_app_id: dict[int, Route] = {}
+        self.by_source: dict[bytes, Route] = {}
+        self.default: Route | None = None
+        for route in routes:
+            if route.src_addr is not None and route.app_id is not None:
+                self.exact[(route.src_addr, route.app_id)] = route
+            elif route.app_id is not None:
+                self.by_app_id[route.app_id] = route
+            elif route.src_addr is not None:
+                self.by_source[route.src_addr] = route
+            else:
+                self.default = route
+        self.batch = batch
+        self.buffer = bytearray(BUFFER_SIZE)
+        self.latency = Histogram()
+        self.forwarded = 0
+        self.dropped = 0  # not GOOSE or no route
+
+    def lookup(self: "Gateway", src_addr: bytes, app_id: int) -> Route | None:
+        route = self.exact.get((src_addr, app_id))
+        if route is None:
+            route = self.by_app_id.get(app_id) or self.by_source.get(src_addr) or self.default
+        return route
+
+    def forward(self: "Gateway", frame: bytearray, size: int) -> int:
+        """Patches a received frame in place, returns the size to send or 0 to drop it."""
+        if size < 18:  # noqa: PLR2004
+            self.dropped += 1
+            return 0
+        (ether,) = _U16.unpack_from(frame, 12)
+        tagged = ether == VLAN_ETHER
+        if tagged:
+            (ether,) = _U16.unpack_from(frame, 12 + VLAN_SIZE)
+        if ether != GOOSE_ETHER:
+            self.dropped += 1
+            return 0
+        (app_id,) = _U16.unpack_from(frame, 14 + VLAN_SIZE * tagged)
+        route = self.lookup(bytes(frame[6:12]), app_id)
+        if route is None:
+            self.dropped += 1
+            return 0
+        self.forwarded += 1
+        return route.patch(frame, size, tagged)
+
+    def _receive(self: "Gateway", nic: socket, flags: int) -> tuple[int, int | None]:
+        size, ancdata, _, address = nic.recvmsg_into([self.buffer], timestamping.ANCILLARY_SIZE, flags)
+        if address and address[2] == PACKET_OUTGOING:  # loopback senders have no address
+            return 0, None
+        tag = timestamping.vlan_tag(ancdata)
+        if tag is not None:  # put back in place the tag the kernel stripped
+            self.buffer[12 + VLAN_SIZE : size + VLAN_SIZE] = self.buffer[12:size]
+            _VLAN.pack_into(self.buffer, 12, *tag)
+            size += VLAN_SIZE
+        return size, timestamping.kernel_ns(ancdata)
+
+    def run(self: "Gateway", receiver: socket, sender: "Sender") -> None:
+        """Blocks for the first frame, then drains whatever is already queued (up to batch) before blocking again."""
+        buffer = memoryview(self.buffer)
+        while True:
+            flags = 0
+            for _ in range(self.batch):
+                try:
+                    size, kernel_ns = self._receive(receiver, flags)
+                except BlockingIOError:
+                    break
+                flags = MSG_DONTWAIT
+                size = self.forward(self.buffer, size)
+                if not size:
+                    continue
+                sender.sendall(buffer[:size])
+                if kernel_ns is not None:
+                    self.latency.record(time_ns() - kernel_ns)
+
+    def snapshot(self: "Gateway") -> dict[str, Any]:
+        return {"forwarded": self.forwarded, "dropped": self.dropped, "latency_ns": self.latency.snapshot()}
+
+
+def run(source: str, destination: str, routes: "Iterable[Route]") -> Gateway:
+    gateway = Gateway(routes)
+    with open_receiver(source) as receiver, open_sender(destination) as sender, suppress(KeyboardInterrupt):
+        gateway.run(receiver, sender)
+    return gateway
+
+
+if __name__ == "__main__":
+    # python -m pygoose.gateway <from interface> <to interface> <routes.json>
+    main_routes = [Route.from_dict(route) for route in json.loads(Path(argv[3]).read_text())]
+    print(json.dumps(run(argv[1], argv[2], main_routes).snapshot(), indent=2))
@@ -1,45 +1,157 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from struct import Struct
 from struct import pack as s_pack
+from sys import intern
 from typing import TYPE_CHECKING, NamedTuple
 
-from pygoose.asn1 import Triplet
+from pygoose.asn1 import Constructed, Encoder, Primitive, Triplet, unpack_length_from
 from pygoose.datatypes import Timestamp
-from pygoose.utils import (
-    bytes2ether,
-    bytes2hexstring,
-    bytes2mac,
-    bytes2string,
-    bytes2u16,
-    ether2bytes,
-    mac2bytes,
-    now,
-    u32_bytes,
-)
+from pygoose.utils import bytes2string, mac2bytes, now, u32_bytes
 
 if TYPE_CHECKING:
     from typing import Iterator
 
+    from _typeshed import ReadableBuffer
 
-def generate_goose(index_range: int) -> "Iterator[tuple[float, bytes]]":
+    from pygoose.asn1 import Node
+
+
+GOOSE_ETHER = 0x88B8
+GOOSE_PDU_TAG = 0x61
+TIMESTAMP_TAG = 0x84
+IDENTITY_CACHE_SIZE = 4096  # LRU bound, spoofed identities evict each other instead of growing memory
+HEADER_SIZE = 22  # destination, source, ethertype, APPID, length, reserved 1 and reserved 2
+HEADER = Struct("!6s6sHHHHH")
+VLAN_ETHER = 0x8100
+VLAN_SIZE = 4
+DEFAULT_PRIORITY = 4  # IEC 61850-8-1 default user priority for GOOSE
+MAX_PRIORITY = 7  # 3 bit PCP
+MAX_VID = 4095  # 12 bit VID, the bit above it is DEI
+TAGGED_HEADER_SIZE = HEADER_SIZE + VLAN_SIZE
+TAGGED_HEADER = Struct("!6s6sHHHHHHH")  # as HEADER, with the 802.1Q TPID and TCI after the source
+
+_U16 = Struct("!H")
+
+
+class Header(NamedTuple):
+    dst_addr: bytes
+    src_addr: bytes
+    ether: int
+    app_id: int
+    length: int
+    pdu_offset: int
+    tci: int | None = None  # 802.1Q priority (3 bits), DEI (1 bit) and VID (12 bits), None when untagged
+
+    @property
+    def key(self: "Header") -> int:
+        """Stream key, same as GOOSE.key."""
+        return int.from_bytes(self.src_addr, "big") << 16 | self.app_id
+
+
+def pdu_offset(frame: "ReadableBuffer") -> int:
+    """Where the PDU starts, past the 802.1Q tag when the frame has one."""
+    return TAGGED_HEADER_SIZE if _U16.unpack_from(frame, 12)[0] == VLAN_ETHER else HEADER_SIZE
+
+
+def peek_header(frame: "ReadableBuffer") -> Header:
+    """Reads only the fixed header, enough to route or drop a frame before decoding it.
+
+    A VLAN tag is skipped here once: ether is the inner ethertype and pdu_offset accounts for the tag.
+    """
+    if len(memoryview(frame)) < HEADER_SIZE:
+        raise ValueError("GOOSE data missing...")
+    dst_addr, src_addr, ether, app_id, length, _, _ = HEADER.unpack_from(frame)
+    if ether != VLAN_ETHER:
+        return Header(dst_addr, src_addr, ether, app_id, length, HEADER_SIZE)
+    if len(memoryview(frame)) < TAGGED_HEADER_SIZE:
+        raise ValueError("GOOSE data missing...")
+    _, _, _, tci, ether, app_id, length, _, _ = TAGGED_HEADER.unpack_from(frame)
+    return Header(dst_addr, src_addr, ether, app_id, length, TAGGED_HEADER_SIZE, tci)
+
+
+def check_vlan(priority: int | None, vid: int | None) -> None:
+    """Raises ValueError for a priority or VID that doesn't fit its 802.1Q TCI field, None is always valid."""
+    if priority is not None and not 0 <= priority <= MAX_PRIORITY:
+        msg = f"VLAN priority {priority} not in 0..{MAX_PRIORITY}"
+        raise ValueError(msg)
+    if vid is not None and not 0 <= vid <= MAX_VID:
+        msg = f"VLAN ID {vid} not in 0..{MAX_VID}"
+        raise ValueError(msg)
+
+
+def pack_frame(  # noqa: PLR0913
+    dst_addr: bytes, src_addr: bytes, app_id: int, *pdu: "Node", ether: int = GOOSE_ETHER,
+    reserved1: int = 0, reserved2: int = 0, priority: int | None = None, vid: int | None = None,
+) -> bytearray:
+    """Serialises the ethernet header and the pdu into a single preallocated frame.
+
+    Setting priority or vid adds an 802.1Q tag, priority defaults to DEFAULT_PRIORITY and vid to 0 (priority tagged).
+    """
+    check_vlan(priority, vid)
+    encoder = Encoder(*pdu)
+    # length counts APPID, length, reserved 1 and reserved 2 (8 bytes) plus the pdu
+    if priority is None and vid is None:
+        frame = bytearray(HEADER_SIZE + encoder.size)
+        HEADER.pack_into(frame, 0, dst_addr, src_addr, ether, app_id, encoder.size + 8, reserved1, reserved2)
+        encoder.pack_into(frame, HEADER_SIZE)
+        return frame
+    tci = (DEFAULT_PRIORITY if priority is None else priority) << 13 | (vid or 0)
+    frame = bytearray(TAGGED_HEADER_SIZE + encoder.size)
+    TAGGED_HEADER.pack_into(
+        frame, 0, dst_addr, src_addr, VLAN_ETHER, tci, ether, app_id, encoder.size + 8, reserved1, reserved2,
+    )
+    encoder.pack_into(frame, TAGGED_HEADER_SIZE)
+    return frame
+
+
+def iter_fields(frame: "ReadableBuffer", offset: int | None = None) -> "Iterator[tuple[int, int, int]]":
+    """Yields tag, value offset and length of each PDU field, without decoding them."""
+    view = memoryview(frame)
+    if offset is None:
+        offset = pdu_offset(view)
+    if view[offset] != GOOSE_PDU_TAG:
+        raise ValueError("Can't find GOOSE PDU")
+    length, offset = unpack_length_from(view, offset + 1)
+    end = offset + length
+    if end > len(view):
+        raise ValueError("GOOSE data missing...")
+    while offset < end:
+        tag = view[offset]
+        length, value_offset = unpack_length_from(view, offset + 1)
+        yield tag, value_offset, length
+        offset = value_offset + length
+
+
+def find_field(frame: "ReadableBuffer", tag: int, offset: int | None = None) -> tuple[int, int]:
+    """Returns the offset and length of the value of the first PDU field tagged `tag`, without decoding."""
+    for field_tag, value_offset, length in iter_fields(frame, offset):
+        if field_tag == tag:
+            return value_offset, length
+    msg = f"Can't find field {tag:#x}"
+    raise ValueError(msg)
+
+
+def generate_goose(
+    index_range: int, *, priority: int | None = None, vid: int | None = None,
+) -> "Iterator[tuple[float, bytearray]]":
     b_dst_addr = mac2bytes("01:0c:cd:01:00:01")
     b_src_addr = mac2bytes("00-30-a7-22-9d-01")
-    b_goose_ether = ether2bytes("88b8")
-    b_app_id = u32_bytes(0)
-    b_reserved = u32_bytes(0) + u32_bytes(0)
-    b_header = b_dst_addr + b_src_addr + b_goose_ether + b_app_id
+    app_id = 0
 
-    b_num_dat_set_entries = bytes(Triplet(0x8A, b"\x01"))
+    num_dat_set_entries = Primitive(0x8A, b"\x01")
 
-    b_nds_com = bytes(Triplet(0x89, b"\x00"))
-    b_conf_rev = bytes(Triplet(0x88, b"\x01"))
-    b_test = bytes(Triplet(0x87, b"\x00"))
+    nds_com = Primitive(0x89, b"\x00")
+    conf_rev = Primitive(0x88, b"\x01")
+    test = Primitive(0x87, b"\x00")
 
-    t = now()
+    t = now().node()
 
-    b_go_id = bytes(Triplet(0x83, b"SEL_421_Sub"))
-    b_dat_set = bytes(Triplet(0x82, b"SEL_421_SubCFG/LLN0$PIOC"))
-    b_time_allowed_to_live = bytes(Triplet(0x81, u32_bytes(2000)))
+    go_id = Primitive(0x83, b"SEL_421_Sub")
+    dat_set = Primitive(0x82, b"SEL_421_SubCFG/LLN0$PIOC")
+    time_allowed_to_live = Primitive(0x81, u32_bytes(2000))
 
-    b_gocb_ref = bytes(Triplet(0x80, b"SEL_421_SubCFG/LLN0$GO$PIOC"))
+    gocb_ref = Primitive(0x80, b"SEL_421_SubCFG/LLN0$GO$PIOC")
 
     trip = False
     seq = 1  # noqa
@@ -54,7 +166,7 @@ def generate_goose(index_range: int) -> "Iterator[tuple[float, bytes]]":
 
         if index == 4:
             trip = True
-            t = now()
+            t = now().node()
             status += 1
             seq = 0
             # trigger = 104_617
@@ -62,50 +174,51 @@ def generate_goose(index_range: int) -> "Iterator[tuple[float, bytes]]":
             wait_for = 104_617.0 - (14 * 1e3)
         elif index == 8:
             trip = False
-            t = now()
+            t = now().node()
             status += 1
             seq = 0
             # untrigger = 075_441.0
             wait_for = 075_441.0
 
         # TODO bool 0x0F not defined
-        data_bool = Triplet(0x83, b"\x0f" if trip else b"\x00")
-        data = Triplet(0xAB, bytes(data_bool))
-
-        sq_num = Triplet(0x86, s_pack("!B", seq))
-        st_num = Triplet(0x85, s_pack("!B", status))
-
-        b_goose_pdu = bytes(
-            Triplet(
-                0x61,
-                b_gocb_ref
-                + b_time_allowed_to_live
-                + b_dat_set
-                + b_go_id
-                + bytes(t)
-                + bytes(st_num)
-                + bytes(sq_num)
-                + b_test
-                + b_conf_rev
-                + b_nds_com
-                + b_num_dat_set_entries
-                + bytes(data),
-            )
+        data_bool = Primitive(0x83, b"\x0f" if trip else b"\x00")
+        data = Constructed(0xAB, (data_bool,))
+
+        sq_num = Primitive(0x86, s_pack("!B", seq))
+        st_num = Primitive(0x85, s_pack("!B", status))
+
+        goose_pdu = Constructed(
+            0x61,
+            (
+                gocb_ref,
+                time_allowed_to_live,
+                dat_set,
+                go_id,
+                t,
+                st_num,
+                sq_num,
+                test,
+                conf_rev,
+                nds_com,
+                num_dat_set_entries,
+                data,
+            ),
         )
-        b_length = u32_bytes(len(b_goose_pdu) + 8)
-        goose = b_header + b_length + b_reserved + b_goose_pdu
-        yield wait_for, goose
+        yield wait_for, pack_frame(b_dst_addr, b_src_addr, app_id, goose_pdu, priority=priority, vid=vid)
         seq += 1
 
 
-class GOOSE(NamedTuple):
-    mac_dest: str
-    mac_src: str
-    ether: str
-    app_id: str
+@dataclass(kw_only=True, slots=True)
+class GOOSE:
+    # header fields are kept raw, use the utils helpers (bytes2mac, int2hexstring) to display them
+    mac_dest: bytes
+    mac_src: bytes
+    ether: int
+    app_id: int
     goose_length: int
-    reserved1: str
-    reserved2: str
+    reserved1: int
+    reserved2: int
+    tci: int | None = None  # 802.1Q tag control, None when untagged
     gocb_ref: str
     ttl: int
     data_set: str
@@ -119,40 +232,53 @@ class GOOSE(NamedTuple):
     num_datset_entries: int
     trip: bool
 
+    @property
+    def key(self: "GOOSE") -> int:
+        """Stream key, source MAC and APPID packed into a single int."""
+        return int.from_bytes(self.mac_src, "big") << 16 | self.app_id
 
-def unpack_goose(bytes_string: bytes) -> GOOSE:
-    mac_dest = bytes2mac(bytes_string[0:6])
-    mac_src = bytes2mac(bytes_string[6:12])
-    ether = bytes2ether(bytes_string[12:14])
-    app_id = bytes2hexstring(bytes_string[14:16])
 
-    goose_length = bytes2u16(bytes_string[16:18])
+@lru_cache(maxsize=IDENTITY_CACHE_SIZE)
+def identity(bytes_string: bytes) -> str:
+    """Decodes gocbRef, datSet and goID, the same raw bytes always yield the same str object."""
+    return intern(bytes2string(bytes_string))
+
 
-    if goose_length != len(bytes_string[14:]):
+def unpack_goose(bytes_string: bytes) -> GOOSE:
+    if len(bytes_string) < HEADER_SIZE:
         raise ValueError("GOOSE data missing...")
 
-    reserved1 = bytes2hexstring(bytes_string[18:20])
-    reserved2 = bytes2hexstring(bytes_string[20:22])
+    mac_dest, mac_src, ether, app_id, goose_length, reserved1, reserved2 = HEADER.unpack_from(bytes_string)
+    tci = None
+    offset = HEADER_SIZE
+    if ether == VLAN_ETHER:
+        if len(bytes_string) < TAGGED_HEADER_SIZE:
+            raise ValueError("GOOSE data missing...")
+        _, _, _, tci, ether, app_id, goose_length, reserved1, reserved2 = TAGGED_HEADER.unpack_from(bytes_string)
+        offset = TAGGED_HEADER_SIZE
+
+    if goose_length != len(bytes_string) - offset + 8:
+        raise ValueError("GOOSE data missing...")
 
-    if bytes_string[22:23] != b"\x61":
+    if bytes_string[offset : offset + 1] != b"\x61":
         raise ValueError("Can't find GOOSE PDU")
 
-    pdu = Triplet.unpack(bytes_string[22:])
+    pdu = Triplet.unpack(bytes(bytes_string[offset:]))  # frame builders return bytearrays, identity needs bytes
 
     if pdu.value[0:1] != b"\x80":
         raise ValueError("Can't find GOOSE Control Block Reference")
 
     t_gocb_ref, padding = Triplet.constructed_unpack(pdu)
-    gocb_ref = bytes2string(t_gocb_ref.value)
+    gocb_ref = identity(t_gocb_ref.value)
 
     t_ttl, padding = Triplet.constructed_unpack(pdu, padding)
     ttl = int.from_bytes(t_ttl.value, "big")  # TODO check size, use pack
 
     t_data_set, padding = Triplet.constructed_unpack(pdu, padding)
-    data_set = bytes2string(t_data_set.value)
+    data_set = identity(t_data_set.value)
 
     t_go_id, padding = Triplet.constructed_unpack(pdu, padding)
-    go_id = bytes2string(t_go_id.value)
+    go_id = identity(t_go_id.value)
 
     t_timestamp, padding = Triplet.constructed_unpack(pdu, padding)
     timestamp = Timestamp.unpack(t_timestamp.value)
@@ -187,6 +313,7 @@ def unpack_goose(bytes_string: bytes) -> GOOSE:
         goose_length=goose_length,
         reserved1=reserved1,
         reserved2=reserved2,
+        tci=tci,
         gocb_ref=gocb_ref,
         ttl=ttl,
         data_set=data_set,
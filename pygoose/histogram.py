@@ -0,0 +1,99 @@
+from array import array
+from typing import Any
+
+DEFAULT_PRECISION_BITS = 7  # relative error below 1/64
+
+
+class Histogram:
+    """HDR-style log-linear histogram of non-negative integers (nanoseconds).
+
+    Values below 2**precision_bits have their own bucket, above that each power of two is split into
+    2**(precision_bits - 1) buckets, so memory stays small and percentiles keep a bounded relative error.
+    Negative values (e.g. clocks out of sync) are only counted in `negative`.
+    """
+
+    __slots__ = ("precision_bits", "count", "total", "min", "max", "negative", "_counts")
+
+    def __init__(self: "Histogram", precision_bits: int = DEFAULT_PRECISION_BITS) -> None:
+        self.precision_bits = precision_bits
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self.negative = 0
+        self._counts = array("Q", bytes(8 << precision_bits))
+
+    def _index(self: "Histogram", value: int) -> int:
+        bits = self.precision_bits
+        if value < 1 << bits:
+            return value
+        shift = value.bit_length() - bits
+        return (1 << bits) + ((shift - 1) << (bits - 1)) + (value >> shift) - (1 << (bits - 1))
+
+    def _lowest(self: "Histogram", index: int) -> int:
+        bits = self.precision_bits
+        if index < 1 << bits:
+            return index
+        shift, mantissa = divmod(index - (1 << bits), 1 << (bits - 1))
+        return ((1 << (bits - 1)) + mantissa) << (shift + 1)
+
+    def _grow(self: "Histogram", index: int) -> None:
+        self._counts.extend(array("Q", bytes(8 * (index + 1 - len(self._counts)))))
+
+    def record(self: "Histogram", value: int) -> None:
+        if value < 0:
+            self.negative += 1
+            return
+        index = self._index(value)
+        if index >= len(self._counts):
+            self._grow(index)
+        self._counts[index] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        self.max = max(value, self.max)
+        self.count += 1
+        self.total += value
+
+    def merge(self: "Histogram", other: "Histogram") -> None:
+        for index, count in enumerate(other._counts):  # noqa: SLF001
+            if count:
+                value = other._lowest(index)  # noqa: SLF001
+                own = self._index(value)
+                if own >= len(self._counts):
+                    self._grow(own)
+                self._counts[own] += count
+        if other.count:
+            self.min = other.min if not self.count else min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        self.negative += other.negative
+
+    def percentile(self: "Histogram", percent: float) -> int:
+        """Returns the lowest value of the bucket holding the percentile (clamped to min/max)."""
+        if not self.count:
+            return 0
+        target = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(max(self._lowest(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self: "Histogram") -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self: "Histogram") -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "negative": self.negative,
+            "min": self.min,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self.max,
+        }
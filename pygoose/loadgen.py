@@ -0,0 +1,326 @@
+import json
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from heapq import heapify, heappop, heappush
+from multiprocessing import Pool
+from os import cpu_count
+from pathlib import Path
+from struct import Struct
+from sys import argv
+from time import time_ns
+from typing import TYPE_CHECKING, Any
+
+from pygoose.asn1 import Constructed, Primitive
+from pygoose.datatypes.time_stamp import NANOSECONDS, pack_nanoseconds_into
+from pygoose.goose import GOOSE_PDU_TAG, TIMESTAMP_TAG, find_field, pack_frame
+from pygoose.histogram import Histogram
+from pygoose.transport import open_sender
+from pygoose.utils import mac2bytes, now, quality_byte, sleep_until
+
+if TYPE_CHECKING:
+    from pygoose.replay import Sender
+
+# stNum, sqNum, timeAllowedToLive and confRev are encoded on 4 bytes, so they are patched in place without
+# re-encoding the PDU; the top bit stays clear to keep them positive BER integers
+_U32 = Struct("!I")
+MAX_COUNT = 0x7FFFFFFF
+ST_NUM_TAG, SQ_NUM_TAG, TTL_TAG, ALL_DATA_TAG = 0x85, 0x86, 0x81, 0xAB
+_BOOLEAN = 3  # size of each dataset entry, tag 0x83, length 1, value
+START_DELAY_NS = NANOSECONDS  # time for the workers to build their IEDs before the common start
+MILLISECONDS = 1_000_000
+
+
+def _int(value: int | str) -> int:
+    return int(value, 0) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class IedGroup:
+    """`count` IEDs sharing a configuration, numbered from 1; MACs and APPIDs count up from the given ones."""
+
+    count: int = 1
+    name: str = "IED"
+    dst_addr: bytes = b"\x01\x0c\xcd\x01\x00\x00"
+    src_addr: bytes = b"\x00\x30\xa7\x00\x00\x00"
+    app_id: int = 0x0001
+    entries: int = 8  # booleans in the dataset
+    heartbeat_ms: float = 1000.0  # retransmission interval once stable
+    first_ms: float = 2.0  # first retransmission after a state change, doubling up to heartbeat_ms
+
+    @classmethod
+    def from_dict(cls: type["IedGroup"], group: dict[str, Any]) -> "IedGroup":
+        """From JSON, MACs as strings ("01:0c:cd:01:00:00") and APPIDs as ints or "0x" strings."""
+        fields: dict[str, Any] = {}
+        for name, value in group.items():
+            if name.endswith("addr"):
+                fields[name] = mac2bytes(value)
+            elif name == "app_id":
+                fields[name] = _int(value)
+            else:
+                fields[name] = value
+        return cls(**fields)
+
+
+def _stream_key(group: IedGroup, number: int) -> tuple[int, int]:
+    """Source MAC and APPID of IED `number` of the group."""
+    return int.from_bytes(group.src_addr, "big") + number, (group.app_id + number - 1) & 0xFFFF
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Storm:
+    """At `at` seconds from the start, `fraction` of all IEDs change state at once, `repeat` times `every` seconds."""
+
+    at: float
+    fraction: float = 1.0
+    repeat: int = 1
+    every: float = 1.0
+
+    def includes(self: "Storm", index: int) -> bool:
+        """Spreads the fraction evenly over the IEDs, by their global index."""
+        return int((index + 1) * self.fraction) > int(index * self.fraction)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Scenario:
+    ieds: tuple[IedGroup, ...]
+    storms: tuple[Storm, ...] = ()
+    duration: float = 10.0  # seconds
+    rate: float | None = None  # target steady-state frames/s over all IEDs, scales every heartbeat to reach it
+    workers: int | None = None  # defaults to one per core
+
+    def __post_init__(self: "Scenario") -> None:
+        """Subscribers tell streams apart by source MAC and APPID, groups whose ranges produce the same pair clash."""
+        owners: dict[tuple[int, int], str] = {}
+        for group, number in self.groups():
+            key = _stream_key(group, number)
+            if key in owners:
+                msg = f"{group.name}{number:04d} has the same source MAC and APPID as {owners[key]}"
+                raise ValueError(msg)
+            owners[key] = f"{group.name}{number:04d}"
+
+    @classmethod
+    def from_dict(cls: type["Scenario"], scenario: dict[str, Any]) -> "Scenario":
+        return cls(
+            ieds=tuple(IedGroup.from_dict(group) for group in scenario["ieds"]),
+            storms=tuple(Storm(**storm) for storm in scenario.get("storms", ())),
+            **{name: value for name, value in scenario.items() if name not in ("ieds", "storms")},
+        )
+
+    @classmethod
+    def load(cls: type["Scenario"], path: Path) -> "Scenario":
+        return cls.from_dict(json.loads(path.read_text()))
+
+    @property
+    def total(self: "Scenario") -> int:
+        return sum(group.count for group in self.ieds)
+
+    @property
+    def heartbeat_scale(self: "Scenario") -> float:
+        if self.rate is None:
+            return 1.0
+        return sum(group.count * 1e3 / group.heartbeat_ms for group in self.ieds) / self.rate
+
+    @property
+    def target_rate(self: "Scenario") -> float:
+        """Steady-state frames/s, without the retransmission bursts of the storms."""
+        return sum(group.count * 1e3 / group.heartbeat_ms for group in self.ieds) / self.heartbeat_scale
+
+    def groups(self: "Scenario") -> list[tuple[IedGroup, int]]:
+        """Each IED as its group and its number in the group, in global index order."""
+        return [(group, number) for group in self.ieds for number in range(1, group.count + 1)]
+
+    def storm_times(self: "Scenario") -> list[tuple[float, Storm]]:
+        """Every state change wave within the duration, as seconds from the start."""
+        times = [
+            (storm.at + repeat * storm.every, storm) for storm in self.storms for repeat in range(storm.repeat)
+        ]
+        return sorted((at, storm) for at, storm in times if at < self.duration)
+
+
+class VirtualIed:
+    """A GOOSE publisher: one frame encoded up front, then stNum, sqNum, TTL, timestamp and data patched in place."""
+
+    __slots__ = (
+        "frame", "heartbeat_ns", "first_ns", "interval_ns", "st_num", "sq_num", "state", "generation",
+        "_st_num", "_sq_num", "_ttl", "_timestamp", "_data",
+    )
+
+    def __init__(self: "VirtualIed", group: IedGroup, number: int, heartbeat_scale: float = 1.0) -> None:
+        name = f"{group.name}{number:04d}"
+        src_addr, app_id = _stream_key(group, number)
+        self.heartbeat_ns = int(group.heartbeat_ms * heartbeat_scale * MILLISECONDS)
+        self.first_ns = min(int(group.first_ms * MILLISECONDS), self.heartbeat_ns)
+        pdu = Constructed(
+            GOOSE_PDU_TAG,
+            (
+                Primitive(0x80, f"{name}CFG/LLN0$GO$GCB01".encode()),
+                Primitive(TTL_TAG, _U32.pack(2 * self.heartbeat_ns // MILLISECONDS)),
+                Primitive(0x82, f"{name}CFG/LLN0$DS01".encode()),
+                Primitive(0x83, name.encode()),
+                now().node(),
+                Primitive(ST_NUM_TAG, _U32.pack(1)),
+                Primitive(SQ_NUM_TAG, _U32.pack(0)),
+                Primitive(0x87, b"\x00"),
+                Primitive(0x88, _U32.pack(1)),
+                Primitive(0x89, b"\x00"),
+                Primitive(0x8A, _U32.pack(group.entries)),
+                Constructed(ALL_DATA_TAG, tuple(Primitive(0x83, b"\x00") for _ in range(group.entries))),
+            ),
+        )
+        self.frame = pack_frame(group.dst_addr, src_addr.to_bytes(6, "big"), app_id, pdu)
+        self._st_num = find_field(self.frame, ST_NUM_TAG)[0]
+        self._sq_num = find_field(self.frame, SQ_NUM_TAG)[0]
+        self._ttl = find_field(self.frame, TTL_TAG)[0]
+        self._timestamp = find_field(self.frame, TIMESTAMP_TAG)[0]
+        data, length = find_field(self.frame, ALL_DATA_TAG)
+        self._data = range(data + 2, data + length, _BOOLEAN)
+        self.interval_ns = self.heartbeat_ns
+        self.st_num = 1
+        self.sq_num = 0
+        self.state = False
+        self.generation = 0  # bumped on each change, so the scheduler drops retransmissions already queued
+
+    def change(self: "VirtualIed", at_ns: int) -> None:
+        """New state: every dataset entry flips, stNum counts up and retransmissions restart from first_ns."""
+        self.state = not self.state
+        self.st_num = self.st_num % MAX_COUNT + 1
+        self.sq_num = 0
+        self.interval_ns = self.first_ns
+        self.generation += 1
+        frame = self.frame
+        _U32.pack_into(frame, self._st_num, self.st_num)
+        pack_nanoseconds_into(frame, self._timestamp, at_ns, quality_byte())
+        value = 1 if self.state else 0
+        for offset in self._data:
+            frame[offset] = value
+
+    def next(self: "VirtualIed") -> tuple[bytearray, int]:
+        """The frame to send now and the time until the next one, which its TTL announces twice over."""
+        gap = self.interval_ns
+        frame = self.frame
+        _U32.pack_into(frame, self._sq_num, self.sq_num)
+        _U32.pack_into(frame, self._ttl, 2 * gap // MILLISECONDS)
+        self.sq_num = self.sq_num % MAX_COUNT + 1
+        self.interval_ns = min(2 * gap, self.heartbeat_ns)
+        return frame, gap
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class WorkerReport:
+    frames: int
+    changes: int
+    last_ns: int  # when the last frame went out
+    lateness: Histogram  # send time minus deadline, in nanoseconds
+
+
+def generate(
+    nic: "Sender", ieds: list[VirtualIed], phases: list[int], storms: list[tuple[int, list[int]]], end_ns: int,
+) -> WorkerReport:
+    """Sends each IED on its own schedule until end_ns, all deadlines absolute so lateness never accumulates.
+
+    phases are the first deadlines, storms the (time, IED indexes) of each state change wave, both in ns since epoch.
+    """
+    queue = [(phase, index, 0) for index, phase in enumerate(phases)]
+    heapify(queue)
+    waves = deque(storms)
+    lateness = Histogram()
+    frames = changes = 0
+    sent = time_ns()
+    while queue:
+        deadline, index, generation = queue[0]
+        if waves and waves[0][0] <= deadline:
+            at, members = waves.popleft()
+            for member in members:
+                ied = ieds[member]
+                ied.change(at)
+                heappush(queue, (at, member, ied.generation))
+            changes += len(members)
+            continue
+        if deadline >= end_ns:
+            break
+        heappop(queue)
+        ied = ieds[index]
+        if generation != ied.generation:
+            continue
+        frame, gap = ied.next()
+        sleep_until(deadline)
+        sent = time_ns()
+        nic.sendall(frame)
+        lateness.record(sent - deadline)
+        frames += 1
+        heappush(queue, (deadline + gap, index, generation))
+    return WorkerReport(frames=frames, changes=changes, last_ns=sent, lateness=lateness)
+
+
+def plan(
+    scenario: Scenario, worker: int, workers: int, origin_ns: int,
+) -> tuple[list[VirtualIed], list[int], list[tuple[int, list[int]]]]:
+    """IEDs of one worker (every workers-th global index), their first deadlines and the storm waves they join.
+
+    First deadlines are spread over the heartbeat by global index, so the IEDs don't all send at once.
+    """
+    groups, total, scale = scenario.groups(), scenario.total, scenario.heartbeat_scale
+    indexes = range(worker, total, workers)
+    ieds = [VirtualIed(*groups[index], scale) for index in indexes]
+    phases = [origin_ns + ied.heartbeat_ns * index // total for ied, index in zip(ieds, indexes, strict=True)]
+    storms = [
+        (origin_ns + int(at * NANOSECONDS), [local for local, index in enumerate(indexes) if storm.includes(index)])
+        for at, storm in scenario.storm_times()
+    ]
+    return ieds, phases, storms
+
+
+def _worker(task: tuple[Scenario, str, int, int, int]) -> WorkerReport:
+    scenario, interface, worker, workers, origin_ns = task
+    ieds, phases, storms = plan(scenario, worker, workers, origin_ns)
+    with open_sender(interface) as nic:
+        return generate(nic, ieds, phases, storms, origin_ns + int(scenario.duration * NANOSECONDS))
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class LoadReport:
+    ieds: int
+    workers: int
+    frames: int
+    changes: int
+    elapsed_s: float  # from the common start to the last frame, at least the scenario duration
+    target_rate: float  # steady-state frames/s the scenario asks for
+    scheduled_rate: float  # frames/s the schedule held, storm bursts included
+    achieved_rate: float  # frames/s actually sent, below scheduled_rate when the workers fell behind
+    lateness_ns: dict[str, Any] = field(default_factory=dict)  # Histogram.snapshot of every send
+
+    @classmethod
+    def from_workers(
+        cls: type["LoadReport"], scenario: Scenario, reports: list[WorkerReport], origin_ns: int,
+    ) -> "LoadReport":
+        lateness = Histogram()
+        for report in reports:
+            lateness.merge(report.lateness)
+        frames = sum(report.frames for report in reports)
+        elapsed = max([scenario.duration] + [(report.last_ns - origin_ns) / NANOSECONDS for report in reports])
+        return cls(
+            ieds=scenario.total,
+            workers=len(reports),
+            frames=frames,
+            changes=sum(report.changes for report in reports),
+            elapsed_s=elapsed,
+            target_rate=scenario.target_rate,
+            scheduled_rate=frames / scenario.duration,
+            achieved_rate=frames / elapsed,
+            lateness_ns=lateness.snapshot(),
+        )
+
+
+def run(scenario: Scenario, interface: str) -> LoadReport:
+    """Splits the IEDs over worker processes, which all start at the same time and send on their own socket."""
+    workers = min(scenario.workers or cpu_count() or 1, scenario.total)
+    origin_ns = time_ns() + START_DELAY_NS
+    tasks = [(scenario, interface, worker, workers, origin_ns) for worker in range(workers)]
+    with Pool(workers) as pool:
+        reports = pool.map(_worker, tasks)
+    return LoadReport.from_workers(scenario, reports, origin_ns)
+
+
+if __name__ == "__main__":
+    # python -m pygoose.loadgen <interface> <scenario.json>
+    print(json.dumps(asdict(run(Scenario.load(Path(argv[2])), argv[1])), indent=2))
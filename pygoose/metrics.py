@@ -0,0 +1,189 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socket import AF_PACKET
+from struct import Struct
+from threading import Thread
+from typing import TYPE_CHECKING, Any
+
+from pygoose.datatypes.time_stamp import NANOSECONDS
+
+if TYPE_CHECKING:
+    from socket import socket
+
+# linux/socket.h and linux/if_packet.h, not exported by the socket module
+SOL_SOCKET = 1
+SO_SNDBUF = 7
+SO_RCVBUF = 8
+SO_SNDBUFFORCE = 32
+SO_RCVBUFFORCE = 33
+SOL_PACKET = 263
+PACKET_STATISTICS = 6
+_TPACKET_STATS = Struct("=II")  # tp_packets (including drops), tp_drops
+
+DEFAULT_PORT = 9464
+RECEIVE_BUFFER = 4 << 20  # room for a burst of ~2000 full size frames
+MAX_STREAMS = 4096  # per-stream series kept, a flood of spoofed sources must not grow memory and scrapes unbounded
+
+
+class StreamMetrics:
+    __slots__ = ("frames", "bytes", "first_ns", "last_ns")
+
+    def __init__(self: "StreamMetrics", received_ns: int) -> None:
+        self.frames = 0
+        self.bytes = 0
+        self.first_ns = received_ns
+        self.last_ns = received_ns
+
+    @property
+    def rate(self: "StreamMetrics") -> float:
+        """Average frames per second since the first frame of the stream."""
+        elapsed = self.last_ns - self.first_ns
+        return (self.frames - 1) * NANOSECONDS / elapsed if elapsed > 0 else 0.0
+
+
+def packet_statistics(nic: "socket") -> tuple[int, int]:
+    """Returns (packets, drops) seen by the kernel for a packet socket since the last call, reading resets them."""
+    return _TPACKET_STATS.unpack(nic.getsockopt(SOL_PACKET, PACKET_STATISTICS, _TPACKET_STATS.size))
+
+
+def buffer_sizes(nic: "socket") -> dict[str, int]:
+    """Returns the socket buffer sizes as the kernel reports them (twice the requested size on Linux)."""
+    return {"rcvbuf": nic.getsockopt(SOL_SOCKET, SO_RCVBUF), "sndbuf": nic.getsockopt(SOL_SOCKET, SO_SNDBUF)}
+
+
+def tune_buffers(nic: "socket", receive: int | None = None, send: int | None = None) -> dict[str, int]:
+    """Sets SO_RCVBUF/SO_SNDBUF, beyond net.core.*mem_max when CAP_NET_ADMIN allows it, returns buffer_sizes."""
+    for size, forced, option in ((receive, SO_RCVBUFFORCE, SO_RCVBUF), (send, SO_SNDBUFFORCE, SO_SNDBUF)):
+        if size is None:
+            continue
+        try:
+            nic.setsockopt(SOL_SOCKET, forced, size)
+        except PermissionError:
+            nic.setsockopt(SOL_SOCKET, option, size)  # silently capped by the kernel
+    return buffer_sizes(nic)
+
+
+class Metrics:
+    """Counters for the receive path, updated by Pipeline and read from any thread.
+
+    Frames of streams beyond max_streams count in the totals and in untracked_frames, not in a stream of their own.
+    """
+
+    def __init__(self: "Metrics", nic: "socket | None" = None, max_streams: int = MAX_STREAMS) -> None:
+        self.nic = nic
+        self.max_streams = max_streams
+        self.frames = 0
+        self.bytes = 0
+        self.filtered = 0
+        self.shed = 0  # dropped by a storm.StormGuard
+        self.rejected = 0  # failed auth.Verifier
+        self.decode_errors: dict[str, int] = {}
+        self.streams: dict[int, StreamMetrics] = {}
+        self.untracked_frames = 0
+        self.kernel_packets = 0
+        self.kernel_drops = 0
+
+    def received(self: "Metrics", key: int, size: int, received_ns: int) -> None:
+        self.frames += 1
+        self.bytes += size
+        stream = self.streams.get(key)
+        if stream is None:
+            if len(self.streams) >= self.max_streams:
+                self.untracked_frames += 1
+                return
+            stream = self.streams[key] = StreamMetrics(received_ns)
+        stream.frames += 1
+        stream.bytes += size
+        stream.last_ns = received_ns
+
+    def decode_error(self: "Metrics", error: Exception) -> None:
+        name = type(error).__name__
+        self.decode_errors[name] = self.decode_errors.get(name, 0) + 1
+
+    def _open_nic(self: "Metrics") -> "socket | None":
+        return self.nic if self.nic is not None and self.nic.fileno() >= 0 else None  # closed sockets return -1
+
+    def poll_kernel(self: "Metrics") -> None:
+        """Accumulates PACKET_STATISTICS, which the kernel resets on every read."""
+        nic = self._open_nic()
+        if nic is None or nic.family != AF_PACKET:  # e.g. transport loopback sockets
+            return
+        packets, drops = packet_statistics(nic)
+        self.kernel_packets += packets
+        self.kernel_drops += drops
+
+    def snapshot(self: "Metrics") -> dict[str, Any]:
+        self.poll_kernel()
+        nic = self._open_nic()
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "filtered": self.filtered,
+            "shed": self.shed,
+            "rejected": self.rejected,
+            "decode_errors": dict(self.decode_errors),
+            "untracked_frames": self.untracked_frames,
+            "kernel_packets": self.kernel_packets,
+            "kernel_drops": self.kernel_drops,
+            "buffers": {} if nic is None else buffer_sizes(nic),
+            "streams": {
+                f"{key:016x}": {"frames": stream.frames, "bytes": stream.bytes, "rate": stream.rate}
+                for key, stream in list(self.streams.items())
+            },
+        }
+
+    def prometheus(self: "Metrics") -> str:
+        """Snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        streams = snapshot["streams"].items()
+        lines = [
+            "# TYPE pygoose_frames_total counter",
+            f"pygoose_frames_total {snapshot['frames']}",
+            "# TYPE pygoose_bytes_total counter",
+            f"pygoose_bytes_total {snapshot['bytes']}",
+            "# TYPE pygoose_filtered_total counter",
+            f"pygoose_filtered_total {snapshot['filtered']}",
+            "# TYPE pygoose_shed_total counter",
+            f"pygoose_shed_total {snapshot['shed']}",
+            "# TYPE pygoose_rejected_total counter",
+            f"pygoose_rejected_total {snapshot['rejected']}",
+            "# TYPE pygoose_decode_errors_total counter",
+            *(f'pygoose_decode_errors_total{{type="{name}"}} {n}' for name, n in snapshot["decode_errors"].items()),
+            "# TYPE pygoose_untracked_frames_total counter",
+            f"pygoose_untracked_frames_total {snapshot['untracked_frames']}",
+            "# TYPE pygoose_kernel_packets_total counter",
+            f"pygoose_kernel_packets_total {snapshot['kernel_packets']}",
+            "# TYPE pygoose_kernel_drops_total counter",
+            f"pygoose_kernel_drops_total {snapshot['kernel_drops']}",
+            "# TYPE pygoose_socket_buffer_bytes gauge",
+            *(f'pygoose_socket_buffer_bytes{{buffer="{name}"}} {size}' for name, size in snapshot["buffers"].items()),
+            "# TYPE pygoose_stream_frames_total counter",
+            *(f'pygoose_stream_frames_total{{stream="{key}"}} {s["frames"]}' for key, s in streams),
+            "# TYPE pygoose_stream_bytes_total counter",
+            *(f'pygoose_stream_bytes_total{{stream="{key}"}} {s["bytes"]}' for key, s in streams),
+            "# TYPE pygoose_stream_rate gauge",
+            *(f'pygoose_stream_rate{{stream="{key}"}} {s["rate"]:.3f}' for key, s in streams),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def serve(metrics: Metrics, port: int = DEFAULT_PORT, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serves metrics.prometheus() on http://host:port/metrics from a daemon thread, call shutdown() to stop."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self: "Handler") -> None:  # noqa: N802
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self: "Handler", format: str, *args: Any) -> None:  # noqa: A002, ANN401
+            ...
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,224 @@
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from queue import Empty, Full, Queue
+from struct import Struct
+from threading import Event, Thread
+from time import monotonic_ns
+from typing import TYPE_CHECKING, BinaryIO, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+LINKTYPE_ETHERNET = 1
+SNAPLEN = 0xFFFF
+NANOSECONDS = 1_000_000_000
+
+# pcap, nanosecond resolution variant
+PCAP_MAGIC_NS = 0xA1B23C4D
+PCAP_MAGIC_US = 0xA1B2C3D4
+_PCAP_HEADER = Struct("=IHHiIII")  # magic, major, minor, thiszone, sigfigs, snaplen, linktype
+_PCAP_RECORD = Struct("=IIII")  # seconds, fraction, captured length, original length
+
+# pcapng, little endian blocks
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_IDB = 0x00000001
+PCAPNG_EPB = 0x00000006
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+_PCAPNG_SHB = Struct("<IIIHHqI")  # type, length, byte order, major, minor, section length, length
+_PCAPNG_IDB = Struct("<IIHHIHHBxxxHHI")  # type, length, linktype, snaplen, if_tsresol option, end of options, length
+_PCAPNG_EPB = Struct("<IIIIIII")  # type, length, interface, ts high, ts low, captured length, original length
+
+Format = Literal["pcap", "pcapng"]
+
+
+def pcap_header() -> bytes:
+    return _PCAP_HEADER.pack(PCAP_MAGIC_NS, 2, 4, 0, 0, SNAPLEN, LINKTYPE_ETHERNET)
+
+
+def pcap_record(timestamp_ns: int, frame: bytes) -> bytes:
+    seconds, fraction = divmod(timestamp_ns, NANOSECONDS)
+    return _PCAP_RECORD.pack(seconds, fraction, len(frame), len(frame)) + frame
+
+
+def pcapng_header() -> bytes:
+    shb = _PCAPNG_SHB.pack(PCAPNG_SHB, _PCAPNG_SHB.size, PCAPNG_BYTE_ORDER_MAGIC, 1, 0, -1, _PCAPNG_SHB.size)
+    # if_tsresol (option 9) = 9, timestamps in nanoseconds
+    idb = _PCAPNG_IDB.pack(PCAPNG_IDB, _PCAPNG_IDB.size, LINKTYPE_ETHERNET, 0, SNAPLEN, 9, 1, 9, 0, 0, _PCAPNG_IDB.size)
+    return shb + idb
+
+
+def pcapng_record(timestamp_ns: int, frame: bytes) -> bytes:
+    padding = -len(frame) % 4
+    length = _PCAPNG_EPB.size + len(frame) + padding + 4
+    header = _PCAPNG_EPB.pack(
+        PCAPNG_EPB, length, 0, timestamp_ns >> 32, timestamp_ns & 0xFFFFFFFF, len(frame), len(frame),
+    )
+    return header + frame + bytes(padding) + length.to_bytes(4, "little")
+
+
+class CaptureFormatError(ValueError): ...
+
+
+def _read_pcap(view: memoryview, endian: str, resolution: int) -> "Iterator[tuple[int, memoryview]]":
+    record = Struct(endian + "IIII")
+    offset = _PCAP_HEADER.size
+    end = len(view)
+    while offset + record.size <= end:
+        seconds, fraction, captured, _ = record.unpack_from(view, offset)
+        offset += record.size
+        if offset + captured > end:
+            return  # truncated capture, e.g. still being written
+        yield seconds * NANOSECONDS + fraction * resolution, view[offset : offset + captured]
+        offset += captured
+
+
+def _read_pcapng(view: memoryview) -> "Iterator[tuple[int, memoryview]]":
+    endian = "<"
+    resolutions: list[int] = []  # nanoseconds per tick, one per interface
+    offset = 0
+    end = len(view)
+    while offset + 12 <= end:
+        block_type = int.from_bytes(view[offset : offset + 4], "little")
+        if block_type == PCAPNG_SHB:
+            endian = "<" if int.from_bytes(view[offset + 8 : offset + 12], "little") == PCAPNG_BYTE_ORDER_MAGIC else ">"
+            resolutions = []
+        block_type, length = Struct(endian + "II").unpack_from(view, offset)
+        if length < 12 or offset + length > end:  # noqa: PLR2004
+            return
+        if block_type == PCAPNG_IDB:
+            resolutions.append(_idb_resolution(view[offset + 16 : offset + length - 4], endian))
+        elif block_type == PCAPNG_EPB:
+            interface, high, low, captured, _ = Struct(endian + "IIIII").unpack_from(view, offset + 8)
+            start = offset + 28
+            yield (high << 32 | low) * resolutions[interface], view[start : start + captured]
+        offset += length
+
+
+def _idb_resolution(options: memoryview, endian: str) -> int:
+    option = Struct(endian + "HH")
+    offset = 0
+    while offset + option.size <= len(options):
+        code, length = option.unpack_from(options, offset)
+        if code == 0:
+            break
+        if code == 9:  # if_tsresol  # noqa: PLR2004
+            tsresol = options[offset + 4]
+            if tsresol & 0x80:
+                msg = "binary timestamp resolution not supported"
+                raise CaptureFormatError(msg)
+            return int(10 ** max(9 - tsresol, 0))
+        offset += option.size + length + (-length % 4)
+    return 1000  # default resolution is microseconds
+
+
+def read_capture(path: Path) -> "Iterator[tuple[int, memoryview]]":
+    """Streams (timestamp in ns, frame) pairs from a pcap or pcapng file through mmap.
+
+    Frames are views into the mapping, copy them (bytes/bytearray) to keep them around.
+    """
+    if path.stat().st_size == 0:
+        return
+    with path.open("rb") as file:
+        mapped = mmap(file.fileno(), 0, access=ACCESS_READ)  # closed once the last view is gone
+    view = memoryview(mapped)
+    magic = int.from_bytes(view[:4], "little")
+    if magic == PCAPNG_SHB:
+        yield from _read_pcapng(view)
+    elif magic in (PCAP_MAGIC_NS, PCAP_MAGIC_US):
+        yield from _read_pcap(view, "<", 1 if magic == PCAP_MAGIC_NS else 1000)
+    elif int.from_bytes(view[:4], "big") in (PCAP_MAGIC_NS, PCAP_MAGIC_US):
+        yield from _read_pcap(view, ">", 1 if int.from_bytes(view[:4], "big") == PCAP_MAGIC_NS else 1000)
+    else:
+        msg = f"unknown capture magic {magic:#x}"
+        raise CaptureFormatError(msg)
+
+
+_FORMATS = {"pcap": (pcap_header, pcap_record), "pcapng": (pcapng_header, pcapng_record)}
+
+
+class Recorder:
+    """Writes received frames to pcap/pcapng from a background thread.
+
+    record() only enqueues, it never blocks the receive loop. When the queue is full the frame is
+    counted in `dropped` instead. Files rotate after `max_bytes` bytes or `max_seconds` seconds,
+    numbered as capture_0001.pcap, capture_0002.pcap, ...
+    """
+
+    def __init__(  # noqa: PLR0913 keyword-only settings
+        self: "Recorder", path: Path, *, file_format: Format = "pcap", max_bytes: int | None = None,
+        max_seconds: float | None = None, queue_size: int = 65536, buffer_size: int = 4 * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self._header, self._record = _FORMATS[file_format]
+        self.max_bytes = max_bytes
+        self.max_ns = None if max_seconds is None else int(max_seconds * NANOSECONDS)
+        self.buffer_size = buffer_size
+        self.recorded = 0
+        self.dropped = 0
+        self.files: list[Path] = []
+        self._queue: Queue[tuple[int, bytes]] = Queue(queue_size)
+        self._stop = Event()
+        self._file: BinaryIO | None = None
+        self._written = 0
+        self._opened_ns = 0
+        self._thread = Thread(target=self._run, name="pygoose-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self: "Recorder", received_ns: int, frame: bytes) -> None:
+        try:
+            self._queue.put_nowait((received_ns, frame))
+        except Full:
+            self.dropped += 1
+
+    def _rotating(self: "Recorder") -> bool:
+        return self.max_bytes is not None or self.max_ns is not None
+
+    def _open(self: "Recorder") -> BinaryIO:
+        if self._rotating():
+            path = self.path.with_name(f"{self.path.stem}_{len(self.files) + 1:04d}{self.path.suffix}")
+        else:
+            path = self.path
+        self.files.append(path)
+        file = path.open("wb", buffering=self.buffer_size)
+        header = self._header()
+        file.write(header)
+        self._written = len(header)
+        self._opened_ns = monotonic_ns()
+        return file
+
+    def _should_rotate(self: "Recorder") -> bool:
+        if self.max_bytes is not None and self._written >= self.max_bytes:
+            return True
+        return self.max_ns is not None and monotonic_ns() - self._opened_ns >= self.max_ns
+
+    def _write(self: "Recorder", received_ns: int, frame: bytes) -> None:
+        if self._file is None:
+            self._file = self._open()
+        elif self._should_rotate():
+            self._file.close()
+            self._file = self._open()
+        record = self._record(received_ns, frame)
+        self._file.write(record)
+        self._written += len(record)
+        self.recorded += 1
+
+    def _run(self: "Recorder") -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                received_ns, frame = self._queue.get(timeout=0.1)
+            except Empty:
+                continue
+            self._write(received_ns, frame)
+        if self._file is not None:
+            self._file.close()
+
+    def close(self: "Recorder") -> None:
+        """Flushes every queued frame and closes the current file."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self: "Recorder") -> "Recorder":
+        return self
+
+    def __exit__(self: "Recorder", *_: object) -> None:
+        self.close()
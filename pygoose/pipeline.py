@@ -0,0 +1,160 @@
+from asyncio import gather
+from struct import error as StructError  # noqa: N812
+from time import time_ns
+from typing import TYPE_CHECKING
+
+from pygoose import timestamping
+from pygoose.goose import GOOSE_ETHER, peek_header, unpack_goose
+from pygoose.metrics import Metrics
+from pygoose.utils import async_usleep, usleep
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop
+    from collections.abc import Callable, Iterator
+    from socket import socket
+
+    from pygoose.auth import Signer, Verifier
+    from pygoose.goose import GOOSE, Header
+    from pygoose.pcap import Recorder
+    from pygoose.storm import StormGuard
+    from pygoose.timestamping import LatencyTracker
+
+    Callback = Callable[[GOOSE, int], None]  # decoded frame, receive time (ns)
+    Sink = Callable[[int, bytes, GOOSE], None]  # receive time (ns), raw frame, decoded frame
+
+DECODE_ERRORS = (ValueError, IndexError, StructError)  # malformed frames, counted and skipped
+
+
+def _ignore(goose: "GOOSE", received_ns: int) -> None: ...  # noqa: ARG001
+
+
+class Pipeline:
+    """Receive path shared by the sync and async subscribers.
+
+    Each stage (recv, peek, verify, select, decode, dispatch, callback, sink) is looked up as an attribute on every
+    frame, so pygoose.profiling can swap in timed versions and restore the plain ones afterwards. Frames are verified
+    before the storm guard sees them, so forged frames can't spend the tokens of an authenticated stream's source; a
+    flood of them costs an HMAC each instead.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: "Pipeline", callback: "Callback | None" = None, *, recorder: "Recorder | None" = None,
+        latency: "LatencyTracker | None" = None, metrics: Metrics | None = None,
+        predicate: "Callable[[bytes], bool] | None" = None, guard: "StormGuard | None" = None,
+        verifier: "Verifier | None" = None,
+    ) -> None:
+        self.callback: Callback = callback or _ignore
+        self.predicate = predicate  # e.g. a filters.FilterSet, sees the raw frame before it is decoded
+        self.guard = guard
+        self.verifier = verifier
+        self.recorder = recorder
+        self.latency = latency
+        self.metrics = metrics or Metrics()
+        self.sinks: list[Sink] = []
+
+    def recv(self: "Pipeline", nic: "socket") -> tuple[bytes, int | None]:
+        return timestamping.recv(nic, 1518)
+
+    async def async_recv(self: "Pipeline", loop: "AbstractEventLoop", nic: "socket") -> tuple[bytes, int | None]:
+        return await timestamping.async_recv(loop, nic, 1518)
+
+    def peek(self: "Pipeline", data: bytes) -> "Header | None":
+        """Returns the header, or None when the frame should be dropped before decoding."""
+        header = peek_header(data)
+        return header if header.ether == GOOSE_ETHER else None
+
+    def verify(self: "Pipeline", header: "Header", data: bytes) -> bool:
+        return self.verifier is None or self.verifier.verify(header, data)
+
+    def select(self: "Pipeline", data: bytes) -> bool:
+        return self.predicate is None or self.predicate(data)
+
+    def decode(self: "Pipeline", data: bytes) -> "GOOSE":
+        return unpack_goose(data)
+
+    def dispatch(self: "Pipeline", goose: "GOOSE", kernel_ns: int | None, received_ns: int) -> bool:
+        """Per-stream bookkeeping, returns whether the callback should see this frame."""
+        if self.latency is not None and kernel_ns is not None:
+            self.latency.record(goose, kernel_ns, received_ns)
+        return True
+
+    def sink(self: "Pipeline", received_ns: int, data: bytes, goose: "GOOSE") -> None:
+        for sink in self.sinks:
+            sink(received_ns, data, goose)
+
+    def handle(self: "Pipeline", data: bytes, kernel_ns: int | None, received_ns: int) -> None:
+        if self.recorder is not None:
+            self.recorder.record(kernel_ns or received_ns, data)
+        try:
+            header = self.peek(data)
+            if header is None:
+                self.metrics.filtered += 1
+                return
+            self.metrics.received(header.key, len(data), received_ns)
+            if not self.verify(header, data):
+                self.metrics.rejected += 1
+                return
+            if self.guard is not None and not self.guard.admit(header, received_ns):
+                self.metrics.shed += 1
+                return
+            if not self.select(data):
+                self.metrics.filtered += 1
+                return
+            goose = self.decode(data)
+        except DECODE_ERRORS as error:
+            self.metrics.decode_error(error)
+            return
+        if self.dispatch(goose, kernel_ns, received_ns):
+            self.callback(goose, received_ns)
+        self.sink(received_ns, data, goose)
+
+    def run(self: "Pipeline", nic: "socket") -> None:
+        while True:
+            data, kernel_ns = self.recv(nic)
+            self.handle(data, kernel_ns, time_ns())
+
+    async def async_run(self: "Pipeline", loop: "AbstractEventLoop", nic: "socket") -> None:
+        while True:
+            data, kernel_ns = await self.async_recv(loop, nic)
+            self.handle(data, kernel_ns, time_ns())
+
+
+class Publisher:
+    """Publish path, split in build, sign, wait and send stages the same way as Pipeline."""
+
+    def __init__(self: "Publisher", *, signer: "Signer | None" = None) -> None:
+        self.signer = signer
+
+    def build(self: "Publisher", frames: "Iterator[tuple[float, bytearray]]") -> tuple[float, bytearray] | None:
+        return next(frames, None)
+
+    def sign(self: "Publisher", frame: bytearray) -> bytearray:
+        """Adds the security extension, before waiting so it never delays the send."""
+        return frame if self.signer is None else self.signer.sign(frame)
+
+    def wait(self: "Publisher", microseconds: float) -> None:
+        usleep(microseconds)
+
+    async def async_wait(self: "Publisher", microseconds: float) -> None:
+        await async_usleep(microseconds)
+
+    def send(self: "Publisher", nic: "socket", frame: bytearray) -> None:
+        nic.sendall(frame)
+
+    async def async_send(self: "Publisher", loop: "AbstractEventLoop", nic: "socket", frame: bytearray) -> None:
+        await loop.sock_sendall(nic, frame)
+
+    def run(self: "Publisher", nic: "socket", frames: "Iterator[tuple[float, bytearray]]") -> None:
+        while (built := self.build(frames)) is not None:
+            wait_for, frame = built
+            frame = self.sign(frame)
+            self.wait(wait_for)
+            self.send(nic, frame)
+
+    async def async_run(
+        self: "Publisher", loop: "AbstractEventLoop", nic: "socket", frames: "Iterator[tuple[float, bytearray]]",
+    ) -> None:
+        while (built := self.build(frames)) is not None:
+            wait_for, frame = built
+            frame = self.sign(frame)
+            await gather(self.async_wait(wait_for), self.async_send(loop, nic, frame))
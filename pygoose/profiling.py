@@ -0,0 +1,115 @@
+import json
+import sys
+from functools import wraps
+from inspect import iscoroutinefunction
+from signal import SIGUSR1, signal
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any
+
+from pygoose.histogram import Histogram
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from types import FrameType
+
+RECEIVE_STAGES = ("recv", "async_recv", "peek", "verify", "select", "decode", "dispatch", "callback", "sink")
+PUBLISH_STAGES = ("build", "sign", "wait", "async_wait", "send", "async_send")
+_MISSING = object()
+
+
+class Stage:
+    __slots__ = ("calls", "total_ns", "histogram")
+
+    def __init__(self: "Stage") -> None:
+        self.calls = 0
+        self.total_ns = 0
+        self.histogram = Histogram()
+
+    def record(self: "Stage", elapsed_ns: int) -> None:
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.histogram.record(elapsed_ns)
+
+    def snapshot(self: "Stage") -> dict[str, Any]:
+        return {"calls": self.calls, "total_ns": self.total_ns, **self.histogram.snapshot()}
+
+
+def _timed(function: "Callable[..., Any]", stage: Stage) -> "Callable[..., Any]":
+    if iscoroutinefunction(function):
+
+        @wraps(function)
+        async def async_timed(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            start = perf_counter_ns()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                stage.record(perf_counter_ns() - start)
+
+        return async_timed
+
+    @wraps(function)
+    def timed(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        start = perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stage.record(perf_counter_ns() - start)
+
+    return timed
+
+
+class Profiler:
+    """Per-stage timing for a Pipeline and/or Publisher, off by default.
+
+    Enabling stores timed wrappers as instance attributes over the stage methods; disabling removes
+    them again, so a disabled profiler leaves the original methods in place and costs nothing.
+    """
+
+    def __init__(self: "Profiler", *targets: "tuple[object, Sequence[str]]") -> None:
+        self.targets = targets
+        self.stages: dict[str, Stage] = {}
+        self.enabled = False
+        self._originals: list[tuple[object, str, object]] = []
+
+    def enable(self: "Profiler") -> None:
+        if self.enabled:
+            return
+        for target, names in self.targets:
+            for name in names:
+                function = getattr(target, name, None)
+                if function is None:
+                    continue
+                stage = self.stages.setdefault(name, Stage())
+                self._originals.append((target, name, vars(target).get(name, _MISSING)))
+                setattr(target, name, _timed(function, stage))
+        self.enabled = True
+
+    def disable(self: "Profiler") -> None:
+        for target, name, original in reversed(self._originals):
+            if original is _MISSING:
+                delattr(target, name)
+            else:
+                setattr(target, name, original)
+        self._originals.clear()
+        self.enabled = False
+
+    def toggle(self: "Profiler") -> None:
+        if self.enabled:
+            self.disable()
+            print(json.dumps(self.snapshot(), indent=2), file=sys.stderr)
+        else:
+            self.enable()
+
+    def snapshot(self: "Profiler") -> dict[str, Any]:
+        return {name: stage.snapshot() for name, stage in self.stages.items()}
+
+    def reset(self: "Profiler") -> None:
+        self.stages.clear()
+
+    def install(self: "Profiler", signum: int = SIGUSR1) -> None:
+        """kill -USR1 <pid> turns profiling on, the next one turns it off and prints the stages to stderr."""
+
+        def handler(signum: int, frame: "FrameType | None") -> None:  # noqa: ARG001
+            self.toggle()
+
+        signal(signum, handler)
@@ -0,0 +1,206 @@
+import json
+from array import array
+from contextlib import suppress
+from dataclasses import dataclass
+from selectors import EVENT_READ, DefaultSelector
+from socket import socket
+from struct import Struct
+from sys import argv
+from time import time_ns
+from typing import TYPE_CHECKING, Any
+
+from pygoose import timestamping
+from pygoose.goose import HEADER_SIZE, generate_goose, pdu_offset
+from pygoose.pipeline import Pipeline, Publisher
+from pygoose.transport import open_receiver, open_sender
+
+if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
+
+    from pygoose.replay import Sender
+
+# IEC 62439-3 redundancy control trailer: sequence number, LAN id (4 bits) and LSDU size (12 bits), PRP suffix
+PRP_SUFFIX = 0x88FB
+LAN_A = 0xA
+LAN_B = 0xB
+RCT = Struct("!HHH")
+RCT_SIZE = RCT.size
+SEQUENCE_MODULO = 1 << 16
+DEFAULT_WINDOW = 512  # sequence numbers remembered per source
+FORGET_NS = 400_000_000  # EntryForgetTime, older entries never count as duplicates
+MAX_SOURCES = 1024
+
+
+def _lsdu_size(frame: "ReadableBuffer", size: int) -> int:
+    """Everything after the ethertype (and VLAN tag), from APPID on."""
+    return size - pdu_offset(frame) + 8
+
+
+def trailer(sequence: int, lan: int, lsdu_size: int) -> bytes:
+    return RCT.pack(sequence, lan << 12 | lsdu_size, PRP_SUFFIX)
+
+
+def parse_trailer(frame: "ReadableBuffer") -> tuple[int, int] | None:
+    """Returns the sequence number and LAN id, or None when the frame carries no valid trailer."""
+    view = memoryview(frame)
+    if len(view) < HEADER_SIZE + RCT_SIZE:
+        return None
+    sequence, lan_size, suffix = RCT.unpack_from(view, len(view) - RCT_SIZE)
+    lan, lsdu_size = lan_size >> 12, lan_size & 0xFFF
+    if suffix != PRP_SUFFIX or lan not in (LAN_A, LAN_B) or lsdu_size != _lsdu_size(view, len(view)):
+        return None
+    return sequence, lan
+
+
+class PrpSender:
+    """Sends every frame on both LANs, each copy with its trailer (same sequence number, its own LAN id)."""
+
+    def __init__(self: "PrpSender", lan_a: "Sender", lan_b: "Sender") -> None:
+        self.lan_a = lan_a
+        self.lan_b = lan_b
+        self.sequence = 0
+
+    def sendall(self: "PrpSender", data: "ReadableBuffer", /) -> None:
+        frame = bytearray(data)
+        size = len(frame)
+        frame += trailer(self.sequence, LAN_A, _lsdu_size(frame, size + RCT_SIZE))
+        self.lan_a.sendall(frame)
+        frame[size + 2] = LAN_B << 4 | frame[size + 2] & 0x0F
+        self.lan_b.sendall(frame)
+        self.sequence = (self.sequence + 1) % SEQUENCE_MODULO
+
+
+@dataclass(slots=True)
+class LanStatistics:
+    received: int = 0
+    wrong_lan: int = 0  # trailer says the other LAN, e.g. cables swapped
+
+
+class _Source:
+    """Ring of the last `window` sequence numbers of one source, indexed by sequence % window."""
+
+    __slots__ = ("sequences", "times", "unique", "duplicates", "lans")
+
+    def __init__(self: "_Source", window: int) -> None:
+        self.sequences = array("l", [-1]) * window
+        self.times = array("q", bytes(8 * window))
+        self.unique = 0
+        self.duplicates = 0
+        self.lans = {LAN_A: LanStatistics(), LAN_B: LanStatistics()}
+
+
+class DuplicateDiscard:
+    """Duplicate detection over (source MAC, sequence number) in O(1) time and bounded memory.
+
+    Each source keeps a fixed ring of `window` entries; a frame is a duplicate when its slot holds the same sequence
+    number, received less than FORGET_NS ago. Sources beyond max_sources are passed through without detection.
+    """
+
+    def __init__(self: "DuplicateDiscard", window: int = DEFAULT_WINDOW, max_sources: int = MAX_SOURCES) -> None:
+        self.window = window
+        self.max_sources = max_sources
+        self.sources: dict[bytes, _Source] = {}
+        self.untracked = 0
+
+    def accept(  # noqa: PLR0913
+        self: "DuplicateDiscard", source: bytes, sequence: int, lan: int, received_ns: int, nic_lan: int,
+    ) -> bool:
+        """Whether the frame is the first copy, lan is the trailer's LAN id and nic_lan the one it arrived on."""
+        state = self.sources.get(source)
+        if state is None:
+            if len(self.sources) >= self.max_sources:
+                self.untracked += 1
+                return True
+            state = self.sources[source] = _Source(self.window)
+        statistics = state.lans[nic_lan]
+        statistics.received += 1
+        if lan != nic_lan:
+            statistics.wrong_lan += 1
+        slot = sequence % self.window
+        if state.sequences[slot] == sequence and received_ns - state.times[slot] < FORGET_NS:
+            state.duplicates += 1
+            return False
+        state.sequences[slot] = sequence
+        state.times[slot] = received_ns
+        state.unique += 1
+        return True
+
+    def snapshot(self: "DuplicateDiscard") -> dict[str, Any]:
+        """Per source counters; a LAN's loss is how many unique frames never arrived through it."""
+        return {
+            source.hex(":"): {
+                "unique": state.unique,
+                "duplicates": state.duplicates,
+                **{
+                    f"lan_{'a' if lan == LAN_A else 'b'}": {
+                        "received": statistics.received,
+                        "lost": max(state.unique - statistics.received, 0),
+                        "wrong_lan": statistics.wrong_lan,
+                    }
+                    for lan, statistics in state.lans.items()
+                },
+            }
+            for source, state in list(self.sources.items())
+        }
+
+
+class PrpReceiver:
+    """Receives from both LANs and hands the first copy of each frame, trailer removed, to the pipeline.
+
+    Frames without a trailer (single attached nodes) are passed on as they are.
+    """
+
+    def __init__(self: "PrpReceiver", pipeline: Pipeline, duplicates: DuplicateDiscard | None = None) -> None:
+        self.pipeline = pipeline
+        self.duplicates = duplicates or DuplicateDiscard()
+        self.discarded = 0
+
+    def handle(self: "PrpReceiver", data: bytes, nic_lan: int, kernel_ns: int | None, received_ns: int) -> None:
+        found = parse_trailer(data)
+        if found is None:
+            self.pipeline.handle(data, kernel_ns, received_ns)
+            return
+        sequence, lan = found
+        if self.duplicates.accept(data[6:12], sequence, lan, received_ns, nic_lan):
+            self.pipeline.handle(data[:-RCT_SIZE], kernel_ns, received_ns)
+        else:
+            self.discarded += 1
+
+    def run(self: "PrpReceiver", lan_a: socket, lan_b: socket) -> None:
+        """Waits on both sockets and drains whichever is readable, they must be non-blocking."""
+        with DefaultSelector() as selector:
+            selector.register(lan_a, EVENT_READ, LAN_A)
+            selector.register(lan_b, EVENT_READ, LAN_B)
+            while True:
+                for key, _ in selector.select():
+                    nic: socket = key.fileobj  # type: ignore[assignment]
+                    with suppress(BlockingIOError):
+                        while True:
+                            data, kernel_ns = timestamping.recv(nic)
+                            self.handle(data, key.data, kernel_ns, time_ns())
+
+
+def publish(interface_a: str, interface_b: str) -> None:
+    with open_sender(interface_a) as lan_a, open_sender(interface_b) as lan_b:
+        Publisher().run(PrpSender(lan_a, lan_b), generate_goose(12))  # type: ignore[arg-type]
+
+
+def subscribe(interface_a: str, interface_b: str) -> PrpReceiver:
+    receiver = PrpReceiver(Pipeline())
+    with (
+        open_receiver(interface_a, blocking=False) as lan_a,
+        open_receiver(interface_b, blocking=False) as lan_b,
+        suppress(KeyboardInterrupt),
+    ):
+        receiver.run(lan_a, lan_b)
+    return receiver
+
+
+if __name__ == "__main__":
+    # python -m pygoose.prp publish|subscribe <LAN A interface> <LAN B interface>
+    if argv[1] == "publish":
+        publish(argv[2], argv[3])
+    elif argv[1] == "subscribe":
+        main_receiver = subscribe(argv[2], argv[3])
+        print(json.dumps(main_receiver.duplicates.snapshot(), indent=2))
+        print(json.dumps(main_receiver.pipeline.metrics.snapshot(), indent=2))
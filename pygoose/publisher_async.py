@@ -1,35 +1,53 @@
-from asyncio import gather
+import json
 from contextlib import suppress
-from socket import AF_PACKET, SOCK_RAW, socket
-from sys import argv
 from time import time_ns
 from typing import TYPE_CHECKING
 
 from uvloop import new_event_loop
 
+from pygoose.auth import KeyRing, Signer
+from pygoose.cli import publisher_parser
 from pygoose.goose import generate_goose
+from pygoose.pipeline import Publisher
+from pygoose.profiling import PUBLISH_STAGES, Profiler
+from pygoose.realtime import RealtimeMode, RealtimePublisher
+from pygoose.transport import open_sender
 from pygoose.utils import async_usleep
 
 if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
 
 
-async def run(loop: "AbstractEventLoop", interface: str, sleep_until: int) -> None:
-    """sleeps until sleep_until, then sends the goose."""
-    with socket(AF_PACKET, SOCK_RAW, 0xB888) as nic:
-        nic.bind((interface, 0))
-        nic.setblocking(False)
-
+async def run(  # noqa: PLR0913
+    loop: "AbstractEventLoop", interface: str, sleep_until: int, publisher: Publisher, priority: int | None = None,
+    vid: int | None = None,
+) -> None:
+    """sleeps until sleep_until, then sends the goose, 802.1Q tagged when priority or vid is set."""
+    with open_sender(interface, blocking=False) as nic:
         # convert 'ns delta' to 'us delta', then sleeps
         await async_usleep((sleep_until - time_ns()) * 1e-3)
 
         # TODO loop.run_in_executor  para calcular proximo quadro?
-        for wait_for, goose in generate_goose(12):
-            await gather(async_usleep(wait_for), loop.sock_sendall(nic, goose))
+        await publisher.async_run(loop, nic, generate_goose(12, priority=priority, vid=vid))
 
 
 if __name__ == "__main__":
+    main_args = publisher_parser("publisher_async").parse_args()
     main_loop = new_event_loop()
+    main_signer = None if main_args.key is None else Signer(KeyRing(main_args.key))
+    main_realtime = None if main_args.realtime is None else RealtimeMode(main_args.realtime)
+    main_publisher = (
+        Publisher(signer=main_signer) if main_realtime is None else RealtimePublisher(main_realtime, signer=main_signer)
+    )
+    main_profiler = Profiler((main_publisher, PUBLISH_STAGES))
+    main_profiler.install()
     with suppress(KeyboardInterrupt):
-        main_loop.run_until_complete(run(main_loop, argv[1], int(argv[2])))
+        main_run = run(
+            main_loop, main_args.interface, main_args.sleep_until, main_publisher, main_args.priority, main_args.vid,
+        )
+        main_loop.run_until_complete(main_run)
     main_loop.close()
+    if main_profiler.enabled:
+        main_profiler.toggle()
+    if isinstance(main_publisher, RealtimePublisher):
+        print(json.dumps(main_publisher.report(), indent=2))
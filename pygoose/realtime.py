@@ -0,0 +1,195 @@
+import gc
+import os
+from array import array
+from ctypes import CDLL, get_errno
+from dataclasses import asdict, dataclass
+from time import time_ns
+from typing import TYPE_CHECKING, Any
+
+from pygoose.pipeline import Publisher
+from pygoose.replay import ReplayReport
+from pygoose.utils import async_sleep_until, sleep_until
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop
+    from collections.abc import Iterator
+    from socket import socket
+
+    from pygoose.auth import Signer
+
+# sys/mman.h, not exported by the os module
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+DEFAULT_PRIORITY = 80  # SCHED_FIFO, above the kernel threaded IRQs (50) so NIC interrupts don't preempt a send
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class RealtimeStatus:
+    """What real-time mode managed to set up, each skipped step leaves a warning instead of failing."""
+
+    cpu: int | None  # pinned CPU
+    fifo_priority: int | None  # SCHED_FIFO priority, None when still SCHED_OTHER
+    memory_locked: bool  # mlockall(MCL_CURRENT | MCL_FUTURE)
+    gc_disabled: bool
+    warnings: tuple[str, ...] = ()
+
+    @property
+    def degraded(self: "RealtimeStatus") -> bool:
+        return bool(self.warnings)
+
+
+def _mlockall() -> None:
+    if CDLL(None, use_errno=True).mlockall(MCL_CURRENT | MCL_FUTURE):
+        errno = get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def _munlockall() -> None:
+    CDLL(None, use_errno=True).munlockall()
+
+
+class RealtimeMode:
+    """Pins to a CPU, asks for SCHED_FIFO, locks memory and stops the garbage collector until exit.
+
+    Without CAP_SYS_NICE (or an rtprio limit) and CAP_IPC_LOCK (or a large enough memlock limit) the steps that need
+    them are skipped and reported in RealtimeStatus.warnings. Exit restores the previous affinity and scheduler.
+    """
+
+    def __init__(
+        self: "RealtimeMode", cpu: int | None = None, priority: int = DEFAULT_PRIORITY, *, lock_memory: bool = True,
+    ) -> None:
+        self.cpu = cpu
+        self.priority = priority
+        self.lock_memory = lock_memory
+        self.status: RealtimeStatus | None = None
+        self._affinity: set[int] | None = None
+        self._scheduler: tuple[int, int] | None = None
+
+    def enter(self: "RealtimeMode") -> RealtimeStatus:
+        warnings: list[str] = []
+        cpu = fifo_priority = None
+        memory_locked = False
+        if self.cpu is not None:
+            previous = os.sched_getaffinity(0)
+            try:
+                os.sched_setaffinity(0, {self.cpu})
+            except OSError as error:
+                warnings.append(f"CPU {self.cpu} not pinned: {error}")
+            else:
+                cpu, self._affinity = self.cpu, previous
+        previous_scheduler = os.sched_getscheduler(0), os.sched_getparam(0).sched_priority
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.priority))
+        except OSError as error:
+            warnings.append(f"SCHED_FIFO not set, needs CAP_SYS_NICE or an rtprio limit: {error}")
+        else:
+            fifo_priority, self._scheduler = self.priority, previous_scheduler
+        if self.lock_memory:
+            try:
+                _mlockall()
+            except OSError as error:
+                warnings.append(f"Memory not locked, needs CAP_IPC_LOCK or a larger memlock limit: {error}")
+            else:
+                memory_locked = True
+        gc.collect()
+        gc.freeze()  # what survived so far is never scanned again
+        gc.disable()
+        self.status = RealtimeStatus(
+            cpu=cpu, fifo_priority=fifo_priority, memory_locked=memory_locked, gc_disabled=True,
+            warnings=tuple(warnings),
+        )
+        return self.status
+
+    def exit(self: "RealtimeMode") -> None:
+        gc.enable()
+        gc.unfreeze()
+        if self.status is not None and self.status.memory_locked:
+            _munlockall()
+        if self._scheduler is not None:
+            policy, priority = self._scheduler
+            os.sched_setscheduler(0, policy, os.sched_param(priority))
+            self._scheduler = None
+        if self._affinity is not None:
+            os.sched_setaffinity(0, self._affinity)
+            self._affinity = None
+
+    def __enter__(self: "RealtimeMode") -> RealtimeStatus:
+        return self.enter()
+
+    def __exit__(self: "RealtimeMode", *_: object) -> None:
+        self.exit()
+
+
+class RealtimePublisher(Publisher):
+    """Publisher that builds and signs every frame up front, once in real-time mode, then keeps absolute deadlines.
+
+    The hot loop only waits, sends and stores each send's deviation from its deadline in a preallocated array, so
+    it neither allocates nor page faults. Frame timestamps are the ones from when the frames were built. The jitter
+    report covers the frames sent so far even when the run is interrupted.
+    """
+
+    def __init__(self: "RealtimePublisher", mode: RealtimeMode, *, signer: "Signer | None" = None) -> None:
+        super().__init__(signer=signer)
+        self.mode = mode
+        self.jitter: ReplayReport | None = None
+
+    def _prepare(
+        self: "RealtimePublisher", frames: "Iterator[tuple[float, bytearray]]",
+    ) -> tuple[list[tuple[int, bytearray]], "array[int]"]:
+        prepared = []
+        while (built := self.build(frames)) is not None:
+            wait_for, frame = built
+            prepared.append((int(wait_for * 1e3), self.sign(frame)))
+        self.wait(0)  # page in the wait path before the first deadline
+        return prepared, array("q", bytes(8 * len(prepared)))
+
+    # sleep, then spin only utils.SPIN_NS: spinning through a whole heartbeat at SCHED_FIFO starves the IRQ threads
+    # until RT throttling (sched_rt_runtime_us) parks the publisher for tens of ms
+    def wait(self: "RealtimePublisher", microseconds: float) -> None:
+        sleep_until(time_ns() + microseconds * 1e3)
+
+    async def async_wait(self: "RealtimePublisher", microseconds: float) -> None:
+        await async_sleep_until(time_ns() + microseconds * 1e3)
+
+    def run(self: "RealtimePublisher", nic: "socket", frames: "Iterator[tuple[float, bytearray]]") -> None:
+        deviations, sent_frames = array("q"), 0
+        try:
+            with self.mode:
+                prepared, deviations = self._prepare(frames)
+                deadline = time_ns()
+                for wait_ns, frame in prepared:
+                    deadline += wait_ns
+                    self.wait((deadline - time_ns()) * 1e-3)
+                    sent = time_ns()
+                    self.send(nic, frame)
+                    deviations[sent_frames] = sent - deadline
+                    sent_frames += 1
+        finally:
+            self.jitter = ReplayReport.from_deviations(deviations[:sent_frames])
+
+    async def async_run(
+        self: "RealtimePublisher", loop: "AbstractEventLoop", nic: "socket",
+        frames: "Iterator[tuple[float, bytearray]]",
+    ) -> None:
+        deviations, sent_frames = array("q"), 0
+        try:
+            with self.mode:
+                prepared, deviations = self._prepare(frames)
+                deadline = time_ns()
+                for wait_ns, frame in prepared:
+                    deadline += wait_ns
+                    await self.async_wait((deadline - time_ns()) * 1e-3)
+                    sent = time_ns()
+                    await self.async_send(loop, nic, frame)
+                    deviations[sent_frames] = sent - deadline
+                    sent_frames += 1
+        finally:
+            self.jitter = ReplayReport.from_deviations(deviations[:sent_frames])
+
+    def report(self: "RealtimePublisher") -> dict[str, Any]:
+        """Real-time status and deviation of each send from its deadline (ns), for json.dumps."""
+        status = self.mode.status
+        return {
+            "realtime": None if status is None else {**asdict(status), "degraded": status.degraded},
+            "jitter": None if self.jitter is None else asdict(self.jitter),
+        }
@@ -0,0 +1,150 @@
+from array import array
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Queue
+from struct import pack_into
+from sys import argv
+from threading import Event, Thread
+from time import time_ns
+from typing import TYPE_CHECKING, Protocol
+
+from pygoose.goose import TIMESTAMP_TAG, find_field, pdu_offset
+from pygoose.pcap import read_capture
+from pygoose.transport import open_sender
+from pygoose.utils import now_into, sleep_until
+
+if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
+
+# (capture timestamp in ns, frame ready to send, offset of the timestamp to refresh or -1)
+Staged = tuple[int, bytearray, int]
+
+
+class Sender(Protocol):
+    def sendall(self: "Sender", data: "ReadableBuffer", /) -> None: ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Rewrite:
+    dst_addr: bytes | None = None
+    src_addr: bytes | None = None
+    app_id: int | None = None
+    fresh_timestamp: bool = False
+
+    def stage(self: "Rewrite", timestamp_ns: int, frame: "ReadableBuffer") -> Staged:
+        staged = bytearray(frame)
+        if self.dst_addr is not None:
+            staged[0:6] = self.dst_addr
+        if self.src_addr is not None:
+            staged[6:12] = self.src_addr
+        if self.app_id is not None:
+            pack_into("!H", staged, pdu_offset(staged) - 8, self.app_id)
+        timestamp_offset = -1
+        if self.fresh_timestamp:
+            with suppress(ValueError, IndexError):  # not a GOOSE frame, sent untouched
+                timestamp_offset = find_field(staged, TIMESTAMP_TAG)[0]
+        return timestamp_ns, staged, timestamp_offset
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ReplayReport:
+    """Deviation of each send from its scheduled time, in nanoseconds."""
+
+    frames: int
+    mean_ns: float
+    p50_ns: int
+    p99_ns: int
+    max_ns: int
+
+    @classmethod
+    def from_deviations(cls: type["ReplayReport"], deviations: "array[int]") -> "ReplayReport":
+        if not deviations:
+            return cls(frames=0, mean_ns=0.0, p50_ns=0, p99_ns=0, max_ns=0)
+        ordered = sorted(abs(deviation) for deviation in deviations)
+        return cls(
+            frames=len(ordered),
+            mean_ns=sum(ordered) / len(ordered),
+            p50_ns=ordered[len(ordered) // 2],
+            p99_ns=ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)],
+            max_ns=ordered[-1],
+        )
+
+    def __str__(self: "ReplayReport") -> str:
+        return (
+            f"{self.frames} frames, deviation from recorded gaps: mean {self.mean_ns * 1e-3:.3f} us, "
+            f"p50 {self.p50_ns * 1e-3:.3f} us, p99 {self.p99_ns * 1e-3:.3f} us, max {self.max_ns * 1e-3:.3f} us"
+        )
+
+
+def _stage(
+    path: Path, rewrite: Rewrite, queue: "Queue[Staged | None]", errors: list[Exception], stop: Event,
+) -> None:
+    try:
+        for timestamp_ns, frame in read_capture(path):
+            if stop.is_set():
+                break
+            queue.put(rewrite.stage(timestamp_ns, frame))
+    except Exception as error:  # noqa: BLE001 re-raised by replay(), the thread must not die silently
+        errors.append(error)
+    finally:
+        queue.put(None)
+
+
+def _finish(stager: Thread, errors: list[Exception], deviations: "array[int]") -> ReplayReport:
+    """Raises what stopped the staging thread, e.g. a pcap.CaptureFormatError, instead of a short report."""
+    stager.join()
+    if errors:
+        raise errors[0]
+    return ReplayReport.from_deviations(deviations)
+
+
+def replay(
+    nic: Sender, path: Path, *, scale: float = 1.0, rewrite: Rewrite | None = None, ahead: int = 4096,
+) -> ReplayReport:
+    """Sends the capture keeping its inter-frame gaps (multiplied by scale).
+
+    A background thread reads the capture through mmap and stages up to `ahead` frames, already
+    rewritten, so the send loop only waits for each deadline and sends.
+    """
+    queue: Queue[Staged | None] = Queue(ahead)
+    errors: list[Exception] = []
+    stop = Event()
+    stager = Thread(
+        target=_stage, args=(path, rewrite or Rewrite(), queue, errors, stop), name="pygoose-replay", daemon=True,
+    )
+    stager.start()
+    deviations = array("q")
+
+    item = queue.get()
+    try:
+        if item is not None:
+            capture_origin = item[0]
+            origin = time_ns()
+        while item is not None:
+            timestamp_ns, frame, timestamp_offset = item
+            deadline = origin + int((timestamp_ns - capture_origin) * scale)
+            sleep_until(deadline)
+            if timestamp_offset >= 0:
+                now_into(frame, timestamp_offset)
+            sent = time_ns()
+            nic.sendall(frame)
+            deviations.append(sent - deadline)
+            item = queue.get()
+    finally:
+        if item is not None:  # the send loop raised, the stager may be blocked on the full queue
+            stop.set()
+            while queue.get() is not None:
+                pass
+            stager.join()
+    return _finish(stager, errors, deviations)
+
+
+def run(interface: str, path: Path, scale: float = 1.0) -> ReplayReport:
+    with open_sender(interface) as nic:
+        return replay(nic, path, scale=scale)
+
+
+if __name__ == "__main__":
+    with suppress(KeyboardInterrupt):
+        print(run(argv[1], Path(argv[2]), float(argv[3]) if len(argv) > 3 else 1.0))  # noqa: PLR2004
@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from mmap import PROT_READ, mmap
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from struct import Struct
+from typing import TYPE_CHECKING
+
+from pygoose.datatypes.time_stamp import NANOSECONDS
+from pygoose.goose import find_field
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pygoose.goose import GOOSE
+
+MAGIC = b"GOSM"
+VERSION = 1
+DEFAULT_CAPACITY = 1024
+VALUE_SIZE = 256  # raw allData, longer data sets are truncated and flagged
+GO_ID_SIZE = 64
+ALL_DATA_TAG = 0xAB
+MAX_RETRIES = 10_000
+SHM_PATH = Path("/dev/shm")  # noqa: S108
+
+TEST = 1
+NDS_COM = 2
+TRUNCATED = 4
+
+_HEADER = Struct("<4sHHII")  # magic, version, slot size, capacity, slots in use
+_SEQUENCE = Struct("<I4x")  # seqlock counter, odd while the slot is being written
+_SEQUENCE_MASK = 0xFFFFFFFF  # the counter wraps, parity survives since 2**32 is even
+_BODY = Struct(f"<QIIIIqqqBBH{GO_ID_SIZE}s")  # key .. go_id, see Entry
+_HEADER_SIZE = 64
+_SLOT_SIZE = -(-(_SEQUENCE.size + _BODY.size + VALUE_SIZE) // 64) * 64  # whole cache lines
+_COUNT_OFFSET = 12
+
+
+class TableFormatError(ValueError): ...
+
+
+class SlotBusyError(RuntimeError): ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Entry:
+    key: int
+    st_num: int
+    sq_num: int
+    ttl: int
+    conf_rev: int
+    timestamp_ns: int
+    received_ns: int
+    expires_ns: int  # received + ttl, the data is no longer valid after this
+    flags: int
+    quality: int
+    values: bytes  # raw BER of allData
+    go_id: str
+
+    @property
+    def test(self: "Entry") -> bool:
+        return bool(self.flags & TEST)
+
+    @property
+    def nds_com(self: "Entry") -> bool:
+        return bool(self.flags & NDS_COM)
+
+    @property
+    def truncated(self: "Entry") -> bool:
+        return bool(self.flags & TRUNCATED)
+
+    def valid(self: "Entry", now_ns: int) -> bool:
+        return now_ns <= self.expires_ns
+
+
+class LatestValues:
+    """Latest state of every stream in a shared memory table, written by a single subscriber process.
+
+    Each slot is guarded by a seqlock: the counter is odd while the slot is written, readers retry until they see the
+    same even counter before and after copying the slot, so neither side ever blocks or serialises anything.
+    """
+
+    def __init__(self: "LatestValues", name: str | None = None, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.memory = SharedMemory(name, create=True, size=_HEADER_SIZE + capacity * _SLOT_SIZE)
+        self.name = self.memory.name
+        self.capacity = capacity
+        self.slots: dict[int, int] = {}  # stream key: slot index
+        self.overflow = 0  # frames of streams that didn't fit
+        _HEADER.pack_into(self.memory.buf, 0, MAGIC, VERSION, _SLOT_SIZE, capacity, 0)
+
+    def write(self: "LatestValues", goose: "GOOSE", received_ns: int, values: bytes = b"") -> None:
+        index = self.slots.get(goose.key)
+        added = index is None
+        if index is None:
+            if len(self.slots) >= self.capacity:
+                self.overflow += 1
+                return
+            index = self.slots[goose.key] = len(self.slots)
+        buffer = self.memory.buf
+        offset = _HEADER_SIZE + index * _SLOT_SIZE
+        (sequence,) = _SEQUENCE.unpack_from(buffer, offset)
+        _SEQUENCE.pack_into(buffer, offset, (sequence + 1) & _SEQUENCE_MASK)
+        flags = (TEST if goose.test else 0) | (NDS_COM if goose.nds_com else 0)
+        if len(values) > VALUE_SIZE:
+            flags |= TRUNCATED
+        timestamp = goose.timestamp
+        _BODY.pack_into(
+            buffer, offset + _SEQUENCE.size, goose.key, goose.st_num, goose.sq_num, goose.ttl, goose.conf_rev,
+            timestamp.second_since_epoch * NANOSECONDS + timestamp.fraction_of_second, received_ns,
+            received_ns + goose.ttl * 1_000_000, flags, int(timestamp.time_quality), min(len(values), VALUE_SIZE),
+            goose.go_id.encode()[:GO_ID_SIZE],
+        )
+        start = offset + _SEQUENCE.size + _BODY.size
+        buffer[start : start + min(len(values), VALUE_SIZE)] = values[:VALUE_SIZE]
+        _SEQUENCE.pack_into(buffer, offset, (sequence + 2) & _SEQUENCE_MASK)
+        if added:  # publish the slot only once it holds a complete entry
+            _HEADER.pack_into(buffer, 0, MAGIC, VERSION, _SLOT_SIZE, self.capacity, len(self.slots))
+
+    def sink(self: "LatestValues", received_ns: int, data: bytes, goose: "GOOSE") -> None:
+        """Pipeline sink, also copies the raw allData of the frame."""
+        offset, length = find_field(data, ALL_DATA_TAG)
+        self.write(goose, received_ns, data[offset : offset + length])
+
+    def close(self: "LatestValues") -> None:
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self: "LatestValues") -> "LatestValues":
+        return self
+
+    def __exit__(self: "LatestValues", *_: object) -> None:
+        self.close()
+
+
+class Reader:
+    """Read-only view of a LatestValues table, from any process.
+
+    Maps the segment directly instead of attaching a SharedMemory, whose resource tracker would unlink the table
+    when the reading process exits.
+    """
+
+    def __init__(self: "Reader", name: str) -> None:
+        with (SHM_PATH / name.lstrip("/")).open("rb") as file:
+            self._map = mmap(file.fileno(), 0, prot=PROT_READ)
+        self.buffer = memoryview(self._map)
+        magic, version, slot_size, self.capacity, _ = _HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or version != VERSION or slot_size != _SLOT_SIZE:
+            self.close()
+            msg = f"{name} is not a pygoose table (version {VERSION})"
+            raise TableFormatError(msg)
+        self.slots: dict[int, int] = {}  # stream key: slot index, slots never move once published
+
+    def __len__(self: "Reader") -> int:
+        return int.from_bytes(self.buffer[_COUNT_OFFSET : _COUNT_OFFSET + 4], "little")
+
+    def read(self: "Reader", index: int) -> Entry:
+        buffer = self.buffer
+        offset = _HEADER_SIZE + index * _SLOT_SIZE
+        for _ in range(MAX_RETRIES):
+            (before,) = _SEQUENCE.unpack_from(buffer, offset)
+            if before & 1:
+                continue
+            fields = _BODY.unpack_from(buffer, offset + _SEQUENCE.size)
+            start = offset + _SEQUENCE.size + _BODY.size
+            values = bytes(buffer[start : start + fields[10]])
+            (after,) = _SEQUENCE.unpack_from(buffer, offset)
+            if before == after:  # both read as u32, so equal modulo 2**32 across a wrap
+                break
+        else:
+            msg = f"Slot {index} kept changing while reading it"
+            raise SlotBusyError(msg)
+        key, st_num, sq_num, ttl, conf_rev, timestamp_ns, received_ns, expires_ns, flags, quality, _, go_id = fields
+        return Entry(
+            key=key, st_num=st_num, sq_num=sq_num, ttl=ttl, conf_rev=conf_rev, timestamp_ns=timestamp_ns,
+            received_ns=received_ns, expires_ns=expires_ns, flags=flags, quality=quality, values=values,
+            go_id=go_id.rstrip(b"\x00").decode(errors="replace"),
+        )
+
+    def __iter__(self: "Reader") -> "Iterator[Entry]":
+        for index in range(len(self)):
+            yield self.read(index)
+
+    def get(self: "Reader", key: int) -> Entry | None:
+        index = self.slots.get(key)
+        if index is not None:
+            return self.read(index)
+        for index in range(len(self.slots), len(self)):
+            entry = self.read(index)
+            self.slots[entry.key] = index
+            if entry.key == key:
+                return entry
+        return None
+
+    def close(self: "Reader") -> None:
+        self.buffer.release()
+        self._map.close()
+
+    def __enter__(self: "Reader") -> "Reader":
+        return self
+
+    def __exit__(self: "Reader", *_: object) -> None:
+        self.close()
@@ -0,0 +1,274 @@
+from typing import TYPE_CHECKING, Any
+
+from pygoose.datatypes.time_stamp import NANOSECONDS
+
+if TYPE_CHECKING:
+    from pygoose.goose import GOOSE
+
+WINDOW_NS = 10 * NANOSECONDS
+WINDOW_BUCKETS = 10
+PLATEAU = 0.1  # consecutive intervals within 10% are the steady state heartbeat
+MILLISECONDS = 1_000_000
+_COUNTER_MODULO = 1 << 32
+MAX_STREAMS = 4096  # per-stream statistics kept, spoofed sources must not grow memory unbounded
+
+
+class Ewma:
+    __slots__ = ("alpha", "value", "count")
+
+    def __init__(self: "Ewma", alpha: float = 1 / 16) -> None:
+        self.alpha = alpha
+        self.value = 0.0
+        self.count = 0
+
+    def update(self: "Ewma", value: float) -> None:
+        self.value = value if not self.count else self.value + self.alpha * (value - self.value)
+        self.count += 1
+
+
+class Window:
+    """Sliding window counter over span_ns, kept as a ring of buckets with a running total."""
+
+    __slots__ = ("bucket_ns", "counts", "latest", "total", "first_ns")
+
+    def __init__(self: "Window", span_ns: int = WINDOW_NS, buckets: int = WINDOW_BUCKETS) -> None:
+        self.bucket_ns = span_ns // buckets
+        self.counts = [0] * buckets
+        self.latest = 0  # absolute number of the newest bucket
+        self.total = 0
+        self.first_ns: int | None = None
+
+    def _advance(self: "Window", now_ns: int) -> None:
+        bucket = now_ns // self.bucket_ns
+        if self.first_ns is None:
+            self.first_ns, self.latest = now_ns, bucket
+            return
+        size = len(self.counts)
+        for expired in range(self.latest + 1, min(bucket, self.latest + size) + 1):
+            self.total -= self.counts[expired % size]
+            self.counts[expired % size] = 0
+        self.latest = max(bucket, self.latest)
+
+    def add(self: "Window", now_ns: int, amount: int = 1) -> None:
+        self._advance(now_ns)
+        self.counts[self.latest % len(self.counts)] += amount
+        self.total += amount
+
+    def rate(self: "Window", now_ns: int) -> float:
+        """Events per second over the window, or since the first event while the window is filling up."""
+        self._advance(now_ns)
+        if self.first_ns is None:
+            return 0.0
+        span = min(self.bucket_ns * len(self.counts), now_ns - self.first_ns)
+        return self.total * NANOSECONDS / span if span > 0 else 0.0
+
+
+class P2Quantile:
+    """Streaming quantile estimate in constant memory (Jain and Chlamtac's P-square algorithm)."""
+
+    __slots__ = ("p", "count", "heights", "positions", "desired", "increments")
+
+    def __init__(self: "P2Quantile", p: float) -> None:
+        self.p = p
+        self.count = 0
+        self.heights: list[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def _parabolic(self: "P2Quantile", index: int, sign: int) -> float:
+        heights, positions = self.heights, self.positions
+        below, here, above = positions[index - 1], positions[index], positions[index + 1]
+        return heights[index] + sign / (above - below) * (
+            (here - below + sign) * (heights[index + 1] - heights[index]) / (above - here)
+            + (above - here - sign) * (heights[index] - heights[index - 1]) / (here - below)
+        )
+
+    def add(self: "P2Quantile", value: float) -> None:
+        heights, positions, desired = self.heights, self.positions, self.desired
+        self.count += 1
+        if self.count <= len(positions):
+            heights.append(value)
+            heights.sort()
+            return
+        if value < heights[0]:
+            heights[0], cell = value, 0
+        elif value >= heights[4]:
+            heights[4], cell = value, 3
+        else:
+            cell = next(index for index in range(1, 5) if value < heights[index]) - 1
+        for index in range(cell + 1, 5):
+            positions[index] += 1
+        for index in range(5):
+            desired[index] += self.increments[index]
+        for index in range(1, 4):
+            delta = desired[index] - positions[index]
+            if (delta >= 1 and positions[index + 1] - positions[index] > 1) or (
+                delta <= -1 and positions[index - 1] - positions[index] < -1
+            ):
+                sign = 1 if delta > 0 else -1
+                height = self._parabolic(index, sign)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    neighbour = index + sign
+                    height = heights[index] + sign * (heights[neighbour] - heights[index]) / (
+                        positions[neighbour] - positions[index]
+                    )
+                heights[index] = height
+                positions[index] += sign
+
+    @property
+    def value(self: "P2Quantile") -> float:
+        if self.count > len(self.positions):
+            return self.heights[2]
+        if not self.heights:
+            return 0.0
+        return self.heights[min(len(self.heights) - 1, round((len(self.heights) - 1) * self.p))]
+
+
+class WindowedQuantile:
+    """P2Quantile restarted every span_ns, reports the last complete window once there is one."""
+
+    __slots__ = ("p", "span_ns", "start_ns", "current", "previous")
+
+    def __init__(self: "WindowedQuantile", p: float, span_ns: int = WINDOW_NS) -> None:
+        self.p = p
+        self.span_ns = span_ns
+        self.start_ns = 0
+        self.current = P2Quantile(p)
+        self.previous: float | None = None
+
+    def add(self: "WindowedQuantile", now_ns: int, value: float) -> None:
+        if now_ns - self.start_ns >= self.span_ns:
+            if self.current.count:
+                self.previous = self.current.value
+                self.current = P2Quantile(self.p)
+            self.start_ns = now_ns
+        self.current.add(value)
+
+    @property
+    def value(self: "WindowedQuantile") -> float:
+        return self.current.value if self.previous is None else self.previous
+
+
+class StreamStatistics:
+    """Live figures of one GOOSE stream, updated per frame without keeping any frame."""
+
+    __slots__ = (
+        "frames", "rate", "last_ns", "interval", "jitter", "heartbeat", "ttl", "expired", "st_num", "sq_num",
+        "events", "missed_events", "sequence_errors", "burst", "burst_interval", "curve_violations",
+        "offset", "offset_p50", "offset_p99",
+    )
+
+    def __init__(self: "StreamStatistics") -> None:
+        self.frames = 0
+        self.rate = Window()
+        self.last_ns = 0
+        self.interval = 0  # last inter-arrival time
+        self.jitter = 0.0  # RFC 3550 style, smoothed variation between consecutive intervals
+        self.heartbeat = Ewma()
+        self.ttl = 0  # ms, from the last frame
+        self.expired = 0  # frames that arrived after the previous frame's time allowed to live
+        self.st_num = 0
+        self.sq_num = 0
+        self.events = 0  # stNum changes
+        self.missed_events = 0  # stNum skipped
+        self.sequence_errors = 0  # sqNum not incremented by one within a stNum
+        self.burst = False  # retransmitting after an event, intervals should keep growing
+        self.burst_interval = 0
+        self.curve_violations = 0  # retransmission interval shorter than the one before it
+        self.offset = Ewma()  # event timestamp in the PDU -> arrival, first frame of each event only
+        self.offset_p50 = WindowedQuantile(0.5)
+        self.offset_p99 = WindowedQuantile(0.99)
+
+    def update(self: "StreamStatistics", goose: "GOOSE", received_ns: int) -> None:
+        first = not self.frames
+        self.frames += 1
+        self.rate.add(received_ns)
+        if first:
+            self._event(goose, received_ns)
+        else:
+            interval = received_ns - self.last_ns
+            if self.interval:
+                self.jitter += (abs(interval - self.interval) - self.jitter) / 16
+            if interval > self.ttl * MILLISECONDS:
+                self.expired += 1
+            if goose.st_num != self.st_num:
+                self.missed_events += max((goose.st_num - self.st_num) % _COUNTER_MODULO - 1, 0)
+                self._event(goose, received_ns)
+            else:
+                if goose.sq_num != (self.sq_num + 1) % _COUNTER_MODULO:
+                    self.sequence_errors += 1
+                self._repeat(interval)
+            self.interval = interval
+        self.last_ns = received_ns
+        self.ttl = goose.ttl
+        self.st_num = goose.st_num
+        self.sq_num = goose.sq_num
+
+    def _event(self: "StreamStatistics", goose: "GOOSE", received_ns: int) -> None:
+        self.events += 1
+        self.burst = True
+        self.burst_interval = 0
+        timestamp = goose.timestamp
+        offset = received_ns - (timestamp.second_since_epoch * NANOSECONDS + timestamp.fraction_of_second)
+        self.offset.update(offset)
+        self.offset_p50.add(received_ns, offset)
+        self.offset_p99.add(received_ns, offset)
+
+    def _repeat(self: "StreamStatistics", interval: int) -> None:
+        plateau = abs(interval - self.interval) <= self.interval * PLATEAU
+        if plateau:
+            self.heartbeat.update(interval)
+        if not self.burst:
+            return
+        if plateau and self.burst_interval:
+            self.burst = False
+        elif interval < self.burst_interval * (1 - PLATEAU):
+            self.curve_violations += 1
+        self.burst_interval = interval
+
+    def snapshot(self: "StreamStatistics", now_ns: int) -> dict[str, Any]:
+        heartbeat_ms = self.heartbeat.value / MILLISECONDS
+        return {
+            "frames": self.frames,
+            "rate": self.rate.rate(now_ns),
+            "jitter_ms": self.jitter / MILLISECONDS,
+            "heartbeat_ms": heartbeat_ms,
+            "ttl_ms": self.ttl,
+            "ttl_per_heartbeat": self.ttl / heartbeat_ms if heartbeat_ms else 0.0,
+            "expired": self.expired,
+            "events": self.events,
+            "missed_events": self.missed_events,
+            "sequence_errors": self.sequence_errors,
+            "curve_violations": self.curve_violations,
+            "offset_ms": self.offset.value / MILLISECONDS,
+            "offset_p50_ms": self.offset_p50.value / MILLISECONDS,
+            "offset_p99_ms": self.offset_p99.value / MILLISECONDS,
+        }
+
+
+class Statistics:
+    """StreamStatistics per stream (GOOSE.key), add `sink` to Pipeline.sinks to feed it.
+
+    Frames of streams beyond max_streams are only counted in untracked.
+    """
+
+    def __init__(self: "Statistics", max_streams: int = MAX_STREAMS) -> None:
+        self.streams: dict[int, StreamStatistics] = {}
+        self.max_streams = max_streams
+        self.untracked = 0
+
+    def record(self: "Statistics", goose: "GOOSE", received_ns: int) -> None:
+        stream = self.streams.get(goose.key)
+        if stream is None:
+            if len(self.streams) >= self.max_streams:
+                self.untracked += 1
+                return
+            stream = self.streams[goose.key] = StreamStatistics()
+        stream.update(goose, received_ns)
+
+    def sink(self: "Statistics", received_ns: int, data: bytes, goose: "GOOSE") -> None:  # noqa: ARG002
+        self.record(goose, received_ns)
+
+    def snapshot(self: "Statistics", now_ns: int) -> dict[str, Any]:
+        return {f"{key:016x}": stream.snapshot(now_ns) for key, stream in list(self.streams.items())}
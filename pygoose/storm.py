@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+from pygoose.datatypes.time_stamp import NANOSECONDS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from pygoose.goose import Header
+
+DEFAULT_RATE = 1000  # frames/s per source, well above a retransmission burst after an event
+DEFAULT_BURST = 200
+DEFAULT_SAMPLE = 100
+MAX_SOURCES = 4096
+OVERFLOW = -1  # sources beyond MAX_SOURCES share this bucket, so spoofed MACs can't grow the table
+
+Policy = Literal["drop", "sample"]
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class StormEvent:
+    source: int  # source MAC as an int, OVERFLOW for the shared bucket
+    started_ns: int
+    ended_ns: int | None = None  # None when the storm starts
+    shed: int = 0  # frames dropped during the storm, set when it ends
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "last_ns", "storm", "shed", "skipped")
+
+    def __init__(self: "TokenBucket", rate: float, burst: float, now_ns: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last_ns = now_ns
+        self.storm: int | None = None  # start of the ongoing storm
+        self.shed = 0
+        self.skipped = 0  # over budget frames since the last sample
+
+    def take(self: "TokenBucket", now_ns: int) -> bool:
+        elapsed = now_ns - self.last_ns
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate / NANOSECONDS)
+            self.last_ns = now_ns
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class StormGuard:
+    """Per-source token buckets checked on the peeked header, before anything is decoded.
+
+    A source over its budget starts a storm: its extra frames are dropped (or one in `sample` kept) until the bucket
+    fills up again. Protected streams (Header.key) are never shed and don't spend tokens. Once max_sources buckets
+    exist, new sources share the OVERFLOW bucket; buckets that filled up again are evicted (a full bucket is the same
+    as a new one), at most once per refill time, so real sources get their own bucket back after a spoofing flood.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: "StormGuard", rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST, *, policy: Policy = "drop",
+        sample: int = DEFAULT_SAMPLE, protected: "Iterable[int]" = (),
+        on_storm: "Callable[[StormEvent], None] | None" = None, max_sources: int = MAX_SOURCES,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.policy = policy
+        self.sample = sample
+        self.protected = frozenset(protected)
+        self.on_storm = on_storm
+        self.max_sources = max_sources
+        self.buckets: dict[int, TokenBucket] = {}
+        self.evicted = 0
+        self._sweep_ns = 0  # earliest time for the next eviction pass
+        self.shed = 0
+        self.storms = 0
+
+    def _bucket(self: "StormGuard", source: int, now_ns: int) -> tuple[int, TokenBucket]:
+        bucket = self.buckets.get(source)
+        if bucket is None:
+            if len(self.buckets) >= self.max_sources and now_ns >= self._sweep_ns:
+                self._evict_idle(now_ns)
+            if len(self.buckets) >= self.max_sources:
+                source = OVERFLOW
+                bucket = self.buckets.get(source)
+            if bucket is None:
+                bucket = self.buckets[source] = TokenBucket(self.rate, self.burst, now_ns)
+        return source, bucket
+
+    def _evict_idle(self: "StormGuard", now_ns: int) -> None:
+        self._sweep_ns = now_ns + int(self.burst / self.rate * NANOSECONDS)  # a bucket drained now is full by then
+        for source, bucket in list(self.buckets.items()):
+            tokens = bucket.tokens + (now_ns - bucket.last_ns) * bucket.rate / NANOSECONDS
+            if bucket.storm is None and tokens >= bucket.burst:
+                del self.buckets[source]
+                self.evicted += 1
+
+    def _emit(self: "StormGuard", event: StormEvent) -> None:
+        if self.on_storm is not None:
+            self.on_storm(event)
+
+    def admit(self: "StormGuard", header: "Header", now_ns: int) -> bool:
+        """Whether the frame should go on to decoding."""
+        if header.key in self.protected:
+            return True
+        source, bucket = self._bucket(int.from_bytes(header.src_addr, "big"), now_ns)
+        if bucket.take(now_ns):
+            if bucket.storm is not None and bucket.tokens >= bucket.burst - 1:
+                self._emit(StormEvent(source=source, started_ns=bucket.storm, ended_ns=now_ns, shed=bucket.shed))
+                bucket.storm, bucket.shed = None, 0
+            return True
+        if bucket.storm is None:
+            bucket.storm = now_ns
+            self.storms += 1
+            self._emit(StormEvent(source=source, started_ns=now_ns))
+        if self.policy == "sample":
+            bucket.skipped += 1
+            if bucket.skipped >= self.sample:
+                bucket.skipped = 0
+                return True
+        bucket.shed += 1
+        self.shed += 1
+        return False
+
+    @property
+    def storming(self: "StormGuard") -> list[int]:
+        return [source for source, bucket in list(self.buckets.items()) if bucket.storm is not None]
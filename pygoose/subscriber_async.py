@@ -1,76 +1,116 @@
+import json
 from contextlib import suppress
 from itertools import count
-from socket import AF_PACKET, SOCK_RAW, socket
-from sys import argv
+from sys import stderr
 from time import time_ns
 from typing import TYPE_CHECKING
 
 from uvloop import new_event_loop
 
-from pygoose.goose import unpack_goose
+from pygoose import metrics
+from pygoose.auth import KeyRing, Verifier
+from pygoose.cli import subscriber_parser
+from pygoose.eventlog import EventLog
+from pygoose.pcap import Recorder
+from pygoose.pipeline import Pipeline
+from pygoose.profiling import RECEIVE_STAGES, Profiler
+from pygoose.shared import LatestValues
+from pygoose.stats import Statistics
+from pygoose.storm import StormEvent, StormGuard
+from pygoose.timestamping import LatencyTracker
+from pygoose.transport import open_receiver
+from pygoose.utils import bytes2mac, int2hexstring
 
 if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
+    from collections.abc import Callable, Iterator
 
+    from pygoose.goose import GOOSE
 
-async def run(loop: "AbstractEventLoop", interface: str) -> None:
-    with socket(AF_PACKET, SOCK_RAW, 0xB888) as nic:
-        nic.bind((interface, 0))
-        nic.setblocking(False)
 
-        for counter in count(1):
-            elapsed: float = time_ns()
-            data = await loop.sock_recv(nic, 1518)
-            (
-                mac_dest,
-                mac_src,
-                ether,
-                app_id,
-                goose_length,
-                reserved1,
-                reserved2,
-                gocb_ref,
-                ttl,
-                data_set,
-                go_id,
-                timestamp,
-                st_num,
-                sq_num,
-                test,
-                conf_rev,
-                nds_com,
-                num_datset_entries,
-                trip,
-            ) = unpack_goose(data)
+def show(counter: "Iterator[int]") -> "Callable[[GOOSE, int], None]":
+    def callback(goose: "GOOSE", received_ns: int) -> None:
+        index = next(counter)
+        elapsed = (time_ns() - received_ns) * 1e-6
+        print(
+            f"{index} | {elapsed:.3f} ms\n"
+            f"{index} | From {bytes2mac(goose.mac_src)} to {bytes2mac(goose.mac_dest)} "
+            f"[{int2hexstring(goose.ether)}]\n"
+            f"{index} | APPID {int2hexstring(goose.app_id)}, {goose.goose_length} bytes"
+        )
+        if goose.reserved1 or goose.reserved2:
+            print(f"{index} | Reserved {int2hexstring(goose.reserved1)}, {int2hexstring(goose.reserved2)}")
+        print(
+            f"\nControl Block Reference: {goose.gocb_ref}\n"
+            f"Time Allowed to Live: {goose.ttl}\n"
+            f"Data Set: {goose.data_set}\n"
+            f"GOOSE ID: {goose.go_id}\n"
+            # TODO Timestamp is okay?
+            f"Timestamp [{goose.timestamp.time_quality}]:\n{goose.timestamp.datetime()}\n"
+            f"Status Number: {goose.st_num}\n"
+            f"Sequence Number: {goose.sq_num}\n"
+            f"Testing: {goose.test}\n"
+            f"Configuration Revision: {goose.conf_rev}\n"
+            f"Needs Commissioning: {goose.nds_com}\n"
+            f"Number of entries: {goose.num_datset_entries}\n"
+            f"All Data: {goose.trip}"
+        )
+        print("-" * 10)
 
-            elapsed = (time_ns() - elapsed) * 1e-6
-            print(
-                f"{counter} | {elapsed:.3f} ms\n"
-                f"{counter} | From {mac_src} to {mac_dest} [{ether}]\n"
-                f"{counter} | APPID {app_id}, {goose_length} bytes"
-            )
-            if "0x0000" not in (reserved1, reserved2):
-                print(f"{counter} | Reserved {reserved1}, {reserved2}")
-            print(
-                f"\nControl Block Reference: {gocb_ref}\n"
-                f"Time Allowed to Live: {ttl}\n"
-                f"Data Set: {data_set}\n"
-                f"GOOSE ID: {go_id}\n"
-                # TODO Timestamp is okay?
-                f"Timestamp [{timestamp.time_quality}]:\n{timestamp.datetime()}\n"
-                f"Status Number: {st_num}\n"
-                f"Sequence Number: {sq_num}\n"
-                f"Testing: {test}\n"
-                f"Configuration Revision: {conf_rev}\n"
-                f"Needs Commissioning: {nds_com}\n"
-                f"Number of entries: {num_datset_entries}\n"
-                f"All Data: {trip}"
-            )
-            print("-" * 10)
+    return callback
+
+
+def warn(event: StormEvent) -> None:
+    if event.ended_ns is None:
+        print(f"Storm from {event.source:012x}, shedding its frames", file=stderr)
+    else:
+        seconds = (event.ended_ns - event.started_ns) * 1e-9
+        print(f"Storm from {event.source:012x} over after {seconds:.3f} s, {event.shed} frames shed", file=stderr)
+
+
+async def run(
+    loop: "AbstractEventLoop", interface: str, pipeline: Pipeline, *, hardware_timestamps: bool = False,
+) -> None:
+    with open_receiver(interface, blocking=False, hardware_timestamps=hardware_timestamps) as nic:
+        pipeline.metrics.nic = nic
+        print(metrics.tune_buffers(nic, receive=metrics.RECEIVE_BUFFER))
+        await pipeline.async_run(loop, nic)
 
 
 if __name__ == "__main__":
+    main_args = subscriber_parser("subscriber_async").parse_args()
     main_loop = new_event_loop()
+    main_recorder = None if main_args.record is None else Recorder(main_args.record)
+    main_table = None if main_args.table is None else LatestValues(main_args.table)
+    main_events = None if main_args.events is None else EventLog(main_args.events)
+    main_verifier = None if main_args.key is None else Verifier(KeyRing(main_args.key))
+    main_latency = LatencyTracker()
+    main_pipeline = Pipeline(
+        show(count(1)), recorder=main_recorder, latency=main_latency, predicate=main_args.filter,
+        guard=StormGuard(on_storm=warn), verifier=main_verifier,
+    )
+    main_statistics = Statistics()
+    main_pipeline.sinks.append(main_statistics.sink)
+    if main_table is not None:
+        main_pipeline.sinks.append(main_table.sink)
+    if main_events is not None:
+        main_pipeline.sinks.append(main_events.sink)
+    Profiler((main_pipeline, RECEIVE_STAGES)).install()
+    main_port = main_args.metrics_port
+    main_server = None if main_port is None else metrics.serve(main_pipeline.metrics, main_port)
     with suppress(KeyboardInterrupt):
-        main_loop.run_until_complete(run(main_loop, argv[1]))
+        main_run = run(main_loop, main_args.interface, main_pipeline, hardware_timestamps=main_args.hardware_timestamps)
+        main_loop.run_until_complete(main_run)
     main_loop.close()
+    if main_server is not None:
+        main_server.shutdown()
+    print(json.dumps(main_latency.snapshot(), indent=2))
+    print(json.dumps(main_pipeline.metrics.snapshot(), indent=2))
+    print(json.dumps(main_statistics.snapshot(time_ns()), indent=2))
+    if main_table is not None:
+        main_table.close()
+    if main_events is not None:
+        main_events.close()
+    if main_recorder is not None:
+        main_recorder.close()
+        print(f"Recorded {main_recorder.recorded} frames, dropped {main_recorder.dropped}")
@@ -0,0 +1,375 @@
+import json
+from array import array
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from itertools import chain
+from math import pi, sin
+from struct import Struct
+from sys import argv, byteorder
+from time import time_ns
+from typing import TYPE_CHECKING, Any
+
+from pygoose.asn1 import Constructed, Primitive, unpack_length_from
+from pygoose.goose import pack_frame, peek_header
+from pygoose.histogram import Histogram
+from pygoose.transport import open_receiver, open_sender
+from pygoose.utils import sleep_until
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+    from socket import socket
+
+    from _typeshed import ReadableBuffer
+
+    from pygoose.replay import Sender
+
+# IEC 61850-9-2 LE: savPdu with noASDU and a sequence of ASDUs, each carrying 4 currents and 4 voltages
+SV_ETHER = 0x88BA
+SAV_PDU_TAG = 0x60
+NO_ASDU_TAG = 0x80
+SEQ_ASDU_TAG = 0xA2
+ASDU_TAG = 0x30
+SV_ID_TAG = 0x80
+SMP_CNT_TAG = 0x82
+CONF_REV_TAG = 0x83
+SMP_SYNCH_TAG = 0x85
+SEQ_DATA_TAG = 0x87
+CHANNELS = 8  # Ia, Ib, Ic, In, Va, Vb, Vc, Vn
+SEQ_DATA = Struct("!" + "iI" * CHANNELS)  # value and quality of each channel
+SEQ_DATA_SIZE = SEQ_DATA.size
+DEFAULT_RATE = 4000  # samples/s, 80 per cycle at 50 Hz
+DEFAULT_BATCH = 4000
+LOCAL = 1  # smpSynch, synchronised by a local clock
+
+_U16 = Struct("!H")
+_U32 = Struct("!I")
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ASDU:
+    sv_id: str
+    smp_cnt: int
+    conf_rev: int = 1
+    smp_synch: int = LOCAL
+    values: "Sequence[int]" = (0,) * CHANNELS
+    quality: "Sequence[int]" = (0,) * CHANNELS
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SampledValues:
+    mac_dest: bytes
+    mac_src: bytes
+    app_id: int
+    tci: int | None
+    asdus: list[ASDU]
+
+    @property
+    def key(self: "SampledValues") -> int:
+        """Stream key, same layout as GOOSE.key."""
+        return int.from_bytes(self.mac_src, "big") << 16 | self.app_id
+
+
+def _asdu_node(asdu: ASDU) -> Constructed:
+    return Constructed(
+        ASDU_TAG,
+        (
+            Primitive(SV_ID_TAG, asdu.sv_id.encode()),
+            Primitive(SMP_CNT_TAG, _U16.pack(asdu.smp_cnt)),
+            Primitive(CONF_REV_TAG, _U32.pack(asdu.conf_rev)),
+            Primitive(SMP_SYNCH_TAG, bytes((asdu.smp_synch,))),
+            Primitive(SEQ_DATA_TAG, SEQ_DATA.pack(*chain.from_iterable(zip(asdu.values, asdu.quality, strict=True)))),
+        ),
+    )
+
+
+def pack_sv(  # noqa: PLR0913
+    dst_addr: bytes, src_addr: bytes, app_id: int, asdus: "Sequence[ASDU]", *, priority: int | None = None,
+    vid: int | None = None,
+) -> bytearray:
+    pdu = Constructed(
+        SAV_PDU_TAG,
+        (
+            Primitive(NO_ASDU_TAG, bytes((len(asdus),))),
+            Constructed(SEQ_ASDU_TAG, tuple(_asdu_node(asdu) for asdu in asdus)),
+        ),
+    )
+    return pack_frame(dst_addr, src_addr, app_id, pdu, ether=SV_ETHER, priority=priority, vid=vid)
+
+
+def _children(view: memoryview, offset: int, end: int) -> "Iterator[tuple[int, int, int]]":
+    """Yields tag, value offset and length of each TLV between offset and end."""
+    while offset < end:
+        tag = view[offset]
+        length, value_offset = unpack_length_from(view, offset + 1)
+        if value_offset + length > end:
+            raise ValueError("SV data missing...")
+        yield tag, value_offset, length
+        offset = value_offset + length
+
+
+def _asdu_offsets(view: memoryview, offset: int, end: int) -> tuple[int, int, int]:
+    """Offset of smpCnt, offset and length of seqData within one ASDU."""
+    smp_cnt = data = data_length = -1
+    for field, value_offset, value_length in _children(view, offset, end):
+        if field == SMP_CNT_TAG and value_length == _U16.size:
+            smp_cnt = value_offset
+        elif field == SEQ_DATA_TAG:
+            data, data_length = value_offset, value_length
+    if smp_cnt < 0 or data < 0:
+        raise ValueError("Incomplete ASDU")
+    return smp_cnt, data, data_length
+
+
+def iter_asdus(frame: "ReadableBuffer") -> "Iterator[tuple[int, int, int, int]]":
+    """Yields the offset of each ASDU, of its smpCnt and of its seqData with its length, without decoding them."""
+    header = peek_header(frame)
+    if header.ether != SV_ETHER:
+        msg = f"Not a SV frame (ether {header.ether:#06x})"
+        raise ValueError(msg)
+    view = memoryview(frame)
+    offset = header.pdu_offset
+    if view[offset] != SAV_PDU_TAG:
+        raise ValueError("Can't find savPdu")
+    length, offset = unpack_length_from(view, offset + 1)
+    if offset + length > len(view):
+        raise ValueError("SV data missing...")
+    for tag, seq_offset, seq_length in _children(view, offset, offset + length):
+        if tag != SEQ_ASDU_TAG:
+            continue  # noASDU, security
+        for asdu_tag, asdu_offset, asdu_length in _children(view, seq_offset, seq_offset + seq_length):
+            if asdu_tag != ASDU_TAG:
+                raise ValueError("Can't find ASDU")
+            yield asdu_offset, *_asdu_offsets(view, asdu_offset, asdu_offset + asdu_length)
+
+
+def _check_seq_data(length: int) -> None:
+    if length != SEQ_DATA_SIZE:
+        msg = f"seqData has {length} bytes, 9-2 LE carries {SEQ_DATA_SIZE}"
+        raise ValueError(msg)
+
+
+def unpack_sv(frame: bytes) -> SampledValues:
+    """Decodes the whole frame, the batch path (SampleBatch) is the one meant for full rate streams."""
+    header = peek_header(frame)
+    view = memoryview(frame)
+    asdus = []
+    for asdu_offset, smp_cnt, data, data_length in iter_asdus(frame):
+        _check_seq_data(data_length)
+        sv_id, conf_rev, smp_synch = "", 0, 0
+        for field, value_offset, value_length in _children(view, asdu_offset, data + data_length):
+            value = frame[value_offset : value_offset + value_length]
+            if field == SV_ID_TAG:
+                sv_id = value.decode("utf8", "replace")
+            elif field == CONF_REV_TAG:
+                conf_rev = int.from_bytes(value, "big")
+            elif field == SMP_SYNCH_TAG:
+                smp_synch = int.from_bytes(value, "big")
+        fields = SEQ_DATA.unpack_from(frame, data)
+        asdus.append(
+            ASDU(
+                sv_id=sv_id, smp_cnt=_U16.unpack_from(frame, smp_cnt)[0], conf_rev=conf_rev, smp_synch=smp_synch,
+                values=fields[0::2], quality=fields[1::2],
+            ),
+        )
+    return SampledValues(
+        mac_dest=header.dst_addr, mac_src=header.src_addr, app_id=header.app_id, tci=header.tci, asdus=asdus,
+    )
+
+
+class SvEncoder:
+    """Encodes the frame once through the BER encoder, then only patches smpCnt and seqData of each ASDU."""
+
+    def __init__(  # noqa: PLR0913
+        self: "SvEncoder", dst_addr: bytes, src_addr: bytes, app_id: int, sv_id: str, *, asdus: int = 1,
+        conf_rev: int = 1, quality: "Sequence[int]" = (0,) * CHANNELS, priority: int | None = None,
+        vid: int | None = None,
+    ) -> None:
+        template = ASDU(sv_id=sv_id, smp_cnt=0, conf_rev=conf_rev, quality=quality)
+        self.frame = pack_sv(dst_addr, src_addr, app_id, [template] * asdus, priority=priority, vid=vid)
+        self.offsets = [(data, smp_cnt) for _, smp_cnt, data, _ in iter_asdus(self.frame)]
+        self.asdus = asdus
+        self._fields = [0] * (2 * CHANNELS)
+        self._fields[1::2] = quality
+
+    def pack(self: "SvEncoder", smp_cnt: int, samples: "Sequence[int]", row: int = 0) -> bytearray:
+        """Writes `asdus` consecutive rows of samples (CHANNELS values each) from `row` on, counting from smp_cnt.
+
+        Rows wrap around the end of samples, so a frame may carry the last rows of a cycle and the first of the next.
+        """
+        frame, fields = self.frame, self._fields
+        rows = len(samples) // CHANNELS
+        for data, smp_cnt_offset in self.offsets:
+            start = row % rows * CHANNELS
+            fields[0::2] = samples[start : start + CHANNELS]
+            SEQ_DATA.pack_into(frame, data, *fields)
+            _U16.pack_into(frame, smp_cnt_offset, smp_cnt & 0xFFFF)
+            row += 1
+            smp_cnt += 1
+        return frame
+
+
+def sine_samples(
+    samples_per_cycle: int = 80, current: int = 1000, voltage: int = 6_350_000,
+) -> "array[int]":
+    """One cycle of balanced three-phase currents (mA) and voltages (10 mV), neutrals as the sum of the phases."""
+    samples = array("i")
+    for index in range(samples_per_cycle):
+        angle = 2 * pi * index / samples_per_cycle
+        for amplitude in (current, voltage):
+            phases = [round(amplitude * sin(angle - shift * 2 * pi / 3)) for shift in range(3)]
+            samples.extend((*phases, sum(phases)))
+    return samples
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class PublishReport:
+    frames: int
+    lateness_ns: dict[str, Any]  # Histogram.snapshot of send time minus deadline
+
+
+def publish(
+    nic: "Sender", encoder: SvEncoder, samples: "Sequence[int]", *, rate: int = DEFAULT_RATE, frames: int | None = None,
+) -> PublishReport:
+    """Sends frames on a fixed schedule, each deadline taken from the start so lateness never accumulates.
+
+    smpCnt wraps every second as in 9-2 LE, samples are sent in a loop. Runs until `frames` are sent, or until
+    KeyboardInterrupt when frames is None, and returns how late each frame went out.
+    """
+    rows = len(samples) // CHANNELS
+    period_ns = encoder.asdus * 1_000_000_000 / rate
+    lateness = Histogram()
+    origin = time_ns()
+    index = 0
+    with suppress(KeyboardInterrupt):
+        while frames is None or index < frames:
+            smp_cnt = index * encoder.asdus % rate
+            frame = encoder.pack(smp_cnt, samples, index * encoder.asdus % rows)
+            deadline = origin + int(index * period_ns)
+            sleep_until(deadline)
+            sent = time_ns()
+            nic.sendall(frame)
+            lateness.record(sent - deadline)
+            index += 1
+    return PublishReport(frames=index, lateness_ns=lateness.snapshot())
+
+
+class BatchFullError(RuntimeError): ...
+
+
+class SampleBatch:
+    """Preallocated columns for `capacity` ASDUs.
+
+    seqData is only copied, raw, when a frame is decoded; values and quality are converted for the whole batch at once.
+    """
+
+    def __init__(self: "SampleBatch", capacity: int = DEFAULT_BATCH) -> None:
+        self.capacity = capacity
+        self.count = 0
+        self.keys = array("Q", bytes(8 * capacity))
+        self.smp_cnt = array("H", bytes(2 * capacity))
+        self.received_ns = array("q", bytes(8 * capacity))
+        self.raw = bytearray(capacity * SEQ_DATA_SIZE)
+
+    def _channels(self: "SampleBatch", typecode: str, start: int) -> "array[int]":
+        converted = array(typecode)
+        converted.frombytes(self.raw[: self.count * SEQ_DATA_SIZE])
+        if byteorder == "little":
+            converted.byteswap()
+        return converted[start::2]
+
+    def values(self: "SampleBatch") -> "array[int]":
+        """count * CHANNELS values, row after row."""
+        return self._channels("i", 0)
+
+    def quality(self: "SampleBatch") -> "array[int]":
+        return self._channels("I", 1)
+
+    def clear(self: "SampleBatch") -> None:
+        self.count = 0
+
+    @property
+    def full(self: "SampleBatch") -> bool:
+        return self.count >= self.capacity
+
+    def decode(self: "SampleBatch", frame: "ReadableBuffer", received_ns: int) -> int:
+        """Appends the ASDUs of a frame, returns how many, raising ValueError for malformed frames.
+
+        Nothing is appended unless every ASDU of the frame is valid and fits, BatchFullError asks for a flush.
+        """
+        asdus = list(iter_asdus(frame))
+        for _, _, _, data_length in asdus:
+            _check_seq_data(data_length)
+        if self.count + len(asdus) > self.capacity:
+            msg = f"{len(asdus)} ASDUs don't fit, {self.capacity - self.count} left"
+            raise BatchFullError(msg)
+        key = peek_header(frame).key
+        view = memoryview(frame)
+        raw, index = self.raw, self.count
+        for _, smp_cnt, data, _ in asdus:
+            self.keys[index] = key
+            self.smp_cnt[index] = _U16.unpack_from(view, smp_cnt)[0]
+            self.received_ns[index] = received_ns
+            raw[index * SEQ_DATA_SIZE : (index + 1) * SEQ_DATA_SIZE] = view[data : data + SEQ_DATA_SIZE]
+            index += 1
+        self.count = index
+        return len(asdus)
+
+
+class SvSubscriber:
+    """Receives into a preallocated buffer and fills a SampleBatch, handing it over to on_batch each time it is full.
+
+    The batch is cleared after on_batch returns, copy what should be kept.
+    """
+
+    def __init__(
+        self: "SvSubscriber", on_batch: "Callable[[SampleBatch], None]", batch: SampleBatch | None = None,
+    ) -> None:
+        self.on_batch = on_batch
+        self.batch = batch or SampleBatch()
+        self.buffer = bytearray(1518)
+        self.frames = 0
+        self.decode_errors = 0
+
+    def handle(self: "SvSubscriber", frame: "ReadableBuffer", received_ns: int) -> None:
+        self.frames += 1
+        try:
+            try:
+                self.batch.decode(frame, received_ns)
+            except BatchFullError:
+                self.flush()
+                self.batch.decode(frame, received_ns)
+        except (ValueError, IndexError, BatchFullError):
+            self.decode_errors += 1
+        if self.batch.full:
+            self.flush()
+
+    def flush(self: "SvSubscriber") -> None:
+        if self.batch.count:
+            self.on_batch(self.batch)
+            self.batch.clear()
+
+    def run(self: "SvSubscriber", nic: "socket") -> None:
+        buffer = memoryview(self.buffer)
+        while True:
+            size = nic.recv_into(self.buffer)
+            self.handle(buffer[:size], time_ns())
+
+
+if __name__ == "__main__":
+    # python -m pygoose.sv publish <interface> [rate] | subscribe <interface>
+    if argv[1] == "publish":
+        with open_sender(argv[2], SV_ETHER) as main_nic:
+            main_encoder = SvEncoder(b"\x01\x0c\xcd\x04\x00\x01", b"\x00\x30\xa7\x22\x9d\x01", 0x4000, "MU01")
+            main_rate = int(argv[3]) if len(argv) > 3 else DEFAULT_RATE  # noqa: PLR2004
+            main_report = publish(main_nic, main_encoder, sine_samples(main_rate // 50), rate=main_rate)  # until ^C
+        print(json.dumps(asdict(main_report), indent=2))
+    elif argv[1] == "subscribe":
+
+        def show(batch: SampleBatch) -> None:
+            first = list(batch.values()[:CHANNELS])
+            print(json.dumps({"asdus": batch.count, "smp_cnt": batch.smp_cnt[0], "values": first}))
+
+        main_subscriber = SvSubscriber(show)
+        with open_receiver(argv[2], SV_ETHER) as main_nic, suppress(KeyboardInterrupt):
+            main_subscriber.run(main_nic)
+        print(json.dumps({"frames": main_subscriber.frames, "decode_errors": main_subscriber.decode_errors}))
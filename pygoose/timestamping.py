@@ -0,0 +1,162 @@
+from contextlib import suppress
+from ctypes import addressof, c_char
+from dataclasses import dataclass, field
+from fcntl import ioctl
+from struct import Struct
+from time import time_ns
+from typing import TYPE_CHECKING, Any, Literal
+
+from pygoose.datatypes.time_stamp import NANOSECONDS
+from pygoose.histogram import Histogram
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop, Future
+    from socket import socket
+
+    from pygoose.goose import GOOSE
+
+# linux/asm-generic/socket.h, not exported by the socket module
+SOL_SOCKET = 1
+SO_TIMESTAMPNS = SCM_TIMESTAMPNS = 35
+SO_TIMESTAMPING = SCM_TIMESTAMPING = 37
+# linux/net_tstamp.h
+SOF_TIMESTAMPING_RX_HARDWARE = 1 << 2
+SOF_TIMESTAMPING_RX_SOFTWARE = 1 << 3
+SOF_TIMESTAMPING_SOFTWARE = 1 << 4
+SOF_TIMESTAMPING_RAW_HARDWARE = 1 << 6
+HWTSTAMP_TX_OFF = 0
+HWTSTAMP_FILTER_ALL = 1
+SIOCSHWTSTAMP = 0x89B0
+# linux/if_packet.h, the kernel strips 802.1Q tags before packet sockets see the frame and reports them here
+SOL_PACKET = 263
+PACKET_AUXDATA = 8
+TP_STATUS_VLAN_VALID = 1 << 4
+TP_STATUS_VLAN_TPID_VALID = 1 << 6
+VLAN_ETHER = 0x8100
+
+_TIMESPEC = Struct("=qq")
+_TIMESPEC3 = Struct("=qqqqqq")  # software, legacy (unused), raw hardware
+_HWTSTAMP_CONFIG = Struct("=iii")  # flags, tx_type, rx_filter
+_IFREQ = Struct("@16sP16x")  # ifr_name, pointer to hwtstamp_config, rest of the union
+_AUXDATA = Struct("=IIIHHHH")  # tp_status, tp_len, tp_snaplen, tp_mac, tp_net, tp_vlan_tci, tp_vlan_tpid
+_VLAN = Struct("!HH")  # TPID, TCI
+ANCILLARY_SIZE = 128  # timestamps and auxdata
+MAX_STREAMS = 4096  # per-stream histograms kept, spoofed sources must not grow memory unbounded
+
+Mode = Literal["hardware", "software"]
+
+
+def _enable_hardware(nic: "socket", interface: str) -> None:
+    config = bytearray(_HWTSTAMP_CONFIG.pack(0, HWTSTAMP_TX_OFF, HWTSTAMP_FILTER_ALL))
+    buffer = (c_char * len(config)).from_buffer(config)
+    ioctl(nic.fileno(), SIOCSHWTSTAMP, _IFREQ.pack(interface.encode(), addressof(buffer)))
+    flags = SOF_TIMESTAMPING_RX_HARDWARE | SOF_TIMESTAMPING_RAW_HARDWARE
+    flags |= SOF_TIMESTAMPING_RX_SOFTWARE | SOF_TIMESTAMPING_SOFTWARE
+    nic.setsockopt(SOL_SOCKET, SO_TIMESTAMPING, flags)
+
+
+def enable(nic: "socket", interface: str, *, hardware: bool = False) -> Mode:
+    """Turns on kernel receive timestamps, trying the NIC clock first when hardware is set.
+
+    Hardware timestamping needs driver support and CAP_NET_ADMIN, it falls back to SO_TIMESTAMPNS.
+    """
+    if hardware:
+        with suppress(OSError):
+            _enable_hardware(nic, interface)
+            return "hardware"
+    nic.setsockopt(SOL_SOCKET, SO_TIMESTAMPNS, 1)
+    return "software"
+
+
+def kernel_ns(ancdata: "list[tuple[int, int, bytes]]") -> int | None:
+    """Returns the receive time (ns since epoch) from recvmsg ancillary data, preferring hardware."""
+    for level, kind, data in ancdata:
+        if level != SOL_SOCKET:
+            continue
+        if kind == SCM_TIMESTAMPNS and len(data) >= _TIMESPEC.size:
+            seconds, nanoseconds = _TIMESPEC.unpack_from(data)
+            return int(seconds * NANOSECONDS + nanoseconds)
+        if kind == SCM_TIMESTAMPING and len(data) >= _TIMESPEC3.size:
+            software_s, software_ns, _, _, hardware_s, hardware_ns = _TIMESPEC3.unpack_from(data)
+            if hardware_s or hardware_ns:
+                return int(hardware_s * NANOSECONDS + hardware_ns)
+            return int(software_s * NANOSECONDS + software_ns)
+    return None
+
+
+def keep_vlan_tags(nic: "socket") -> None:
+    """Asks for PACKET_AUXDATA, so recv can put back the VLAN tag the kernel took off the frame."""
+    nic.setsockopt(SOL_PACKET, PACKET_AUXDATA, 1)
+
+
+def vlan_tag(ancdata: "list[tuple[int, int, bytes]]") -> tuple[int, int] | None:
+    """Returns the TPID and TCI the kernel stripped from the frame, from recvmsg ancillary data."""
+    for level, kind, data in ancdata:
+        if level == SOL_PACKET and kind == PACKET_AUXDATA and len(data) >= _AUXDATA.size:
+            status, _, _, _, _, tci, tpid = _AUXDATA.unpack_from(data)
+            if status & TP_STATUS_VLAN_VALID:
+                return (tpid if status & TP_STATUS_VLAN_TPID_VALID else VLAN_ETHER), tci
+    return None
+
+
+def recv(nic: "socket", bufsize: int = 1518) -> tuple[bytes, int | None]:
+    data, ancdata, _, _ = nic.recvmsg(bufsize, ANCILLARY_SIZE)
+    tag = vlan_tag(ancdata)
+    if tag is not None:
+        data = data[:12] + _VLAN.pack(*tag) + data[12:]
+    return data, kernel_ns(ancdata)
+
+
+async def async_recv(loop: "AbstractEventLoop", nic: "socket", bufsize: int = 1518) -> tuple[bytes, int | None]:
+    """recv() for a non-blocking socket, loop.sock_recv can't return ancillary data."""
+    while True:
+        with suppress(BlockingIOError):
+            return recv(nic, bufsize)
+        readable: Future[None] = loop.create_future()
+
+        def wake(readable: "Future[None]" = readable) -> None:
+            if not readable.done():
+                readable.set_result(None)
+
+        loop.add_reader(nic.fileno(), wake)
+        try:
+            await readable
+        finally:
+            loop.remove_reader(nic.fileno())
+
+
+@dataclass(slots=True)
+class StreamLatency:
+    wire: Histogram = field(default_factory=Histogram)  # PDU timestamp -> kernel receive
+    stack: Histogram = field(default_factory=Histogram)  # kernel receive -> recvmsg returned
+    callback: Histogram = field(default_factory=Histogram)  # kernel receive -> application callback
+
+    def snapshot(self: "StreamLatency") -> dict[str, Any]:
+        return {"wire": self.wire.snapshot(), "stack": self.stack.snapshot(), "callback": self.callback.snapshot()}
+
+
+class LatencyTracker:
+    """End-to-end latency histograms per stream (GOOSE.key), in nanoseconds.
+
+    Frames of streams beyond max_streams are only counted in untracked.
+    """
+
+    def __init__(self: "LatencyTracker", max_streams: int = MAX_STREAMS) -> None:
+        self.streams: dict[int, StreamLatency] = {}
+        self.max_streams = max_streams
+        self.untracked = 0
+
+    def record(self: "LatencyTracker", goose: "GOOSE", kernel: int, received: int, callback: int | None = None) -> None:
+        stream = self.streams.get(goose.key)
+        if stream is None:
+            if len(self.streams) >= self.max_streams:
+                self.untracked += 1
+                return
+            stream = self.streams[goose.key] = StreamLatency()
+        timestamp = goose.timestamp
+        stream.wire.record(kernel - (timestamp.second_since_epoch * NANOSECONDS + timestamp.fraction_of_second))
+        stream.stack.record(received - kernel)
+        stream.callback.record((time_ns() if callback is None else callback) - kernel)
+
+    def snapshot(self: "LatencyTracker") -> dict[str, Any]:
+        return {f"{key:016x}": stream.snapshot() for key, stream in self.streams.items()}
@@ -0,0 +1,63 @@
+from socket import AF_PACKET, AF_UNIX, SOCK_DGRAM, SOCK_RAW, htons, socket, socketpair
+
+from pygoose import timestamping
+from pygoose.goose import GOOSE_ETHER
+
+# "loopback:<name>" interfaces are AF_UNIX datagram sockets in the abstract namespace instead of packet sockets:
+# no root needed, frames keep their boundaries, recvmsg still returns SO_TIMESTAMPNS and MSG_DONTWAIT batching
+# works the same. Unlike a NIC a full receive queue blocks the sender rather than dropping frames, and for named
+# loopbacks the queue only holds net.unix.max_dgram_qlen frames (10 by default), whatever the buffer size.
+LOOPBACK = "loopback:"
+_ABSTRACT = "\0pygoose/"
+
+
+def is_loopback(interface: str) -> bool:
+    return interface.startswith(LOOPBACK)
+
+
+def _address(interface: str) -> str:
+    return _ABSTRACT + interface.removeprefix(LOOPBACK)
+
+
+def open_sender(interface: str, ether: int = GOOSE_ETHER, *, blocking: bool = True) -> socket:
+    """Socket to send frames on, a loopback name needs its receiver opened first."""
+    if is_loopback(interface):
+        nic = socket(AF_UNIX, SOCK_DGRAM)
+        try:
+            nic.connect(_address(interface))
+        except OSError:
+            nic.close()
+            raise
+    else:
+        nic = socket(AF_PACKET, SOCK_RAW, htons(ether))
+        nic.bind((interface, 0))
+    nic.setblocking(blocking)
+    return nic
+
+
+def open_receiver(
+    interface: str, ether: int = GOOSE_ETHER, *, blocking: bool = True, hardware_timestamps: bool = False,
+) -> socket:
+    """Socket to receive frames on, with kernel timestamps and, for packet sockets, VLAN tags.
+
+    hardware_timestamps asks for the NIC clock, see timestamping.enable for the fallback.
+    """
+    if is_loopback(interface):
+        nic = socket(AF_UNIX, SOCK_DGRAM)
+        nic.bind(_address(interface))
+    else:
+        nic = socket(AF_PACKET, SOCK_RAW, htons(ether))
+        nic.bind((interface, 0))
+        timestamping.keep_vlan_tags(nic)
+    timestamping.enable(nic, interface, hardware=hardware_timestamps)
+    nic.setblocking(blocking)
+    return nic
+
+
+def loopback_pair(*, blocking: bool = True) -> tuple[socket, socket]:
+    """Connected (sender, receiver) for a single process, receive timestamps on like open_receiver."""
+    sender, receiver = socketpair(AF_UNIX, SOCK_DGRAM)
+    timestamping.enable(receiver, LOOPBACK)
+    sender.setblocking(blocking)
+    receiver.setblocking(blocking)
+    return sender, receiver
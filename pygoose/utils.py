@@ -1,11 +1,20 @@
-import decimal as dec
 from asyncio import sleep
+from functools import lru_cache
 from struct import pack
 from struct import unpack as s_unpack
+from time import sleep as thread_sleep
 from time import time_ns
+from typing import TYPE_CHECKING
 
 from pygoose.asn1 import Triplet
-from pygoose.datatypes import TimeQuality, Timestamp
+from pygoose.datatypes import TimeQuality
+from pygoose.datatypes.time_stamp import pack_nanoseconds, pack_nanoseconds_into
+
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
+_DEFAULT_QUALITY = int(TimeQuality.default())
+SPIN_NS = 100_000  # sleep() can oversleep by tens of us, only this last stretch before a deadline is busy waited
 
 
 def u32_bytes(value: int) -> bytes:
@@ -29,6 +38,10 @@ def bytes2hexstring(bytes_string: bytes) -> str:
     return "0x" + _bytes2hex(bytes_string).upper()
 
 
+def int2hexstring(value: int, size: int = 2) -> str:
+    return f"0x{value:0{size * 2}X}"
+
+
 def bytes2string(bytes_string: bytes) -> str:
     return bytes_string.decode("utf8")
 
@@ -44,16 +57,20 @@ def ether2bytes(value: str) -> bytes:
     return bytes.fromhex(value)
 
 
+@lru_cache(maxsize=32)
+def quality_byte(quality: TimeQuality | None = None) -> int:
+    return _DEFAULT_QUALITY if quality is None else int(quality)
+
+
 def now(quality: TimeQuality | None = None) -> Triplet:
-    if quality is None:
-        quality = TimeQuality.default()
-    current_time = dec.Decimal(time_ns()) * dec.Decimal(1e-9)
-    epoch = int(current_time)
-    fraction = int((current_time % 1) * int(1e9))
-    timestamp = Timestamp(
-        second_since_epoch=epoch, fraction_of_second=fraction, time_quality=quality,
-    )
-    return Triplet(0x84, bytes(timestamp))
+    return Triplet(0x84, pack_nanoseconds(time_ns(), quality_byte(quality)))
+
+
+def now_into(buffer: "WriteableBuffer", offset: int, quality: TimeQuality | None = None) -> int:
+    """Writes the current timestamp (8 bytes) at offset, returns the clock reading in nanoseconds."""
+    nanoseconds = time_ns()
+    pack_nanoseconds_into(buffer, offset, nanoseconds, quality_byte(quality))
+    return nanoseconds
 
 
 def usleep(microseconds: float) -> None:
@@ -64,6 +81,22 @@ def usleep(microseconds: float) -> None:
             break
 
 
+def sleep_until(deadline_ns: float) -> None:
+    """Sleeps until SPIN_NS before the deadline (time_ns), then busy waits, long gaps don't keep a core busy."""
+    coarse = deadline_ns - SPIN_NS - time_ns()
+    if coarse > 0:
+        thread_sleep(coarse * 1e-9)
+    usleep((deadline_ns - time_ns()) * 1e-3)
+
+
+async def async_sleep_until(deadline_ns: float) -> None:
+    """sleep_until() that lets the loop run while it sleeps."""
+    coarse = deadline_ns - SPIN_NS - time_ns()
+    if coarse > 0:
+        await sleep(coarse * 1e-9)
+    await async_usleep((deadline_ns - time_ns()) * 1e-3)
+
+
 async def async_usleep(microseconds: float) -> None:
     # TODO do not use busy wait?
     end = time_ns() + (microseconds * 1e3)
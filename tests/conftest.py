@@ -0,0 +1,21 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
+
+
+class ListSender:
+    """Stands in for a sending socket, keeps a copy of every frame."""
+
+    def __init__(self: "ListSender") -> None:
+        self.frames: list[bytes] = []
+
+    def sendall(self: "ListSender", data: "ReadableBuffer", /) -> None:
+        self.frames.append(bytes(data))
+
+
+@pytest.fixture()
+def sender() -> ListSender:
+    return ListSender()
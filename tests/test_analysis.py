@@ -0,0 +1,56 @@
+from random import Random
+
+import pytest
+
+from pygoose.datatypes import Timestamp
+from pygoose.datatypes.time_stamp import NANOSECONDS
+
+np = pytest.importorskip("numpy")
+analysis = pytest.importorskip("pygoose.analysis")
+
+
+def _raw_timestamps(count: int) -> bytes:
+    rng = Random(61850)
+    qualities = (0x00, 0x87, 0xC7, 0x1F, 0xA0 | 24)
+    return b"".join(
+        rng.getrandbits(32).to_bytes(4, "big") + rng.getrandbits(24).to_bytes(3, "big") + bytes([rng.choice(qualities)])
+        for _ in range(count)
+    )
+
+
+class TestUnpackTimestamps:
+    def test_matches_scalar(self: "TestUnpackTimestamps") -> None:
+        raw = _raw_timestamps(500)
+        stamps = analysis.unpack_timestamps(raw)
+        for index in range(500):
+            scalar = Timestamp.unpack(raw[index * 8 : index * 8 + 8])
+            expected = scalar.second_since_epoch * NANOSECONDS + scalar.fraction_of_second
+            assert int(stamps.epoch_ns[index]) == expected
+            assert bool(stamps.leap_second_known[index]) is scalar.time_quality.leap_second_known
+            assert bool(stamps.clock_failure[index]) is scalar.time_quality.clock_failure
+            assert bool(stamps.clock_not_sync[index]) is scalar.time_quality.clock_not_sync
+            assert int(stamps.accuracy[index]) == scalar.time_quality.accuracy
+
+    def test_array_input(self: "TestUnpackTimestamps") -> None:
+        raw = _raw_timestamps(4)
+        stamps = analysis.unpack_timestamps(np.frombuffer(raw, np.uint8).reshape(4, 8))
+        assert (stamps.epoch_ns == analysis.unpack_timestamps(raw).epoch_ns).all()
+
+    def test_invalid_accuracy(self: "TestUnpackTimestamps") -> None:
+        stamps = analysis.unpack_timestamps(bytes(7) + b"\x19" + bytes(7) + b"\x1f")
+        assert stamps.invalid_accuracy.tolist() == [True, False]
+
+    def test_bad_size(self: "TestUnpackTimestamps") -> None:
+        with pytest.raises(ValueError, match="multiple of 8"):
+            analysis.unpack_timestamps(bytes(9))
+
+
+class TestUnpackUints:
+    def test_matches_int_from_bytes(self: "TestUnpackUints") -> None:
+        values = [b"\x01", b"\x01\x00", b"\xff\xff\xff\xff", b"\x00\x00\x07\xd0"]
+        result = analysis.unpack_uints(analysis.pack_fields(values, 4), 4)
+        assert result.tolist() == [int.from_bytes(value, "big") for value in values]
+
+    def test_too_wide(self: "TestUnpackUints") -> None:
+        with pytest.raises(ValueError, match="wider"):
+            analysis.pack_fields([b"\x01\x02\x03"], 2)
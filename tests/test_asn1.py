@@ -0,0 +1,71 @@
+import pytest
+
+from pygoose import asn1
+
+
+class TestLengthSize:
+    def test_short(self: "TestLengthSize") -> None:
+        assert asn1.length_size(0x7F) == 1
+
+    def test_one_byte(self: "TestLengthSize") -> None:
+        assert asn1.length_size(0x80) == 2
+        assert asn1.length_size(0xFF) == 2
+
+    def test_two_bytes(self: "TestLengthSize") -> None:
+        assert asn1.length_size(0xFFFF) == 3
+
+    def test_three_bytes(self: "TestLengthSize") -> None:
+        assert asn1.length_size(0xFFFFFF) == 4
+
+    def test_too_big(self: "TestLengthSize") -> None:
+        with pytest.raises(ValueError, match="too big"):
+            asn1.length_size(0x1000000)
+
+
+class TestEncoder:
+    def test_primitive(self: "TestEncoder") -> None:
+        encoder = asn1.Encoder(asn1.Primitive(0x80, b"abc"))
+        assert encoder.size == 5
+        assert encoder.encode() == b"\x80\x03abc"
+
+    def test_long_lengths(self: "TestEncoder") -> None:
+        for size, header in (
+            (0x7F, b"\x84\x7f"),
+            (0x80, b"\x84\x81\x80"),
+            (0x100, b"\x84\x82\x01\x00"),
+            (0x10000, b"\x84\x83\x01\x00\x00"),
+        ):
+            value = bytes(size)
+            assert asn1.Encoder(asn1.Primitive(0x84, value)).encode() == header + value
+            assert bytes(asn1.Triplet(0x84, value)) == header + value
+
+    def test_constructed(self: "TestEncoder") -> None:
+        all_data = asn1.Constructed(0xAB, (asn1.Primitive(0x83, b"\x00"),))
+        node = asn1.Constructed(0x61, (asn1.Primitive(0x80, b"a"), all_data))
+        inner = bytes(asn1.Triplet(0xAB, bytes(asn1.Triplet(0x83, b"\x00"))))
+        expected = bytes(asn1.Triplet(0x61, bytes(asn1.Triplet(0x80, b"a")) + inner))
+        assert asn1.Encoder(node).encode() == expected
+
+    def test_long_constructed(self: "TestEncoder") -> None:
+        children = tuple(asn1.Primitive(0x80, bytes(100)) for _ in range(3))
+        expected = bytes(asn1.Triplet(0x61, b"".join(bytes(asn1.Triplet(0x80, bytes(100))) for _ in range(3))))
+        assert asn1.Encoder(asn1.Constructed(0x61, children)).encode() == expected
+
+    def test_pack_into_offset(self: "TestEncoder") -> None:
+        encoder = asn1.Encoder(asn1.Primitive(0x80, b"a"), asn1.Primitive(0x81, b"b"))
+        buffer = bytearray(b"\xff" * (encoder.size + 2))
+        assert encoder.pack_into(buffer, 2) == len(buffer)
+        assert buffer == b"\xff\xff\x80\x01a\x81\x01b"
+
+
+class TestUnpackLengthFrom:
+    def test_short(self: "TestUnpackLengthFrom") -> None:
+        assert asn1.unpack_length_from(b"\x05", 0) == (5, 1)
+
+    def test_long(self: "TestUnpackLengthFrom") -> None:
+        assert asn1.unpack_length_from(b"\x00\x81\x80", 1) == (0x80, 3)
+        assert asn1.unpack_length_from(b"\x83\x01\x00\x00", 0) == (0x10000, 4)
+
+    def test_indefinite(self: "TestUnpackLengthFrom") -> None:
+        with pytest.raises(ValueError, match="Indefinite"):
+            asn1.unpack_length_from(b"\x80", 0)
@@ -0,0 +1,120 @@
+import pytest
+
+from pygoose.auth import EXTENSION_SIZE, AuthenticationError, KeyRing, Signer, Verifier
+from pygoose.goose import generate_goose, peek_header, unpack_goose
+from pygoose.pipeline import Pipeline, Publisher
+from pygoose.storm import StormGuard
+
+FRAME = bytes(next(generate_goose(1))[1])
+STREAM = peek_header(FRAME).key
+KEY = bytes(range(32))
+
+
+def _signed(frame: bytes = FRAME, keys: KeyRing | None = None) -> bytes:
+    return bytes(Signer(keys or KeyRing(KEY)).sign(bytearray(frame)))
+
+
+class TestSigner:
+    def test_extension(self: "TestSigner") -> None:
+        signed = _signed()
+        assert len(signed) == len(FRAME) + EXTENSION_SIZE
+        header = peek_header(signed)
+        assert header.length == len(signed) - 14
+        goose = unpack_goose(signed)
+        assert goose.reserved1 == EXTENSION_SIZE
+        assert goose.go_id == unpack_goose(FRAME).go_id
+
+    def test_tagged(self: "TestSigner") -> None:
+        frame = bytes(next(generate_goose(1, priority=4))[1])
+        signed = _signed(frame)
+        assert Verifier(KeyRing(KEY)).verify(peek_header(signed), signed)
+        assert unpack_goose(signed).tci == 4 << 13
+
+    def test_no_key(self: "TestSigner") -> None:
+        frame = bytearray(FRAME)
+        with pytest.raises(AuthenticationError, match="No key"):
+            Signer(KeyRing()).sign(frame)
+        assert frame == FRAME
+
+
+class TestVerifier:
+    def test_valid(self: "TestVerifier") -> None:
+        signed = _signed()
+        verifier = Verifier(KeyRing(KEY))
+        assert verifier.verify(peek_header(signed), signed)
+        assert verifier.verified == 1
+
+    def test_tampered(self: "TestVerifier") -> None:
+        signed = bytearray(_signed())
+        signed[40] ^= 1
+        verifier = Verifier(KeyRing(KEY))
+        assert not verifier.verify(peek_header(signed), bytes(signed))
+        assert verifier.rejected == 1
+        with pytest.raises(AuthenticationError, match="Wrong MAC"):
+            verifier.check(peek_header(signed), bytes(signed))
+
+    def test_addresses(self: "TestVerifier") -> None:
+        verifier = Verifier(KeyRing(KEY))
+        for offset in (0, 11):  # destination, source
+            signed = bytearray(_signed())
+            signed[offset] ^= 1
+            assert not verifier.verify(peek_header(signed), bytes(signed))
+        assert verifier.rejected == 2
+
+    def test_retagged(self: "TestVerifier") -> None:
+        signed = _signed()
+        retagged = signed[:12] + b"\x81\x00\xe0\x0a" + signed[12:]  # priority 7, VID 10
+        assert Verifier(KeyRing(KEY)).verify(peek_header(retagged), retagged)
+
+    def test_wrong_key(self: "TestVerifier") -> None:
+        keys = KeyRing()
+        keys.add(STREAM, KEY, key_id=7)
+        signed = _signed(keys=keys)
+        other = KeyRing()
+        other.add(STREAM, KEY, key_id=8)
+        assert Verifier(keys).verify(peek_header(signed), signed)
+        assert not Verifier(other).verify(peek_header(signed), signed)
+        assert not Verifier(KeyRing(bytes(32), default_id=7)).verify(peek_header(signed), signed)
+
+    def test_unsigned(self: "TestVerifier") -> None:
+        with pytest.raises(AuthenticationError, match="Missing"):
+            Verifier(KeyRing(KEY)).check(peek_header(FRAME), FRAME)
+
+    def test_trust_set(self: "TestVerifier") -> None:
+        verifier = Verifier(KeyRing(KEY), trusted=[STREAM + 1])
+        assert verifier.verify(peek_header(FRAME), FRAME)
+        assert verifier.skipped == 1
+        keys = KeyRing()
+        keys.add(STREAM + 1, KEY)
+        assert Verifier(keys).verify(peek_header(FRAME), FRAME)  # no key for this stream, not verified
+
+
+class TestPipeline:
+    def test_round_trip(self: "TestPipeline") -> None:
+        sent: list[bytes] = []
+
+        class _Sender:
+            def sendall(self: "_Sender", data: bytearray, /) -> None:
+                sent.append(bytes(data))
+
+        frames = list(generate_goose(3))
+        Publisher(signer=Signer(KeyRing(KEY))).run(_Sender(), iter(frames))  # type: ignore[arg-type]
+        seen: list[int] = []
+        pipeline = Pipeline(lambda goose, _: seen.append(goose.sq_num), verifier=Verifier(KeyRing(KEY)))
+        for frame in sent:
+            pipeline.handle(frame, None, 0)
+        pipeline.handle(FRAME, None, 0)
+        assert len(seen) == 3
+        assert pipeline.metrics.rejected == 1
+
+    def test_forged_flood(self: "TestPipeline") -> None:
+        seen: list[int] = []
+        pipeline = Pipeline(
+            lambda goose, _: seen.append(goose.sq_num), verifier=Verifier(KeyRing(KEY)), guard=StormGuard(1, 2),
+        )
+        for _ in range(10):
+            pipeline.handle(FRAME, None, 0)  # unsigned, same source
+        pipeline.handle(_signed(), None, 0)
+        assert seen == [unpack_goose(FRAME).sq_num]
+        assert pipeline.metrics.rejected == 10
+        assert pipeline.metrics.shed == 0
@@ -0,0 +1,48 @@
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+from pygoose import benchmark as b
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _result(name: str = "unpack_goose", ops: float = 1000.0, p99: int = 100) -> b.Result:
+    return b.Result(
+        name=name, iterations=10, ops_per_second=ops, peak_bytes_per_op=0, p50_ns=50, p90_ns=90, p99_ns=p99, max_ns=200,
+    )
+
+
+class TestMeasure:
+    def test_measure(self: "TestMeasure") -> None:
+        result = b.measure("noop", lambda: None, iterations=100, warmup=10)
+        assert result.iterations == 100
+        assert result.ops_per_second > 0
+        assert result.p50_ns <= result.p90_ns <= result.p99_ns <= result.max_ns
+
+    def test_peak_bytes(self: "TestMeasure") -> None:
+        assert b.measure("alloc", lambda: bytearray(100_000), iterations=10, warmup=0).peak_bytes_per_op >= 100_000
+
+    def test_sleep(self: "TestMeasure") -> None:
+        result = b.measure_sleep("usleep", 10, iterations=10)
+        assert result.timing is True
+        assert result.p50_ns >= 0
+
+
+class TestCompare:
+    def test_no_regression(self: "TestCompare") -> None:
+        assert b.compare({"a": _result("a")}, {"a": _result("a", ops=950.0, p99=105)}) == []
+
+    def test_throughput(self: "TestCompare") -> None:
+        assert len(b.compare({"a": _result("a")}, {"a": _result("a", ops=800.0)})) == 1
+
+    def test_p99(self: "TestCompare") -> None:
+        assert len(b.compare({"a": _result("a")}, {"a": _result("a", p99=200)}, threshold=0.5)) == 1
+
+    def test_timing_ignores_throughput(self: "TestCompare") -> None:
+        before = replace(_result("a"), timing=True)
+        assert b.compare({"a": before}, {"a": replace(before, ops_per_second=1.0)}) == []
+
+    def test_save_load(self: "TestCompare", tmp_path: "Path") -> None:
+        b.save([_result("a"), _result("b")], tmp_path / "results.json")
+        assert b.load(tmp_path / "results.json") == {"a": _result("a"), "b": _result("b")}
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from pygoose.cli import publisher_parser, subscriber_parser
+
+
+class TestPublisherParser:
+    def test_defaults(self: "TestPublisherParser") -> None:
+        args = publisher_parser("pub").parse_args(["lo", "0"])
+        assert (args.interface, args.sleep_until) == ("lo", 0)
+        assert args.priority is args.vid is args.key is args.realtime is None
+
+    def test_options(self: "TestPublisherParser") -> None:
+        args = publisher_parser("pub").parse_args(["lo", "5", "--priority", "4", "--vid", "10", "--key", "00ff"])
+        assert (args.priority, args.vid, args.key) == (4, 10, b"\x00\xff")
+
+
+class TestSubscriberParser:
+    def test_key_alone(self: "TestSubscriberParser") -> None:
+        args = subscriber_parser("sub").parse_args(["lo", "--key", "0102"])
+        assert args.key == b"\x01\x02"
+        assert args.record is args.filter is args.table is args.events is args.metrics_port is None
+
+    def test_options(self: "TestSubscriberParser") -> None:
+        args = subscriber_parser("sub").parse_args(
+            ["lo", "--record", "out.pcap", "--filter", "test == false", "--metrics-port", "9464"],
+        )
+        assert args.record == Path("out.pcap")
+        assert callable(args.filter)
+        assert args.metrics_port == 9464
+        assert not args.hardware_timestamps
+        assert subscriber_parser("sub").parse_args(["lo", "--hardware-timestamps"]).hardware_timestamps
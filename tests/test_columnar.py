@@ -0,0 +1,45 @@
+from typing import TYPE_CHECKING
+
+from pygoose import columnar, pcap
+from pygoose.datatypes.time_stamp import NANOSECONDS
+from pygoose.goose import generate_goose, unpack_goose
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestDecodeCapture:
+    def test_matches_unpack_goose(self: "TestDecodeCapture", tmp_path: "Path") -> None:
+        frames = [bytes(frame) for _, frame in generate_goose(12)]
+        with pcap.Recorder(tmp_path / "capture.pcap") as recorder:
+            for index, frame in enumerate(frames):
+                recorder.record(index, frame)
+                if index == 3:
+                    recorder.record(100, frame[:30])
+        table = columnar.decode_capture(tmp_path / "capture.pcap", tmp_path / "table", chunk_size=5)
+
+        assert table.rows == len(frames)
+        assert [error["frame"] for error in table.errors] == [4]
+        for row, frame in enumerate(frames):
+            goose = unpack_goose(frame)
+            assert int(table.columns["mac_src"][row]) == int.from_bytes(goose.mac_src, "big")
+            assert int(table.columns["app_id"][row]) == goose.app_id
+            assert table.string("go_id", row) == goose.go_id
+            assert table.string("gocb_ref", row) == goose.gocb_ref
+            assert int(table.columns["ttl"][row]) == goose.ttl
+            assert int(table.columns["st_num"][row]) == goose.st_num
+            assert int(table.columns["sq_num"][row]) == goose.sq_num
+            assert bool(table.columns["trip"][row]) is goose.trip
+            timestamp = goose.timestamp.second_since_epoch * NANOSECONDS + goose.timestamp.fraction_of_second
+            assert int(table.columns["timestamp_ns"][row]) == timestamp
+            assert int(table.columns["time_quality"][row]) == int(goose.timestamp.time_quality)
+
+    def test_reload(self: "TestDecodeCapture", tmp_path: "Path") -> None:
+        with pcap.Recorder(tmp_path / "capture.pcap") as recorder:
+            for index, (_, frame) in enumerate(generate_goose(3)):
+                recorder.record(index, bytes(frame))
+        columnar.decode_capture(tmp_path / "capture.pcap", tmp_path / "table")
+        table = columnar.load(tmp_path / "table")
+        assert table.rows == 3
+        assert list(table.columns["received_ns"]) == [0, 1, 2]
+        assert table.strings == ["SEL_421_SubCFG/LLN0$GO$PIOC", "SEL_421_SubCFG/LLN0$PIOC", "SEL_421_Sub"]
@@ -0,0 +1,49 @@
+import decimal as dec
+
+import pygoose.datatypes.time_stamp as ts
+from pygoose import utils as u
+from pygoose.datatypes import TimeQuality
+
+
+class TestPackNanoseconds:
+    def test_zero(self: "TestPackNanoseconds") -> None:
+        assert ts.pack_nanoseconds(0, 0x87) == b"\x00\x00\x00\x00\x00\x00\x00\x87"
+
+    def test_half_second(self: "TestPackNanoseconds") -> None:
+        assert ts.pack_nanoseconds(1_500_000_000, 0x87) == b"\x00\x00\x00\x01\x80\x00\x00\x87"
+
+    def test_max_fraction(self: "TestPackNanoseconds") -> None:
+        assert ts.pack_nanoseconds(999_999_999, 0) == b"\x00\x00\x00\x00\xff\xff\xff\x00"
+
+    def test_matches_fraction_of_seconds(self: "TestPackNanoseconds") -> None:
+        for nanoseconds in (1, 58_868_706, 117_737_472, 470_950_067, 999_999_940):
+            fos = ts.FractionOfSeconds(dec.Decimal(nanoseconds) / dec.Decimal(ts.NANOSECONDS))
+            assert ts.pack_nanoseconds(nanoseconds, 0)[4:7] == bytes(fos)
+
+    def test_into(self: "TestPackNanoseconds") -> None:
+        buffer = bytearray(10)
+        ts.pack_nanoseconds_into(buffer, 2, 1_500_000_000, 0x87)
+        assert buffer == b"\x00\x00" + ts.pack_nanoseconds(1_500_000_000, 0x87)
+
+    def test_round_trip(self: "TestPackNanoseconds") -> None:
+        nanoseconds = 1_700_000_000_123_456_789
+        timestamp = ts.Timestamp.unpack(ts.pack_nanoseconds(nanoseconds, 0x87))
+        assert timestamp.second_since_epoch == 1_700_000_000
+        assert 0 <= 123_456_789 - timestamp.fraction_of_second < 60
+        assert timestamp.time_quality == TimeQuality.default()
+
+
+class TestNow:
+    def test_quality_cached(self: "TestNow") -> None:
+        quality = TimeQuality.default(accuracy=10)
+        assert u.quality_byte(quality) == int(quality)
+        assert u.quality_byte() == int(TimeQuality.default())
+
+    def test_now_into(self: "TestNow") -> None:
+        buffer = bytearray(8)
+        nanoseconds = u.now_into(buffer, 0)
+        assert buffer == ts.pack_nanoseconds(nanoseconds, int(TimeQuality.default()))
+
+    def test_now_triplet(self: "TestNow") -> None:
+        triplet = u.now()
+        assert bytes(triplet)[:2] == b"\x84\x08"
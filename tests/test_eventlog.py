@@ -0,0 +1,110 @@
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pygoose import eventlog
+from pygoose.goose import generate_goose, unpack_goose
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pygoose.goose import GOOSE
+
+MS = eventlog.MILLISECONDS
+FRAMES = [bytes(frame) for _, frame in generate_goose(12)]
+BASE = unpack_goose(FRAMES[0])
+
+
+def _goose(app_id: int, st_num: int, sq_num: int) -> "GOOSE":
+    return replace(BASE, app_id=app_id, st_num=st_num, sq_num=sq_num)
+
+
+class TestEventLog:
+    def test_only_changes(self: "TestEventLog", tmp_path: "Path") -> None:
+        with eventlog.EventLog(tmp_path) as log:
+            for index, frame in enumerate(FRAMES):
+                log.sink(index * MS, frame, unpack_goose(frame))
+        events = list(eventlog.query(tmp_path, 0, 100 * MS))
+        assert [(event.kind, event.st_num, event.received_ns) for event in events] == [
+            (eventlog.FIRST, 1, 0), (eventlog.CHANGE, 2, 4 * MS), (eventlog.CHANGE, 3, 8 * MS),
+        ]
+        assert events[1].values == b"\x83\x01\x0f"
+
+    def test_sink_looks_up_events_only(self: "TestEventLog", tmp_path: "Path", monkeypatch: pytest.MonkeyPatch) -> None:
+        lookups: list[int] = []
+
+        def find_field(_data: bytes, tag: int) -> tuple[int, int]:
+            lookups.append(tag)
+            return 0, 0
+
+        monkeypatch.setattr(eventlog, "find_field", find_field)
+        with eventlog.EventLog(tmp_path) as log:
+            for index, frame in enumerate(FRAMES):
+                log.sink(index * MS, frame, unpack_goose(frame))
+        assert lookups == [eventlog.ALL_DATA_TAG] * 3  # first frame and two stNum changes, not the heartbeats
+
+    def test_max_streams(self: "TestEventLog", tmp_path: "Path") -> None:
+        with eventlog.EventLog(tmp_path, max_streams=2) as log:
+            for app_id in (1, 2, 3, 1, 4):
+                log.record(_goose(app_id, 1, 0), 0)
+        assert sorted(log.streams) == [_goose(1, 1, 0).key, _goose(2, 1, 0).key]
+        assert log.untracked == 2
+        assert log.recorded == 2
+
+    def test_expired_restart(self: "TestEventLog", tmp_path: "Path") -> None:
+        with eventlog.EventLog(tmp_path) as log:
+            log.record(_goose(1, 5, 0), 0)
+            log.record(_goose(1, 5, 1), 1000 * MS)
+            log.record(_goose(2, 1, 0), 5000 * MS)  # stream 1 expired at 3000 ms
+            log.record(_goose(1, 5, 2), 6000 * MS)
+            log.record(_goose(1, 1, 0), 7000 * MS)
+        kinds = [(event.key & 0xFFFF, event.kind, event.received_ns) for event in eventlog.query(tmp_path, 0, 10**12)]
+        assert kinds == [
+            (1, eventlog.FIRST, 0),
+            (1, eventlog.EXPIRED, 3000 * MS),
+            (2, eventlog.FIRST, 5000 * MS),
+            (1, eventlog.RESUMED, 6000 * MS),
+            (1, eventlog.RESTART, 7000 * MS),
+        ]
+
+    def test_rollover_and_index(self: "TestEventLog", tmp_path: "Path") -> None:
+        with eventlog.EventLog(tmp_path, segment_records=100) as log:
+            for index in range(1000):
+                log.record(_goose(index % 4, index // 4 + 1, 0), index * MS)
+        assert len(eventlog.segments(tmp_path)) == 10
+        found = list(eventlog.query(tmp_path, 250 * MS, 260 * MS))
+        assert [event.received_ns // MS for event in found] == list(range(250, 261))
+        found = list(eventlog.query(tmp_path, 250 * MS, 350 * MS, keys=[_goose(3, 1, 0).key]))
+        assert [event.received_ns // MS for event in found] == list(range(251, 351, 4))
+
+    def test_active_segment(self: "TestEventLog", tmp_path: "Path") -> None:
+        log = eventlog.EventLog(tmp_path, segment_records=10)
+        for index in range(15):
+            log.record(_goose(0, index + 1, 0), index * MS)
+        assert len(list(eventlog.query(tmp_path, 0, 20 * MS))) == 15
+        assert len(list(eventlog.query(tmp_path, 0, 20 * MS, active=False))) == 10
+        log.record(_goose(0, 100, 0), 16 * MS)
+        assert len(list(eventlog.query(tmp_path, 0, 20 * MS))) == 16
+        log.close()
+
+    def test_compact(self: "TestEventLog", tmp_path: "Path") -> None:
+        with eventlog.EventLog(tmp_path, segment_records=10) as log:
+            for index in range(40):
+                log.record(_goose(index % 2, index // 2 + 1, 0), index * MS)
+        compacted = eventlog.compact(tmp_path, 25 * MS)
+        assert compacted is not None
+        assert compacted.name == "events_000000.seg"
+        assert len(eventlog.segments(tmp_path)) == 3
+        found = list(eventlog.query(tmp_path, 0, 40 * MS))
+        assert [event.received_ns // MS for event in found] == [18, 19, *range(20, 40)]
+        assert eventlog.compact(tmp_path, 0) is None
+        with eventlog.EventLog(tmp_path) as log:
+            log.record(_goose(5, 1, 0), 50 * MS)
+        assert eventlog.segments(tmp_path)[-1].name == "events_000004.seg"
+
+    def test_format(self: "TestEventLog", tmp_path: "Path") -> None:
+        path = tmp_path / "events_000000.seg"
+        path.write_bytes(bytes(128))
+        with pytest.raises(eventlog.SegmentFormatError):
+            eventlog.SegmentReader(path)
@@ -0,0 +1,98 @@
+import pytest
+
+from pygoose import filters
+from pygoose.goose import generate_goose, unpack_goose
+from pygoose.pipeline import Pipeline
+
+FRAMES = [bytes(frame) for _, frame in generate_goose(12)]
+
+
+class TestParse:
+    def test_precedence(self: "TestParse") -> None:
+        assert filters.parse('go_id == "X" or st_num > 1 and not test == false') == (
+            "or",
+            ("compare", "go_id", "==", "X"),
+            ("and", ("compare", "st_num", ">", 1), ("not", ("compare", "test", "==", False))),
+        )
+
+    def test_literals(self: "TestParse") -> None:
+        assert filters.parse("app_id == 0x3001") == ("compare", "app_id", "==", 0x3001)
+        assert filters.parse("mac_src == '00:30:a7:22:9d:01'")[3] == b"\x00\x30\xa7\x22\x9d\x01"
+        assert filters.parse("(st_num changed)") == ("changed", "st_num")
+
+    @pytest.mark.parametrize(
+        "text", ["", "go_id", "go_id == 1", "st_num == 'a'", "test == 1", "foo == 1", "(st_num changed", "st_num ~ 1"],
+    )
+    def test_errors(self: "TestParse", text: str) -> None:
+        with pytest.raises(filters.FilterError):
+            filters.parse(text)
+
+
+class TestLazyGoose:
+    def test_matches_unpack_goose(self: "TestLazyGoose") -> None:
+        goose = unpack_goose(FRAMES[5])
+        view = filters.LazyGoose(FRAMES[5])
+        for name in ("mac_dest", "app_id", "goose_length", "gocb_ref", "ttl", "go_id", "st_num", "sq_num", "trip"):
+            assert view.get(name) == getattr(goose, name)
+        assert view.key == goose.key
+
+    def test_tagged(self: "TestLazyGoose") -> None:
+        frame = bytes(list(generate_goose(6, vid=10))[5][1])
+        goose = unpack_goose(FRAMES[5])
+        view = filters.LazyGoose(frame)
+        for name in ("mac_dest", "app_id", "goose_length", "go_id", "st_num", "trip"):
+            assert view.get(name) == getattr(goose, name)
+        assert view.key == goose.key
+
+    def test_only_header(self: "TestLazyGoose") -> None:
+        view = filters.LazyGoose(FRAMES[0][:22])
+        assert view.get("app_id") == 0
+        with pytest.raises(IndexError):
+            view.get("go_id")
+
+
+class TestFilterSet:
+    def test_match(self: "TestFilterSet") -> None:
+        filter_set = filters.FilterSet()
+        tripped = filter_set.add("trip == true")
+        status = filter_set.add("st_num changed and test == false")
+        other = filter_set.add('go_id == "other" or st_num >= 3')
+        matched = [filter_set.match(frame) for frame in FRAMES]
+        assert [tripped in found for found in matched] == [unpack_goose(frame).trip for frame in FRAMES]
+        assert [index for index, found in enumerate(matched) if status in found] == [0, 4, 8]
+        assert [index for index, found in enumerate(matched) if other in found] == [8, 9, 10, 11]
+
+    def test_shared(self: "TestFilterSet") -> None:
+        filter_set = filters.FilterSet()
+        for index in range(300):
+            filter_set.add(f'go_id == "IED_{index}" and st_num changed')
+        filter_set.add('go_id == "SEL_421_Sub" and st_num changed')
+        assert len(filter_set) == 301
+        assert len(filter_set._nodes) == 301 * 2 + 1  # noqa: SLF001
+        assert filter_set.match(FRAMES[0]) == [300]
+        assert filter_set.match(FRAMES[1]) == []
+
+    def test_max_streams(self: "TestFilterSet") -> None:
+        filter_set = filters.FilterSet(max_streams=1)
+        filter_set.add("st_num changed")
+        other = bytearray(FRAMES[1])
+        other[6:12] = b"\x02" * 6
+        assert filter_set(FRAMES[0])
+        assert not filter_set(FRAMES[1])
+        assert filter_set(bytes(other))  # untracked stream, every frame counts as changed
+        assert filter_set(bytes(other))
+        assert filter_set.untracked == 2
+
+    def test_bytearray(self: "TestFilterSet") -> None:
+        frame = bytearray(FRAMES[0])
+        assert filters.compile_filter('go_id == "SEL_421_Sub" and data_set != "x"')(frame)
+        assert filters.LazyGoose(frame).get("gocb_ref") == "SEL_421_SubCFG/LLN0$GO$PIOC"
+
+    def test_pipeline(self: "TestFilterSet") -> None:
+        seen: list[int] = []
+        predicate = filters.compile_filter("st_num changed")
+        pipeline = Pipeline(lambda goose, _: seen.append(goose.st_num), predicate=predicate)
+        for frame in FRAMES:
+            pipeline.handle(frame, None, 0)
+        assert seen == [1, 2, 3]
+        assert pipeline.metrics.filtered == len(FRAMES) - 3
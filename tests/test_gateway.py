@@ -0,0 +1,67 @@
+import pytest
+
+from pygoose.gateway import Gateway, Route
+from pygoose.goose import VLAN_ETHER, generate_goose, unpack_goose
+from pygoose.utils import mac2bytes
+
+SOURCE = mac2bytes("00:30:a7:22:9d:01")
+FRAME = bytes(next(generate_goose(1))[1])
+
+
+def _forward(gateway: Gateway, frame: bytes = FRAME) -> bytes:
+    buffer = bytearray(1600)
+    buffer[: len(frame)] = frame
+    size = gateway.forward(buffer, len(frame))
+    return bytes(buffer[:size])
+
+
+class TestRoute:
+    def test_from_dict(self: "TestRoute") -> None:
+        route = Route.from_dict({"app_id": "0x0000", "src_addr": "00:30:a7:22:9d:01", "set_vid": 10})
+        assert route == Route(app_id=0, src_addr=SOURCE, set_vid=10)
+
+    def test_vlan_range(self: "TestRoute") -> None:
+        with pytest.raises(ValueError, match="VLAN ID 4096"):
+            Route(set_vid=4096)
+        with pytest.raises(ValueError, match="priority 8"):
+            Route.from_dict({"set_priority": 8})
+
+
+class TestGateway:
+    def test_lookup_order(self: "TestGateway") -> None:
+        exact, app_id = Route(app_id=0, src_addr=SOURCE, set_app_id=1), Route(app_id=5, set_app_id=2)
+        source, default = Route(src_addr=SOURCE, set_app_id=3), Route()
+        gateway = Gateway([exact, app_id, source, default])
+        assert gateway.lookup(SOURCE, 0) is exact
+        assert gateway.lookup(SOURCE, 5) is app_id
+        assert gateway.lookup(SOURCE, 7) is source
+        assert gateway.lookup(bytes(6), 7) is default
+        assert Gateway([exact]).lookup(bytes(6), 0) is None
+
+    def test_drop(self: "TestGateway") -> None:
+        gateway = Gateway([Route(app_id=1)])
+        assert _forward(gateway) == b""
+        other = bytearray(FRAME)
+        other[12:14] = b"\x08\x00"
+        assert _forward(Gateway([Route()]), bytes(other)) == b""
+        assert gateway.dropped == 1
+
+    def test_rewrite(self: "TestGateway") -> None:
+        dst = mac2bytes("01:0c:cd:01:00:99")
+        gateway = Gateway([Route(app_id=0, set_dst_addr=dst, set_src_addr=bytes(6), set_app_id=0x3001)])
+        goose = unpack_goose(_forward(gateway))
+        assert (goose.mac_dest, goose.mac_src, goose.app_id) == (dst, bytes(6), 0x3001)
+        assert goose.go_id == "SEL_421_Sub"
+        assert gateway.forwarded == 1
+
+    def test_vlan(self: "TestGateway") -> None:
+        tagged = _forward(Gateway([Route(set_vid=10, set_app_id=0x3001)]))
+        assert len(tagged) == len(FRAME) + 4
+        assert tagged[12:18] == VLAN_ETHER.to_bytes(2, "big") + b"\x80\x0a\x88\xb8"
+        assert tagged[18:20] == b"\x30\x01"
+        assert tagged[20:] == FRAME[16:]
+
+        retagged = _forward(Gateway([Route(set_vid=20, set_priority=6)]), tagged)
+        assert retagged[14:16] == b"\xc0\x14"
+        assert retagged[18:20] == b"\x30\x01"
+        assert len(retagged) == len(tagged)
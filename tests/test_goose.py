@@ -0,0 +1,146 @@
+import pytest
+
+from pygoose import goose as g
+from pygoose import utils as u
+from pygoose.asn1 import Constructed, Primitive
+
+
+def _frame(go_id: bytes = b"SEL_421_Sub", priority: int | None = None, vid: int | None = None) -> bytearray:
+    pdu = Constructed(
+        0x61,
+        (
+            Primitive(0x80, b"SEL_421_SubCFG/LLN0$GO$PIOC"),
+            Primitive(0x81, u.u32_bytes(2000)),
+            Primitive(0x82, b"SEL_421_SubCFG/LLN0$PIOC"),
+            Primitive(0x83, go_id),
+            Primitive(0x84, b"\x00\x00\x00\x01\x80\x00\x00\x87"),
+            Primitive(0x85, b"\x02"),
+            Primitive(0x86, b"\x03"),
+            Primitive(0x87, b"\x00"),
+            Primitive(0x88, b"\x01"),
+            Primitive(0x89, b"\x00"),
+            Primitive(0x8A, b"\x01"),
+            Constructed(0xAB, (Primitive(0x83, b"\x0f"),)),
+        ),
+    )
+    return g.pack_frame(
+        u.mac2bytes("01:0c:cd:01:00:01"), u.mac2bytes("00:30:a7:22:9d:01"), 0x3001, pdu, priority=priority, vid=vid,
+    )
+
+
+class TestUnpackGoose:
+    def test_header_is_raw(self: "TestUnpackGoose") -> None:
+        goose = g.unpack_goose(bytes(_frame()))
+        assert goose.mac_dest == b"\x01\x0c\xcd\x01\x00\x01"
+        assert goose.mac_src == b"\x00\x30\xa7\x22\x9d\x01"
+        assert goose.ether == g.GOOSE_ETHER
+        assert goose.app_id == 0x3001
+        assert goose.reserved1 == goose.reserved2 == 0
+
+    def test_pdu(self: "TestUnpackGoose") -> None:
+        goose = g.unpack_goose(bytes(_frame()))
+        assert goose.gocb_ref == "SEL_421_SubCFG/LLN0$GO$PIOC"
+        assert goose.ttl == 2000
+        assert goose.go_id == "SEL_421_Sub"
+        assert goose.timestamp.second_since_epoch == 1
+        assert goose.st_num == 2
+        assert goose.sq_num == 3
+        assert goose.trip is True
+
+    def test_long_pdu(self: "TestUnpackGoose") -> None:
+        go_id = b"x" * 200
+        goose = g.unpack_goose(bytes(_frame(go_id)))
+        assert goose.go_id == go_id.decode()
+        assert goose.trip is True
+
+    def test_key(self: "TestUnpackGoose") -> None:
+        goose = g.unpack_goose(bytes(_frame()))
+        assert goose.key == 0x0030A7229D01_3001
+
+    def test_tagged(self: "TestUnpackGoose") -> None:
+        frame = bytes(_frame(priority=6, vid=10))
+        assert frame[12:16] == b"\x81\x00\xc0\x0a"
+        goose = g.unpack_goose(frame)
+        assert goose.tci == 6 << 13 | 10
+        assert goose.ether == g.GOOSE_ETHER
+        assert goose.goose_length == len(frame) - 18
+        untagged = g.unpack_goose(bytes(_frame()))
+        assert untagged.tci is None
+        assert (goose.key, goose.go_id, goose.st_num, goose.trip) == (untagged.key, untagged.go_id, 2, True)
+
+    def test_priority_tagged(self: "TestUnpackGoose") -> None:
+        assert g.unpack_goose(bytes(_frame(vid=0))).tci == g.DEFAULT_PRIORITY << 13
+        assert g.unpack_goose(bytes(_frame(priority=7))).tci == 7 << 13
+
+    def test_bytearray(self: "TestUnpackGoose") -> None:
+        frame = next(g.generate_goose(1))[1]
+        assert g.unpack_goose(frame) == g.unpack_goose(bytes(frame))
+
+    def test_vlan_range(self: "TestUnpackGoose") -> None:
+        assert g.unpack_goose(bytes(_frame(priority=7, vid=4095))).tci == 7 << 13 | 4095
+        with pytest.raises(ValueError, match="VLAN ID 5000"):
+            _frame(vid=5000)
+        with pytest.raises(ValueError, match="priority 8"):
+            _frame(priority=8)
+        with pytest.raises(ValueError, match="priority -1"):
+            _frame(priority=-1)
+
+    def test_tagged_truncated(self: "TestUnpackGoose") -> None:
+        with pytest.raises(ValueError, match="missing"):
+            g.unpack_goose(bytes(_frame(priority=4))[:-1])
+
+    def test_generated(self: "TestUnpackGoose") -> None:
+        frames = [frame for _, frame in g.generate_goose(12)]
+        assert [g.unpack_goose(bytes(frame)).st_num for frame in frames] == [1] * 4 + [2] * 4 + [3] * 4
+
+
+class TestIdentity:
+    def test_same_object(self: "TestIdentity") -> None:
+        first = g.unpack_goose(bytes(_frame()))
+        second = g.unpack_goose(bytes(_frame()))
+        assert first.go_id is second.go_id
+        assert first.gocb_ref is second.gocb_ref
+        assert first.data_set is second.data_set
+
+    def test_bounded(self: "TestIdentity") -> None:
+        for index in range(g.IDENTITY_CACHE_SIZE + 10):
+            g.identity(b"spoofed %d" % index)
+        assert g.identity.cache_info().currsize == g.IDENTITY_CACHE_SIZE
+
+
+class TestFindField:
+    def test_timestamp(self: "TestFindField") -> None:
+        frame = _frame()
+        offset, length = g.find_field(frame, g.TIMESTAMP_TAG)
+        assert frame[offset : offset + length] == b"\x00\x00\x00\x01\x80\x00\x00\x87"
+
+    def test_tagged(self: "TestFindField") -> None:
+        frame = _frame(priority=4)
+        offset, length = g.find_field(frame, g.TIMESTAMP_TAG)
+        assert frame[offset : offset + length] == b"\x00\x00\x00\x01\x80\x00\x00\x87"
+
+    def test_missing(self: "TestFindField") -> None:
+        with pytest.raises(ValueError, match="0x8b"):
+            g.find_field(_frame(), 0x8B)
+
+
+class TestPeekHeader:
+    def test_peek(self: "TestPeekHeader") -> None:
+        header = g.peek_header(_frame())
+        assert header.ether == g.GOOSE_ETHER
+        assert header.app_id == 0x3001
+        assert header.pdu_offset == g.HEADER_SIZE
+        assert header.key == g.unpack_goose(bytes(_frame())).key
+
+    def test_tagged(self: "TestPeekHeader") -> None:
+        header = g.peek_header(_frame(priority=5, vid=100))
+        assert header.ether == g.GOOSE_ETHER
+        assert header.app_id == 0x3001
+        assert header.pdu_offset == g.TAGGED_HEADER_SIZE
+        assert header.tci == 5 << 13 | 100
+        assert header.key == g.peek_header(_frame()).key
+        assert g.peek_header(_frame()).tci is None
+
+    def test_short(self: "TestPeekHeader") -> None:
+        with pytest.raises(ValueError, match="missing"):
+            g.peek_header(b"\x00" * 10)
@@ -0,0 +1,42 @@
+import pytest
+
+from pygoose.histogram import Histogram
+
+
+class TestHistogram:
+    def test_empty(self: "TestHistogram") -> None:
+        histogram = Histogram()
+        assert histogram.percentile(99) == 0
+        assert histogram.mean == 0.0
+
+    def test_exact_below_precision(self: "TestHistogram") -> None:
+        histogram = Histogram()
+        for value in range(100):
+            histogram.record(value)
+        assert histogram.percentile(50) == 49
+        assert histogram.min == 0
+        assert histogram.max == 99
+
+    @pytest.mark.parametrize("value", [128, 1_000, 65_537, 3_000_000, 10**12])
+    def test_relative_error(self: "TestHistogram", value: int) -> None:
+        histogram = Histogram()
+        histogram.record(value)
+        histogram.record(value * 2)
+        assert 0 <= value - histogram.percentile(50) <= value / 64
+
+    def test_negative(self: "TestHistogram") -> None:
+        histogram = Histogram()
+        histogram.record(-5)
+        assert histogram.negative == 1
+        assert histogram.count == 0
+
+    def test_merge(self: "TestHistogram") -> None:
+        first, second = Histogram(), Histogram()
+        for value in range(1_000):
+            first.record(value)
+            second.record(value + 1_000_000)
+        first.merge(second)
+        assert first.count == 2_000
+        assert first.max == 1_000_999
+        assert first.percentile(25) <= 500 <= first.percentile(26)
+        assert first.percentile(99) >= 1_000_000 * 63 / 64
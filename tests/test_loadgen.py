@@ -0,0 +1,113 @@
+from os import getpid
+from threading import Event, Thread
+from time import time_ns
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pygoose import loadgen
+from pygoose.goose import unpack_goose
+from pygoose.transport import open_receiver
+
+if TYPE_CHECKING:
+    from socket import socket
+
+    from tests.conftest import ListSender
+
+
+SCENARIO = {
+    "ieds": [
+        {"count": 3, "name": "BAY", "src_addr": "00:30:a7:00:01:00", "app_id": "0x3000", "heartbeat_ms": 20},
+        {"count": 1, "name": "BUS", "entries": 2, "heartbeat_ms": 40},
+    ],
+    "storms": [{"at": 0.05, "fraction": 0.5}],
+    "duration": 0.1,
+    "workers": 2,
+}
+
+
+class TestScenario:
+    def test_from_dict(self: "TestScenario") -> None:
+        scenario = loadgen.Scenario.from_dict(SCENARIO)
+        assert scenario.total == 4
+        assert scenario.ieds[0].src_addr == b"\x00\x30\xa7\x00\x01\x00"
+        assert scenario.ieds[0].app_id == 0x3000
+        assert scenario.target_rate == 3 * 50 + 25
+        assert [at for at, _ in scenario.storm_times()] == [0.05]
+
+    def test_rate_scales_heartbeats(self: "TestScenario") -> None:
+        scenario = loadgen.Scenario.from_dict({**SCENARIO, "rate": 350})
+        assert abs(scenario.target_rate - 350) < 1e-6
+        assert abs(scenario.heartbeat_scale - 0.5) < 1e-9
+
+    def test_overlapping_groups(self: "TestScenario") -> None:
+        with pytest.raises(ValueError, match="BUS0001 has the same source MAC and APPID as BAY0001"):
+            loadgen.Scenario.from_dict({"ieds": [{"count": 2, "name": "BAY"}, {"name": "BUS"}]})
+        loadgen.Scenario.from_dict({"ieds": [{"count": 2, "name": "BAY"}, {"name": "BUS", "app_id": 2}]})
+
+    def test_storm_fraction(self: "TestScenario") -> None:
+        storm = loadgen.Storm(at=0, fraction=0.25)
+        assert [index for index in range(8) if storm.includes(index)] == [3, 7]
+
+
+class TestVirtualIed:
+    def test_retransmissions(self: "TestVirtualIed") -> None:
+        ied = loadgen.VirtualIed(loadgen.IedGroup(name="BAY", heartbeat_ms=16, first_ms=2), 7)
+        frame, gap = ied.next()
+        goose = unpack_goose(bytes(frame))
+        assert (goose.go_id, goose.data_set) == ("BAY0007", "BAY0007CFG/LLN0$DS01")
+        assert goose.mac_src == b"\x00\x30\xa7\x00\x00\x07"
+        assert goose.app_id == 7
+        assert (goose.st_num, goose.sq_num, goose.ttl, goose.trip) == (1, 0, 32, False)
+        assert gap == 16_000_000
+        ied.change(1_700_000_000_000_000_000)
+        gaps = []
+        for _ in range(5):
+            frame, gap = ied.next()
+            gaps.append(gap // 1_000_000)
+        goose = unpack_goose(bytes(frame))
+        assert gaps == [2, 4, 8, 16, 16]
+        assert (goose.st_num, goose.sq_num, goose.trip) == (2, 4, True)
+        assert goose.timestamp.second_since_epoch == 1_700_000_000
+
+
+class TestGenerate:
+    def test_schedule(self: "TestGenerate", sender: "ListSender") -> None:
+        scenario = loadgen.Scenario.from_dict(SCENARIO)
+        origin = time_ns()
+        ieds, phases, storms = loadgen.plan(scenario, 0, 1, origin)
+        assert [len(members) for _, members in storms] == [2]
+        report = loadgen.generate(sender, ieds, phases, storms, origin + 100_000_000)
+        assert report.frames == len(sender.frames)
+        assert report.changes == 2
+        assert report.lateness.count == report.frames
+        decoded = [unpack_goose(frame) for frame in sender.frames]
+        bus = [goose for goose in decoded if goose.go_id == "BUS0001"]
+        assert len(bus) == 6  # heartbeat at 30 ms, then the storm at 50 ms and retransmissions at 52, 56, 64 and 80 ms
+        assert {goose.go_id for goose in decoded if goose.st_num == 2} == {"BAY0002", "BUS0001"}
+
+    def test_run(self: "TestGenerate") -> None:
+        interface = f"loopback:loadgen-{getpid()}"
+        received: list[bytes] = []
+        done = Event()
+
+        def drain(receiver: "socket") -> None:  # a named loopback only queues net.unix.max_dgram_qlen frames
+            while True:
+                try:
+                    received.append(receiver.recv(1518))
+                except TimeoutError:
+                    if done.is_set():
+                        return
+
+        with open_receiver(interface) as receiver:
+            receiver.settimeout(0.05)
+            thread = Thread(target=drain, args=(receiver,))
+            thread.start()
+            report = loadgen.run(loadgen.Scenario.from_dict(SCENARIO), interface)
+            done.set()
+            thread.join()
+        assert report.workers == 2
+        assert report.frames == len(received)
+        assert report.changes == 2
+        assert report.achieved_rate <= report.scheduled_rate
+        assert report.lateness_ns["count"] == len(received)
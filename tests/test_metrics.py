@@ -0,0 +1,84 @@
+from socket import AF_INET, SOCK_DGRAM, socket
+from urllib.request import urlopen
+
+from pygoose import metrics
+from pygoose.goose import generate_goose
+from pygoose.pipeline import Pipeline
+
+
+def _frames() -> list[bytes]:
+    return [bytes(frame) for _, frame in generate_goose(3)]
+
+
+class TestMetrics:
+    def test_pipeline_counts(self: "TestMetrics") -> None:
+        pipeline = Pipeline()
+        frames = _frames()
+        for index, frame in enumerate(frames):
+            pipeline.handle(frame, None, index * 1_000_000)
+        pipeline.handle(frames[0][:30], None, 0)
+        other = bytearray(frames[0])
+        other[12:14] = b"\x08\x00"
+        pipeline.handle(bytes(other), None, 0)
+        pipeline.handle(b"\x00" * 10, None, 0)
+
+        snapshot = pipeline.metrics.snapshot()
+        assert snapshot["frames"] == 4
+        assert snapshot["filtered"] == 1
+        assert snapshot["decode_errors"] == {"ValueError": 2}
+        assert snapshot["bytes"] == sum(map(len, frames)) + 30
+        (stream,) = snapshot["streams"].values()
+        assert stream["frames"] == 4
+        assert snapshot["buffers"] == {}
+
+    def test_rate(self: "TestMetrics") -> None:
+        stream = metrics.StreamMetrics(0)
+        stream.frames = 11
+        stream.last_ns = 2_000_000_000
+        assert stream.rate == 5.0
+
+    def test_prometheus(self: "TestMetrics") -> None:
+        registry = metrics.Metrics()
+        registry.received(0x10002, 100, 0)
+        registry.decode_error(IndexError())
+        text = registry.prometheus()
+        assert "pygoose_frames_total 1\n" in text
+        assert 'pygoose_decode_errors_total{type="IndexError"} 1\n' in text
+        assert 'pygoose_stream_bytes_total{stream="0000000000010002"} 100\n' in text
+
+    def test_max_streams(self: "TestMetrics") -> None:
+        registry = metrics.Metrics(max_streams=2)
+        for key in (1, 2, 3, 1, 4):
+            registry.received(key, 100, 0)
+        snapshot = registry.snapshot()
+        assert snapshot["frames"] == 5
+        assert snapshot["bytes"] == 500
+        assert snapshot["untracked_frames"] == 2
+        assert snapshot["streams"]["0000000000000001"]["frames"] == 2
+        assert len(snapshot["streams"]) == 2
+        assert "pygoose_untracked_frames_total 2\n" in registry.prometheus()
+
+    def test_serve(self: "TestMetrics") -> None:
+        registry = metrics.Metrics()
+        registry.received(1, 60, 0)
+        server = metrics.serve(registry, port=0)
+        try:
+            with urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:  # noqa: S310
+                assert b"pygoose_bytes_total 60" in response.read()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestBuffers:
+    def test_tune(self: "TestBuffers") -> None:
+        with socket(AF_INET, SOCK_DGRAM) as nic:
+            sizes = metrics.tune_buffers(nic, receive=65536, send=32768)
+            assert sizes["rcvbuf"] >= 65536
+            assert sizes["sndbuf"] >= 32768
+
+    def test_closed_socket(self: "TestBuffers") -> None:
+        nic = socket(AF_INET, SOCK_DGRAM)
+        registry = metrics.Metrics(nic)
+        nic.close()
+        assert registry.snapshot()["kernel_drops"] == 0
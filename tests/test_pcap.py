@@ -0,0 +1,86 @@
+from struct import unpack_from
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pygoose import pcap
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FRAME = bytes(range(60))
+
+
+class TestRecords:
+    def test_pcap_header(self: "TestRecords") -> None:
+        magic, major, minor, _, _, _, linktype = unpack_from("=IHHiIII", pcap.pcap_header())
+        assert (magic, major, minor, linktype) == (pcap.PCAP_MAGIC_NS, 2, 4, pcap.LINKTYPE_ETHERNET)
+
+    def test_pcap_record(self: "TestRecords") -> None:
+        record = pcap.pcap_record(1_500_000_123, FRAME)
+        assert unpack_from("=IIII", record) == (1, 500_000_123, 60, 60)
+        assert record[16:] == FRAME
+
+    def test_pcapng_record_padded(self: "TestRecords") -> None:
+        record = pcap.pcapng_record(2**32 + 5, b"\x01\x02\x03")
+        block_type, length, _, high, low, captured, original = unpack_from("<IIIIIII", record)
+        assert (block_type, high, low, captured, original) == (pcap.PCAPNG_EPB, 1, 5, 3, 3)
+        assert length == len(record) == 36
+        assert unpack_from("<I", record, length - 4)[0] == length
+
+    def test_pcapng_header(self: "TestRecords") -> None:
+        header = pcap.pcapng_header()
+        assert unpack_from("<I", header)[0] == pcap.PCAPNG_SHB
+        shb_length = unpack_from("<I", header, 4)[0]
+        assert unpack_from("<I", header, shb_length)[0] == pcap.PCAPNG_IDB
+
+
+class TestRecorder:
+    def test_record(self: "TestRecorder", tmp_path: "Path") -> None:
+        path = tmp_path / "capture.pcap"
+        with pcap.Recorder(path) as recorder:
+            for index in range(10):
+                recorder.record(index, FRAME)
+        assert recorder.recorded == 10
+        assert recorder.dropped == 0
+        assert recorder.files == [path]
+        assert path.stat().st_size == 24 + 10 * (16 + len(FRAME))
+
+    def test_rotate_by_size(self: "TestRecorder", tmp_path: "Path") -> None:
+        path = tmp_path / "capture.pcapng"
+        with pcap.Recorder(path, file_format="pcapng", max_bytes=500) as recorder:
+            for index in range(20):
+                recorder.record(index, FRAME)
+        assert len(recorder.files) > 1
+        assert recorder.files[0].name == "capture_0001.pcapng"
+        assert all(file.stat().st_size < 500 + 100 for file in recorder.files)
+
+
+class TestReadCapture:
+    def test_pcap(self: "TestReadCapture", tmp_path: "Path") -> None:
+        path = tmp_path / "capture.pcap"
+        with pcap.Recorder(path) as recorder:
+            for index in range(5):
+                recorder.record(1_000_000_000 * index + 7, FRAME[index:])
+        records = [(timestamp, bytes(frame)) for timestamp, frame in pcap.read_capture(path)]
+        assert records == [(1_000_000_000 * index + 7, FRAME[index:]) for index in range(5)]
+
+    def test_pcapng(self: "TestReadCapture", tmp_path: "Path") -> None:
+        path = tmp_path / "capture.pcapng"
+        with pcap.Recorder(path, file_format="pcapng") as recorder:
+            for index in range(5):
+                recorder.record(2**33 + index, FRAME[index:])
+        records = [(timestamp, bytes(frame)) for timestamp, frame in pcap.read_capture(path)]
+        assert records == [(2**33 + index, FRAME[index:]) for index in range(5)]
+
+    def test_microseconds(self: "TestReadCapture", tmp_path: "Path") -> None:
+        path = tmp_path / "capture.pcap"
+        header = pcap.pcap_header()
+        path.write_bytes(pcap.PCAP_MAGIC_US.to_bytes(4, "little") + header[4:] + pcap.pcap_record(1_000_005, FRAME))
+        assert [timestamp for timestamp, _ in pcap.read_capture(path)] == [1_000_005_000]
+
+    def test_unknown(self: "TestReadCapture", tmp_path: "Path") -> None:
+        path = tmp_path / "capture.pcap"
+        path.write_bytes(bytes(24))
+        with pytest.raises(pcap.CaptureFormatError):
+            list(pcap.read_capture(path))
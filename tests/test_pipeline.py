@@ -0,0 +1,39 @@
+from typing import TYPE_CHECKING
+
+from pygoose.goose import generate_goose
+from pygoose.pipeline import Pipeline, Publisher
+from pygoose.timestamping import LatencyTracker
+
+if TYPE_CHECKING:
+    from pygoose.goose import GOOSE
+    from tests.conftest import ListSender
+
+
+class TestPipeline:
+    def test_handle(self: "TestPipeline") -> None:
+        seen: list[tuple[GOOSE, int]] = []
+        sunk: list[bytes] = []
+        latency = LatencyTracker()
+        pipeline = Pipeline(lambda goose, received_ns: seen.append((goose, received_ns)), latency=latency)
+        pipeline.sinks.append(lambda received_ns, data, goose: sunk.append(data))
+        frame = bytes(next(generate_goose(1))[1])
+        pipeline.handle(frame, 10, 20)
+        assert [received_ns for _, received_ns in seen] == [20]
+        assert seen[0][0].go_id == "SEL_421_Sub"
+        assert sunk == [frame]
+        assert len(latency.streams) == 1
+
+    def test_drops_other_ethertypes(self: "TestPipeline") -> None:
+        seen: list[GOOSE] = []
+        pipeline = Pipeline(lambda goose, received_ns: seen.append(goose))
+        frame = bytearray(next(generate_goose(1))[1])
+        frame[12:14] = b"\x08\x00"
+        pipeline.handle(bytes(frame), None, 0)
+        assert seen == []
+
+
+class TestPublisher:
+    def test_run(self: "TestPublisher", sender: "ListSender") -> None:
+        frames = [frame for _, frame in generate_goose(3)]
+        Publisher().run(sender, iter([(0.0, frame) for frame in frames]))  # type: ignore[arg-type]
+        assert sender.frames == [bytes(frame) for frame in frames]
@@ -0,0 +1,44 @@
+from asyncio import new_event_loop
+
+from pygoose.goose import generate_goose
+from pygoose.pipeline import Pipeline, Publisher
+from pygoose.profiling import PUBLISH_STAGES, RECEIVE_STAGES, Profiler
+
+
+class TestProfiler:
+    def test_disabled_keeps_plain_methods(self: "TestProfiler") -> None:
+        pipeline = Pipeline()
+        callback = pipeline.callback
+        profiler = Profiler((pipeline, RECEIVE_STAGES))
+        profiler.enable()
+        assert "decode" in vars(pipeline)
+        profiler.disable()
+        assert "decode" not in vars(pipeline)
+        assert pipeline.callback is callback
+        assert not profiler.enabled
+
+    def test_records_stages(self: "TestProfiler") -> None:
+        pipeline = Pipeline()
+        profiler = Profiler((pipeline, RECEIVE_STAGES))
+        profiler.enable()
+        frame = bytes(next(generate_goose(1))[1])
+        for _ in range(3):
+            pipeline.handle(frame, None, 0)
+        profiler.toggle()
+        snapshot = profiler.snapshot()
+        assert {"peek", "decode", "dispatch", "callback", "sink"} <= snapshot.keys()
+        assert snapshot["decode"]["calls"] == 3
+        assert snapshot["decode"]["count"] == 3
+        assert snapshot["decode"]["total_ns"] > 0
+
+    def test_coroutines(self: "TestProfiler") -> None:
+        publisher = Publisher()
+        profiler = Profiler((publisher, PUBLISH_STAGES))
+        profiler.enable()
+        loop = new_event_loop()
+        try:
+            loop.run_until_complete(publisher.async_wait(1))
+        finally:
+            loop.close()
+        assert profiler.stages["async_wait"].calls == 1
+        assert profiler.stages["async_wait"].total_ns >= 1000
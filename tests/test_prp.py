@@ -0,0 +1,111 @@
+from pygoose.goose import generate_goose, unpack_goose
+from pygoose.pipeline import Pipeline
+from pygoose.prp import (
+    FORGET_NS,
+    LAN_A,
+    LAN_B,
+    RCT_SIZE,
+    DuplicateDiscard,
+    PrpReceiver,
+    PrpSender,
+    parse_trailer,
+    trailer,
+)
+from tests.conftest import ListSender
+
+FRAME = bytes(next(generate_goose(1))[1])
+SOURCE = FRAME[6:12]
+
+
+class TestTrailer:
+    def test_sender(self: "TestTrailer") -> None:
+        lan_a, lan_b = ListSender(), ListSender()
+        sender = PrpSender(lan_a, lan_b)
+        sender.sendall(FRAME)
+        sender.sendall(FRAME)
+        assert [parse_trailer(frame) for frame in lan_a.frames] == [(0, LAN_A), (1, LAN_A)]
+        assert [parse_trailer(frame) for frame in lan_b.frames] == [(0, LAN_B), (1, LAN_B)]
+        assert lan_a.frames[0][:-RCT_SIZE] == lan_b.frames[0][:-RCT_SIZE] == FRAME
+        assert unpack_goose(lan_a.frames[0][:-RCT_SIZE]) == unpack_goose(FRAME)
+
+    def test_tagged(self: "TestTrailer") -> None:
+        lan_a = ListSender()
+        frame = bytes(next(generate_goose(1, priority=4))[1])
+        PrpSender(lan_a, ListSender()).sendall(frame)
+        assert parse_trailer(lan_a.frames[0]) == (0, LAN_A)  # LSDU size leaves the tag out
+        assert unpack_goose(lan_a.frames[0][:-RCT_SIZE]).tci == 4 << 13
+
+    def test_sequence_wraps(self: "TestTrailer") -> None:
+        lan_a = ListSender()
+        sender = PrpSender(lan_a, ListSender())
+        sender.sequence = 0xFFFF
+        sender.sendall(FRAME)
+        sender.sendall(FRAME)
+        assert [parse_trailer(frame) for frame in lan_a.frames] == [(0xFFFF, LAN_A), (0, LAN_A)]
+
+    def test_invalid(self: "TestTrailer") -> None:
+        assert parse_trailer(FRAME) is None
+        assert parse_trailer(FRAME + trailer(1, LAN_A, len(FRAME))) is None  # LSDU size excludes the trailer
+        assert parse_trailer(FRAME + trailer(1, 0xC, len(FRAME) - 8)) is None
+        assert parse_trailer(b"\x00" * 8) is None
+
+
+class TestDuplicateDiscard:
+    def test_first_copy_wins(self: "TestDuplicateDiscard") -> None:
+        duplicates = DuplicateDiscard()
+        assert duplicates.accept(SOURCE, 1, LAN_A, 0, LAN_A)
+        assert not duplicates.accept(SOURCE, 1, LAN_B, 10, LAN_B)
+        assert duplicates.accept(SOURCE, 2, LAN_B, 20, LAN_B)
+        assert not duplicates.accept(SOURCE, 2, LAN_A, 30, LAN_A)
+        assert duplicates.accept(bytes(6), 1, LAN_A, 40, LAN_A)
+
+    def test_window_is_bounded(self: "TestDuplicateDiscard") -> None:
+        duplicates = DuplicateDiscard(window=4)
+        for sequence in range(8):
+            assert duplicates.accept(SOURCE, sequence, LAN_A, sequence, LAN_A)
+        assert not duplicates.accept(SOURCE, 7, LAN_B, 8, LAN_B)
+        assert duplicates.accept(SOURCE, 3, LAN_B, 9, LAN_B)  # overwritten by 7, too late to tell
+        assert len(duplicates.sources[SOURCE].sequences) == 4
+
+    def test_forget(self: "TestDuplicateDiscard") -> None:
+        duplicates = DuplicateDiscard()
+        assert duplicates.accept(SOURCE, 5, LAN_A, 0, LAN_A)
+        assert duplicates.accept(SOURCE, 5, LAN_A, FORGET_NS, LAN_A)  # the publisher restarted its sequence
+
+    def test_max_sources(self: "TestDuplicateDiscard") -> None:
+        duplicates = DuplicateDiscard(max_sources=1)
+        duplicates.accept(SOURCE, 1, LAN_A, 0, LAN_A)
+        assert duplicates.accept(bytes(6), 1, LAN_A, 0, LAN_A)
+        assert duplicates.accept(bytes(6), 1, LAN_B, 0, LAN_B)
+        assert duplicates.untracked == 2
+        assert list(duplicates.sources) == [SOURCE]
+
+    def test_statistics(self: "TestDuplicateDiscard") -> None:
+        duplicates = DuplicateDiscard()
+        for sequence in range(10):
+            duplicates.accept(SOURCE, sequence, LAN_A, sequence, LAN_A)
+            if sequence % 5:
+                duplicates.accept(SOURCE, sequence, LAN_A, sequence, LAN_B)
+        statistics = duplicates.snapshot()[SOURCE.hex(":")]
+        assert statistics["unique"] == 10
+        assert statistics["duplicates"] == 8
+        assert statistics["lan_a"] == {"received": 10, "lost": 0, "wrong_lan": 0}
+        assert statistics["lan_b"] == {"received": 8, "lost": 2, "wrong_lan": 8}
+
+
+class TestPrpReceiver:
+    def test_handle(self: "TestPrpReceiver") -> None:
+        received: list[int] = []
+        receiver = PrpReceiver(Pipeline(lambda goose, _: received.append(goose.sq_num)))
+        lan_a, lan_b = ListSender(), ListSender()
+        sender = PrpSender(lan_a, lan_b)
+        frames = [bytes(frame) for _, frame in generate_goose(3)]
+        for frame in frames:
+            sender.sendall(frame)
+        for frame_a, frame_b in zip(lan_a.frames, lan_b.frames, strict=True):
+            receiver.handle(frame_b, LAN_B, None, 0)
+            receiver.handle(frame_a, LAN_A, None, 0)
+        receiver.handle(FRAME, LAN_A, None, 0)  # single attached node, no trailer
+        assert received == [unpack_goose(frame).sq_num for frame in [*frames, FRAME]]
+        assert receiver.discarded == 3
+        assert receiver.pipeline.metrics.decode_errors == {}
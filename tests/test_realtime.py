@@ -0,0 +1,91 @@
+import gc
+import os
+from asyncio import new_event_loop
+from time import process_time_ns, time_ns
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pygoose.goose import generate_goose
+from pygoose.realtime import RealtimeMode, RealtimePublisher
+from pygoose.transport import loopback_pair
+from tests.conftest import ListSender
+
+if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
+
+
+def _refuse(*_: object) -> None:
+    raise PermissionError(1, "Operation not permitted")
+
+
+class TestRealtimeMode:
+    def test_restores(self: "TestRealtimeMode") -> None:
+        affinity = os.sched_getaffinity(0)
+        scheduler = os.sched_getscheduler(0)
+        with RealtimeMode(min(affinity), priority=1, lock_memory=False) as status:
+            assert not gc.isenabled()
+            assert status.gc_disabled
+            assert status.cpu == min(affinity) or status.degraded
+        assert gc.isenabled()
+        assert os.sched_getaffinity(0) == affinity
+        assert os.sched_getscheduler(0) == scheduler
+
+    def test_degrades(self: "TestRealtimeMode", monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(os, "sched_setscheduler", _refuse)
+        monkeypatch.setattr("pygoose.realtime._mlockall", _refuse)
+        with RealtimeMode(1 << 16) as status:
+            assert status.cpu is None
+            assert status.fifo_priority is None
+            assert not status.memory_locked
+            assert status.degraded
+        assert [warning.split(" ")[0] for warning in status.warnings] == ["CPU", "SCHED_FIFO", "Memory"]
+        assert gc.isenabled()
+
+
+class TestRealtimePublisher:
+    def test_run(self: "TestRealtimePublisher", sender: ListSender) -> None:
+        frames = [frame for _, frame in generate_goose(3)]
+        publisher = RealtimePublisher(RealtimeMode(priority=1, lock_memory=False))
+        publisher.run(sender, iter([(100.0, frame) for frame in frames]))  # type: ignore[arg-type]
+        assert sender.frames == [bytes(frame) for frame in frames]
+        report = publisher.report()
+        assert report["jitter"]["frames"] == 3
+        assert report["realtime"]["gc_disabled"]
+
+    def test_interrupted(self: "TestRealtimePublisher") -> None:
+        frames = [frame for _, frame in generate_goose(3)]
+
+        class Interrupting(ListSender):
+            def sendall(self: "Interrupting", data: "ReadableBuffer", /) -> None:
+                super().sendall(data)
+                if len(self.frames) == 2:
+                    raise KeyboardInterrupt
+
+        publisher = RealtimePublisher(RealtimeMode(priority=1, lock_memory=False))
+        with pytest.raises(KeyboardInterrupt):
+            publisher.run(Interrupting(), iter([(0.0, frame) for frame in frames]))  # type: ignore[arg-type]
+        assert publisher.report()["jitter"]["frames"] == 1  # the second send never returned
+        assert gc.isenabled()
+
+    def test_wait_sleeps(self: "TestRealtimePublisher") -> None:
+        publisher = RealtimePublisher(RealtimeMode())
+        start = process_time_ns()
+        started = time_ns()
+        publisher.wait(20_000)
+        assert time_ns() - started >= 20_000_000
+        assert process_time_ns() - start < 10_000_000  # slept, spinning would burn the whole 20 ms
+
+    def test_async_run(self: "TestRealtimePublisher") -> None:
+        frames = [frame for _, frame in generate_goose(2)]
+        publisher = RealtimePublisher(RealtimeMode(priority=1, lock_memory=False))
+        sender, receiver = loopback_pair(blocking=False)
+        loop = new_event_loop()
+        with sender, receiver:
+            try:
+                loop.run_until_complete(publisher.async_run(loop, sender, iter([(0.0, frame) for frame in frames])))
+            finally:
+                loop.close()
+            assert [receiver.recv(1518) for _ in frames] == [bytes(frame) for frame in frames]
+        assert publisher.jitter is not None
+        assert publisher.jitter.frames == 2
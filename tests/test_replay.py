@@ -0,0 +1,68 @@
+from threading import enumerate as threads
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pygoose import pcap, replay
+from pygoose.goose import TIMESTAMP_TAG, find_field, generate_goose, unpack_goose
+from tests.conftest import ListSender
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from _typeshed import ReadableBuffer
+
+
+
+def _capture(path: "Path") -> list[bytes]:
+    frames = [bytes(frame) for _, frame in generate_goose(12)]
+    with pcap.Recorder(path) as recorder:
+        for index, frame in enumerate(frames):
+            recorder.record(1_000_000 + index * 1000, frame)
+    return frames
+
+
+class TestReplay:
+    def test_replay(self: "TestReplay", tmp_path: "Path", sender: "ListSender") -> None:
+        path = tmp_path / "capture.pcap"
+        frames = _capture(path)
+        report = replay.replay(sender, path)
+        assert sender.frames == frames
+        assert report.frames == len(frames)
+        assert report.max_ns >= report.p99_ns >= report.p50_ns >= 0
+
+    def test_rewrite(self: "TestReplay", tmp_path: "Path", sender: "ListSender") -> None:
+        path = tmp_path / "capture.pcap"
+        frames = _capture(path)
+        rewrite = replay.Rewrite(src_addr=b"\x02" * 6, app_id=0x3001, fresh_timestamp=True)
+        replay.replay(sender, path, scale=0.0, rewrite=rewrite)
+        offset, length = find_field(frames[0], TIMESTAMP_TAG)
+        for original, sent in zip(frames, sender.frames, strict=True):
+            goose = unpack_goose(sent)
+            assert goose.mac_src == b"\x02" * 6
+            assert goose.app_id == 0x3001
+            assert sent[offset : offset + length] != original[offset : offset + length]
+
+    def test_empty(self: "TestReplay", tmp_path: "Path", sender: "ListSender") -> None:
+        path = tmp_path / "capture.pcap"
+        path.write_bytes(pcap.pcap_header())
+        assert replay.replay(sender, path).frames == 0
+
+    def test_corrupt(self: "TestReplay", tmp_path: "Path", sender: "ListSender") -> None:
+        path = tmp_path / "capture.pcap"
+        path.write_bytes(bytes(64))
+        with pytest.raises(pcap.CaptureFormatError, match="magic"):
+            replay.replay(sender, path)
+
+    def test_send_error(self: "TestReplay", tmp_path: "Path") -> None:
+        class Failing(ListSender):
+            def sendall(self: "Failing", data: "ReadableBuffer", /) -> None:
+                if self.frames:
+                    raise OSError(105, "No buffer space available")
+                super().sendall(data)
+
+        path = tmp_path / "capture.pcap"
+        _capture(path)
+        with pytest.raises(OSError, match="buffer space"):
+            replay.replay(Failing(), path, scale=0.0, ahead=1)
+        assert not any(thread.name == "pygoose-replay" for thread in threads())
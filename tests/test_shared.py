@@ -0,0 +1,84 @@
+from multiprocessing import get_context
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pygoose import shared
+from pygoose.goose import generate_goose, unpack_goose
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+FRAMES = [bytes(frame) for _, frame in generate_goose(12)]
+
+
+def _read_all(name: str, queue: "Queue[list[shared.Entry]]") -> None:
+    with shared.Reader(name) as reader:
+        queue.put(list(reader))
+
+
+class TestLatestValues:
+    def test_round_trip(self: "TestLatestValues") -> None:
+        with shared.LatestValues(capacity=4) as table, shared.Reader(table.name) as reader:
+            assert len(reader) == 0
+            for index, frame in enumerate(FRAMES):
+                table.sink(1_000 + index, frame, unpack_goose(frame))
+            goose = unpack_goose(FRAMES[-1])
+            entry = reader.get(goose.key)
+            assert entry is not None
+            assert len(reader) == 1
+            assert (entry.st_num, entry.sq_num, entry.ttl, entry.go_id) == (3, 3, 2000, "SEL_421_Sub")
+            assert entry.values == b"\x83\x01\x00"
+            assert entry.received_ns == 1_011
+            assert entry.valid(1_011 + 2_000_000_000)
+            assert not entry.valid(1_012 + 2_000_000_000)
+            assert not entry.test
+            assert reader.get(0) is None
+
+    def test_capacity(self: "TestLatestValues") -> None:
+        goose = unpack_goose(FRAMES[0])
+        with shared.LatestValues(capacity=2) as table, shared.Reader(table.name) as reader:
+            for app_id in range(3):
+                goose.app_id = app_id
+                table.write(goose, 0, b"\x00" * 300)
+            assert len(reader) == 2
+            assert table.overflow == 1
+            entries = list(reader)
+            assert [entry.key & 0xFFFF for entry in entries] == [0, 1]
+            assert entries[0].truncated
+            assert len(entries[0].values) == shared.VALUE_SIZE
+
+    def test_busy_slot(self: "TestLatestValues", monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(shared, "MAX_RETRIES", 10)
+        with shared.LatestValues(capacity=1) as table, shared.Reader(table.name) as reader:
+            table.write(unpack_goose(FRAMES[0]), 0)
+            table.memory.buf[shared._HEADER_SIZE] |= 1  # noqa: SLF001
+            with pytest.raises(shared.SlotBusyError):
+                reader.read(0)
+
+    def test_sequence_wraps(self: "TestLatestValues") -> None:
+        goose = unpack_goose(FRAMES[0])
+        with shared.LatestValues(capacity=1) as table, shared.Reader(table.name) as reader:
+            table.write(goose, 0)
+            table.memory.buf[shared._HEADER_SIZE : shared._HEADER_SIZE + 4] = b"\xfe\xff\xff\xff"  # noqa: SLF001
+            table.write(goose, 1)
+            assert table.memory.buf[shared._HEADER_SIZE : shared._HEADER_SIZE + 4] == bytes(4)  # noqa: SLF001
+            assert reader.read(0).received_ns == 1
+
+    def test_format(self: "TestLatestValues") -> None:
+        with shared.LatestValues(capacity=1) as table:
+            table.memory.buf[:4] = b"XXXX"
+            with pytest.raises(shared.TableFormatError):
+                shared.Reader(table.name)
+
+    def test_other_process(self: "TestLatestValues") -> None:
+        context = get_context("fork")
+        queue: Queue[list[shared.Entry]] = context.Queue()
+        with shared.LatestValues() as table:
+            table.sink(5, FRAMES[4], unpack_goose(FRAMES[4]))
+            process = context.Process(target=_read_all, args=(table.name, queue))
+            process.start()
+            (entry,) = queue.get(timeout=10)
+            process.join()
+        assert entry.st_num == 2
+        assert entry.values == b"\x83\x01\x0f"
@@ -0,0 +1,103 @@
+import random
+from dataclasses import replace
+
+import pytest
+
+from pygoose import stats
+from pygoose.datatypes.time_stamp import NANOSECONDS
+from pygoose.goose import generate_goose, unpack_goose
+
+MS = stats.MILLISECONDS
+
+
+class TestWindow:
+    def test_rate(self: "TestWindow") -> None:
+        window = stats.Window(NANOSECONDS, 10)
+        for index in range(20):
+            window.add(index * NANOSECONDS // 10)
+        assert window.total == 10
+        assert window.rate(2 * NANOSECONDS) == 9.0  # 1.1 s to 1.9 s are still in the window
+        assert window.rate(3 * NANOSECONDS) == 0.0
+        assert window.total == 0
+
+    def test_filling(self: "TestWindow") -> None:
+        window = stats.Window(10 * NANOSECONDS, 10)
+        window.add(0)
+        window.add(NANOSECONDS // 2)
+        assert window.rate(NANOSECONDS) == 2.0
+
+
+class TestP2Quantile:
+    @pytest.mark.parametrize("p", [0.5, 0.9, 0.99])
+    def test_estimate(self: "TestP2Quantile", p: float) -> None:
+        generator = random.Random(1)
+        values = [generator.uniform(0, 1000) for _ in range(20_000)]
+        quantile = stats.P2Quantile(p)
+        for value in values:
+            quantile.add(value)
+        assert quantile.value == pytest.approx(sorted(values)[int(p * len(values))], rel=0.02)
+
+    def test_few_values(self: "TestP2Quantile") -> None:
+        quantile = stats.P2Quantile(0.5)
+        assert quantile.value == 0.0
+        for value in (3, 1, 2):
+            quantile.add(value)
+        assert quantile.value == 2
+
+
+class TestStreamStatistics:
+    def _feed(self: "TestStreamStatistics", intervals_ms: list[int]) -> stats.StreamStatistics:
+        goose = unpack_goose(bytes(next(generate_goose(1))[1]))
+        sent = goose.timestamp.second_since_epoch * NANOSECONDS + goose.timestamp.fraction_of_second
+        stream = stats.StreamStatistics()
+        received = sent + MS
+        st_num, sq_num = 1, 0
+        for interval in [0, *intervals_ms]:
+            received += interval * MS
+            if interval < 0:
+                st_num, sq_num = st_num + 1, 0
+                received -= 2 * interval * MS
+            stream.update(replace(goose, st_num=st_num, sq_num=sq_num), received)
+            sq_num += 1
+        return stream
+
+    def test_heartbeat(self: "TestStreamStatistics") -> None:
+        stream = self._feed([2, 4, 8, 1000, 1000, 1000, 1000])
+        snapshot = stream.snapshot(stream.last_ns)
+        assert snapshot["heartbeat_ms"] == pytest.approx(1000)
+        assert snapshot["ttl_per_heartbeat"] == pytest.approx(2.0)
+        assert snapshot["expired"] == 0
+        assert snapshot["curve_violations"] == 0
+        assert snapshot["sequence_errors"] == 0
+        assert snapshot["offset_ms"] == pytest.approx(1.0)
+
+    def test_curve_violation(self: "TestStreamStatistics") -> None:
+        stream = self._feed([2, 4, 1, 8, 1000, 1000])
+        assert stream.curve_violations == 1
+        assert not stream.burst
+
+    def test_events_and_expiry(self: "TestStreamStatistics") -> None:
+        stream = self._feed([1000, 1000, -3000, 2, 4])
+        assert stream.events == 2
+        assert stream.expired == 1
+        assert stream.burst
+
+
+class TestStatistics:
+    def test_sink(self: "TestStatistics") -> None:
+        statistics = stats.Statistics()
+        for index, (_, frame) in enumerate(generate_goose(12)):
+            statistics.sink(index * MS, bytes(frame), unpack_goose(bytes(frame)))
+        (snapshot,) = statistics.snapshot(12 * MS).values()
+        assert snapshot["frames"] == 12
+        assert snapshot["events"] == 3
+        assert snapshot["sequence_errors"] == 0
+
+    def test_max_streams(self: "TestStatistics") -> None:
+        statistics = stats.Statistics(max_streams=2)
+        goose = unpack_goose(bytes(next(generate_goose(1))[1]))
+        for app_id in (1, 2, 3, 1, 4):
+            statistics.record(replace(goose, app_id=app_id), 0)
+        assert len(statistics.streams) == 2
+        assert statistics.streams[replace(goose, app_id=1).key].frames == 2
+        assert statistics.untracked == 2
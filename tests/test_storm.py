@@ -0,0 +1,78 @@
+from pygoose.datatypes.time_stamp import NANOSECONDS
+from pygoose.goose import Header, generate_goose
+from pygoose.pipeline import Pipeline
+from pygoose.storm import OVERFLOW, StormEvent, StormGuard, TokenBucket
+
+MS = 1_000_000
+
+
+def _header(source: int = 1, app_id: int = 0) -> Header:
+    return Header(bytes(6), source.to_bytes(6, "big"), 0x88B8, app_id, 0, 22)
+
+
+class TestTokenBucket:
+    def test_refill(self: "TestTokenBucket") -> None:
+        bucket = TokenBucket(1000, 2, 0)
+        assert bucket.take(0)
+        assert bucket.take(0)
+        assert not bucket.take(0)
+        assert bucket.take(MS)
+        assert not bucket.take(MS)
+        assert bucket.take(NANOSECONDS)
+        assert bucket.tokens == 1
+
+
+class TestStormGuard:
+    def test_storm(self: "TestStormGuard") -> None:
+        events: list[StormEvent] = []
+        guard = StormGuard(1000, 10, on_storm=events.append)
+        admitted = [guard.admit(_header(), index * 10_000) for index in range(1000)]  # 100k frames/s for 10 ms
+        assert 19 <= sum(admitted) <= 20  # burst, then the rate
+        assert guard.shed == 1000 - sum(admitted)
+        assert events == [StormEvent(source=1, started_ns=100_000)]
+        assert guard.storming == [1]
+
+        assert guard.admit(_header(), NANOSECONDS)
+        assert events[-1] == StormEvent(source=1, started_ns=100_000, ended_ns=NANOSECONDS, shed=guard.shed)
+        assert guard.storming == []
+
+    def test_protected(self: "TestStormGuard") -> None:
+        protected = _header(2, 0x3001)
+        guard = StormGuard(1000, 10, protected=[protected.key])
+        for index in range(1000):
+            guard.admit(_header(2), index * 10_000)
+            assert guard.admit(protected, index * 10_000)
+
+    def test_sample(self: "TestStormGuard") -> None:
+        guard = StormGuard(1, 1, policy="sample", sample=10)
+        admitted = [guard.admit(_header(), 0) for _ in range(101)]
+        assert sum(admitted) == 1 + 10
+        assert guard.shed == 90
+
+    def test_overflow(self: "TestStormGuard") -> None:
+        events: list[StormEvent] = []
+        guard = StormGuard(1, 1, max_sources=2, on_storm=events.append)
+        for source in range(10):
+            guard.admit(_header(source), 0)
+        assert sorted(guard.buckets) == [OVERFLOW, 0, 1]
+        assert events == [StormEvent(source=OVERFLOW, started_ns=0)]
+
+    def test_evicts_idle(self: "TestStormGuard") -> None:
+        guard = StormGuard(1000, 1, max_sources=2)
+        for source in range(3):
+            guard.admit(_header(source), 0)  # the third one overflows, no bucket is full again yet
+        assert sorted(guard.buckets) == [OVERFLOW, 0, 1]
+        assert not guard.admit(_header(3), MS // 2)  # too early for another pass, the overflow bucket is empty
+        assert guard.admit(_header(4), 2 * MS)  # 0 and 1 filled up again, the storming overflow bucket stays
+        assert sorted(guard.buckets) == [OVERFLOW, 4]
+        assert guard.evicted == 2
+
+    def test_pipeline(self: "TestStormGuard") -> None:
+        seen = []
+        pipeline = Pipeline(lambda goose, _: seen.append(goose), guard=StormGuard(1000, 5))
+        frame = bytes(next(generate_goose(1))[1])
+        for _ in range(50):
+            pipeline.handle(frame, None, 0)
+        assert len(seen) == 5
+        assert pipeline.metrics.shed == 45
+        assert pipeline.metrics.frames == 50
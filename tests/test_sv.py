@@ -0,0 +1,129 @@
+from array import array
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pygoose import sv
+from pygoose.goose import peek_header
+from tests.conftest import ListSender
+
+if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
+
+DST, SRC = b"\x01\x0c\xcd\x04\x00\x01", b"\x00\x30\xa7\x22\x9d\x01"
+
+
+class TestPackSv:
+    def test_round_trip(self: "TestPackSv") -> None:
+        asdu = sv.ASDU(sv_id="MU01", smp_cnt=3999, conf_rev=7, values=range(-4, 4), quality=range(8))
+        frame = bytes(sv.pack_sv(DST, SRC, 0x4000, [asdu, asdu], priority=4))
+        decoded = sv.unpack_sv(frame)
+        assert decoded.key == 0x0030A7229D01_4000
+        assert decoded.tci == 4 << 13
+        assert len(decoded.asdus) == 2
+        assert decoded.asdus[0].sv_id == "MU01"
+        assert decoded.asdus[0].smp_cnt == 3999
+        assert decoded.asdus[0].conf_rev == 7
+        assert decoded.asdus[0].smp_synch == sv.LOCAL
+        assert list(decoded.asdus[1].values) == list(range(-4, 4))
+        assert list(decoded.asdus[1].quality) == list(range(8))
+        assert peek_header(frame).length == len(frame) - 18  # from APPID on, past the tag
+
+    def test_not_sv(self: "TestPackSv") -> None:
+        frame = bytearray(sv.pack_sv(DST, SRC, 0x4000, [sv.ASDU(sv_id="MU01", smp_cnt=0)]))
+        frame[12:14] = b"\x88\xb8"
+        with pytest.raises(ValueError, match="Not a SV frame"):
+            sv.unpack_sv(bytes(frame))
+
+    def test_truncated(self: "TestPackSv") -> None:
+        frame = bytes(sv.pack_sv(DST, SRC, 0x4000, [sv.ASDU(sv_id="MU01", smp_cnt=0)]))
+        with pytest.raises(ValueError, match="missing"):
+            sv.unpack_sv(frame[:-10])
+
+
+class TestSvEncoder:
+    def test_matches_pack_sv(self: "TestSvEncoder") -> None:
+        samples = sv.sine_samples(80)
+        encoder = sv.SvEncoder(DST, SRC, 0x4000, "MU01", asdus=2)
+        frame = bytes(encoder.pack(10, samples, row=10))
+        asdus = [
+            sv.ASDU(sv_id="MU01", smp_cnt=10 + row, values=samples[(10 + row) * 8 : (11 + row) * 8]) for row in range(2)
+        ]
+        assert frame == bytes(sv.pack_sv(DST, SRC, 0x4000, asdus))
+
+    def test_sine(self: "TestSvEncoder") -> None:
+        samples = sv.sine_samples(80)
+        assert len(samples) == 80 * sv.CHANNELS
+        assert all(abs(samples[row * 8 + 3]) <= 2 for row in range(80))  # balanced phases
+        assert max(samples[0::8]) == 1000
+
+
+class TestPublish:
+    def test_schedule(self: "TestPublish", sender: ListSender) -> None:
+        encoder = sv.SvEncoder(DST, SRC, 0x4000, "MU01")
+        report = sv.publish(sender, encoder, sv.sine_samples(4), rate=4000, frames=6)
+        assert report.frames == 6
+        counts = [sv.unpack_sv(frame).asdus[0].smp_cnt for frame in sender.frames]
+        assert counts == [0, 1, 2, 3, 4, 5]
+        values = [sv.unpack_sv(frame).asdus[0].values[0] for frame in sender.frames]
+        assert values[:2] == values[4:]  # samples loop
+
+    def test_rows_wrap(self: "TestPublish", sender: ListSender) -> None:
+        samples = sv.sine_samples(80)
+        encoder = sv.SvEncoder(DST, SRC, 0x4000, "MU01", asdus=3)
+        report = sv.publish(sender, encoder, samples, rate=4000, frames=30)  # 90 rows over a cycle of 80
+        assert report.frames == 30
+        values = [asdu.values[0] for frame in sender.frames for asdu in sv.unpack_sv(frame).asdus]
+        assert values == [samples[row % 80 * sv.CHANNELS] for row in range(90)]
+
+    def test_interrupted(self: "TestPublish") -> None:
+        class Interrupting(ListSender):
+            def sendall(self: "Interrupting", data: "ReadableBuffer", /) -> None:
+                if len(self.frames) == 3:
+                    raise KeyboardInterrupt
+                super().sendall(data)
+
+        report = sv.publish(Interrupting(), sv.SvEncoder(DST, SRC, 0x4000, "MU01"), sv.sine_samples(4))
+        assert report.frames == 3
+        assert report.lateness_ns["count"] == 3
+
+
+class TestSampleBatch:
+    def test_decode(self: "TestSampleBatch") -> None:
+        samples = sv.sine_samples(80)
+        encoder = sv.SvEncoder(DST, SRC, 0x4000, "MU01", asdus=2)
+        batch = sv.SampleBatch(4)
+        assert batch.decode(bytes(encoder.pack(0, samples, 0)), 1) == 2
+        assert batch.decode(bytes(encoder.pack(2, samples, 2)), 2) == 2
+        assert batch.full
+        assert list(batch.smp_cnt) == [0, 1, 2, 3]
+        assert list(batch.received_ns) == [1, 1, 2, 2]
+        assert batch.keys[0] == 0x0030A7229D01_4000
+        assert batch.values() == samples[: 4 * sv.CHANNELS]
+        assert batch.quality() == array("I", [0] * 4 * sv.CHANNELS)
+        with pytest.raises(sv.BatchFullError):
+            batch.decode(bytes(encoder.pack(4, samples, 4)), 3)
+        assert batch.count == 4
+
+    def test_wrong_channels(self: "TestSampleBatch") -> None:
+        frame = bytearray(sv.pack_sv(DST, SRC, 0x4000, [sv.ASDU(sv_id="MU01", smp_cnt=0)]))
+        frame[-sv.SEQ_DATA_SIZE - 1] = 60  # seqData length
+        with pytest.raises(ValueError, match="missing|seqData"):
+            sv.SampleBatch().decode(bytes(frame), 0)
+
+
+class TestSvSubscriber:
+    def test_batches(self: "TestSvSubscriber") -> None:
+        samples = sv.sine_samples(80)
+        encoder = sv.SvEncoder(DST, SRC, 0x4000, "MU01", asdus=2)
+        batches: list[list[int]] = []
+        subscriber = sv.SvSubscriber(
+            lambda batch: batches.append(list(batch.smp_cnt[: batch.count])), sv.SampleBatch(5),
+        )
+        for index in range(5):
+            subscriber.handle(bytes(encoder.pack(index * 2, samples, index * 2)), index)
+        subscriber.handle(b"\x00" * 30, 5)
+        subscriber.flush()
+        assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+        assert subscriber.frames == 6
+        assert subscriber.decode_errors == 1
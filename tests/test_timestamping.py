@@ -0,0 +1,84 @@
+from socket import AF_INET, SOCK_DGRAM, socket
+from struct import pack
+from time import time_ns
+
+from pygoose import timestamping
+from pygoose.datatypes import TimeQuality, Timestamp
+from pygoose.goose import GOOSE
+
+
+class TestKernelNs:
+    def test_timestampns(self: "TestKernelNs") -> None:
+        data = pack("=qq", 12, 345)
+        assert timestamping.kernel_ns([(timestamping.SOL_SOCKET, timestamping.SCM_TIMESTAMPNS, data)]) == 12_000_000_345
+
+    def test_hardware_preferred(self: "TestKernelNs") -> None:
+        data = pack("=qqqqqq", 1, 0, 0, 0, 2, 5)
+        assert timestamping.kernel_ns([(timestamping.SOL_SOCKET, timestamping.SCM_TIMESTAMPING, data)]) == 2_000_000_005
+
+    def test_software_fallback(self: "TestKernelNs") -> None:
+        data = pack("=qqqqqq", 1, 7, 0, 0, 0, 0)
+        assert timestamping.kernel_ns([(timestamping.SOL_SOCKET, timestamping.SCM_TIMESTAMPING, data)]) == 1_000_000_007
+
+    def test_missing(self: "TestKernelNs") -> None:
+        assert timestamping.kernel_ns([]) is None
+
+    def test_udp(self: "TestKernelNs") -> None:
+        with socket(AF_INET, SOCK_DGRAM) as receiver, socket(AF_INET, SOCK_DGRAM) as sender:
+            receiver.bind(("127.0.0.1", 0))
+            assert timestamping.enable(receiver, "lo") == "software"
+            before = time_ns()
+            sender.sendto(b"goose", receiver.getsockname())
+            data, kernel = timestamping.recv(receiver)
+        assert data == b"goose"
+        assert kernel is not None
+        assert before - 1_000_000 <= kernel <= time_ns()
+
+    def test_hardware_falls_back(self: "TestKernelNs") -> None:
+        with socket(AF_INET, SOCK_DGRAM) as receiver:
+            assert timestamping.enable(receiver, "lo", hardware=True) == "software"
+
+
+class TestVlanTag:
+    def test_auxdata(self: "TestVlanTag") -> None:
+        status = timestamping.TP_STATUS_VLAN_VALID | timestamping.TP_STATUS_VLAN_TPID_VALID
+        data = pack("=IIIHHHH", status, 100, 100, 0, 14, 4 << 13 | 10, 0x88A8)
+        assert timestamping.vlan_tag([(timestamping.SOL_PACKET, timestamping.PACKET_AUXDATA, data)]) == (0x88A8, 0x800A)
+
+    def test_default_tpid(self: "TestVlanTag") -> None:
+        data = pack("=IIIHHHH", timestamping.TP_STATUS_VLAN_VALID, 100, 100, 0, 14, 4 << 13, 0)
+        assert timestamping.vlan_tag([(timestamping.SOL_PACKET, timestamping.PACKET_AUXDATA, data)]) == (0x8100, 0x8000)
+
+    def test_untagged(self: "TestVlanTag") -> None:
+        data = pack("=IIIHHHH", 0, 100, 100, 0, 14, 0, 0)
+        assert timestamping.vlan_tag([(timestamping.SOL_PACKET, timestamping.PACKET_AUXDATA, data)]) is None
+        assert timestamping.vlan_tag([]) is None
+
+
+def _goose(app_id: int = 2) -> GOOSE:
+    return GOOSE(
+        mac_dest=bytes(6), mac_src=b"\x00\x00\x00\x00\x00\x01", ether=0x88B8, app_id=app_id, goose_length=0,
+        reserved1=0, reserved2=0, gocb_ref="", ttl=0, data_set="", go_id="",
+        timestamp=Timestamp(second_since_epoch=1, fraction_of_second=0, time_quality=TimeQuality.default()),
+        st_num=1, sq_num=0, test=False, conf_rev=1, nds_com=False, num_datset_entries=1, trip=False,
+    )
+
+
+class TestLatencyTracker:
+    def test_record(self: "TestLatencyTracker") -> None:
+        goose = _goose()
+        tracker = timestamping.LatencyTracker()
+        tracker.record(goose, 1_000_010_000, 1_000_012_000, 1_000_015_000)
+        stream = tracker.streams[goose.key]
+        assert stream.wire.max == 10_000
+        assert stream.stack.max == 2_000
+        assert stream.callback.max == 5_000
+        assert list(tracker.snapshot()) == ["0000000000010002"]
+
+    def test_max_streams(self: "TestLatencyTracker") -> None:
+        tracker = timestamping.LatencyTracker(max_streams=2)
+        for app_id in (1, 2, 3, 1, 4):
+            tracker.record(_goose(app_id), 1_000_010_000, 1_000_012_000)
+        assert len(tracker.streams) == 2
+        assert tracker.streams[_goose(1).key].stack.count == 2
+        assert tracker.untracked == 2
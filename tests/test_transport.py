@@ -0,0 +1,61 @@
+from os import getpid
+from threading import Thread
+
+import pytest
+
+from pygoose.gateway import Gateway, Route
+from pygoose.goose import generate_goose, unpack_goose
+from pygoose.metrics import Metrics
+from pygoose.pipeline import Pipeline, Publisher
+from pygoose.transport import is_loopback, loopback_pair, open_receiver, open_sender
+
+
+class TestLoopback:
+    def test_pair(self: "TestLoopback") -> None:
+        frames = [frame for _, frame in generate_goose(3)]
+        sender, receiver = loopback_pair()
+        seen: list[int] = []
+        pipeline = Pipeline(lambda goose, received_ns: seen.append(goose.sq_num))
+        with sender, receiver:
+            Publisher().run(sender, iter([(0.0, frame) for frame in frames]))
+            for _ in frames:
+                data, kernel_ns = pipeline.recv(receiver)
+                assert kernel_ns is not None
+                pipeline.handle(data, kernel_ns, kernel_ns)
+        assert seen == [unpack_goose(bytes(frame)).sq_num for frame in frames]
+        assert pipeline.metrics.frames == len(frames)
+
+    def test_named(self: "TestLoopback") -> None:
+        interface = f"loopback:test-{getpid()}"
+        assert is_loopback(interface)
+        frame = bytes(next(generate_goose(1))[1])
+        with open_receiver(interface, blocking=False) as receiver, open_sender(interface) as sender:
+            sender.sendall(frame)
+            assert Pipeline().recv(receiver)[0] == frame
+            with pytest.raises(BlockingIOError):
+                receiver.recv(1518)
+            assert Metrics(receiver).snapshot()["kernel_packets"] == 0  # no PACKET_STATISTICS on loopback
+
+    def test_hardware_fallback(self: "TestLoopback") -> None:
+        interface = f"loopback:hardware-{getpid()}"
+        with open_receiver(interface, hardware_timestamps=True) as receiver, open_sender(interface) as sender:
+            sender.sendall(bytes(next(generate_goose(1))[1]))
+            assert Pipeline().recv(receiver)[1] is not None  # no NIC clock, software timestamps instead
+
+    def test_no_receiver(self: "TestLoopback") -> None:
+        with pytest.raises(OSError):  # noqa: PT011
+            open_sender(f"loopback:missing-{getpid()}")
+
+    def test_gateway(self: "TestLoopback") -> None:
+        frame = bytes(next(generate_goose(1))[1])
+        gateway = Gateway([Route(set_app_id=0x3001)])
+        source, receiver = loopback_pair()
+        sender, destination = loopback_pair()
+        destination.settimeout(5)
+        with source, sender, destination:
+            source.sendall(frame)
+            source.sendall(frame)
+            Thread(target=gateway.run, args=(receiver, sender), daemon=True).start()  # runs until the process exits
+            assert unpack_goose(destination.recv(1518)).app_id == 0x3001
+            assert unpack_goose(destination.recv(1518)).app_id == 0x3001
+        assert gateway.forwarded == 2
@@ -1,3 +1,5 @@
+from time import process_time_ns, time_ns
+
 from pygoose import utils as u
 
 
@@ -35,3 +37,25 @@ class TestBytes2Mac:
 
     def test_max(self: "TestBytes2Mac") -> None:
         assert u.bytes2mac(b"\xFF\xFF\xFF\xFF\xFF\xFF") == "FF:FF:FF:FF:FF:FF"
+
+
+class TestInt2HexString:
+    def test_u16(self: "TestInt2HexString") -> None:
+        assert u.int2hexstring(0x88B8) == "0x88B8"
+
+    def test_padding(self: "TestInt2HexString") -> None:
+        assert u.int2hexstring(0) == "0x0000"
+
+    def test_size(self: "TestInt2HexString") -> None:
+        assert u.int2hexstring(1, 1) == "0x01"
+
+
+class TestSleepUntil:
+    def test_sleeps(self: "TestSleepUntil") -> None:
+        start, cpu = time_ns(), process_time_ns()
+        u.sleep_until(start + 20_000_000)
+        assert time_ns() - start >= 20_000_000
+        assert process_time_ns() - cpu < 10_000_000  # spun only the last SPIN_NS
+
+    def test_past(self: "TestSleepUntil") -> None:
+        u.sleep_until(0)